@@ -0,0 +1,116 @@
+"""Benchmark priority queue implementations used as search frontiers."""
+
+import heapq
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Self
+
+from pathfinding import log_info
+from pathfinding._priority_queue import (
+    FRONTIERS,
+    _IndexedPriorityQueue,
+    _PriorityQueue,
+)
+from pathfinding.agent import Agent
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+
+LOCATION_COUNT = 10_000
+PUT_COUNT = 200_000
+GRID_SIZE = 256
+
+
+@dataclass
+class _PrioritisedLocation:
+    """Wrapper for prioritised location, as used by the original priority queue."""
+
+    priority: float
+    location: int
+
+    def __lt__(self, other: Self) -> bool:
+        """Determine priority for `heapq`."""
+        return self.priority < other.priority
+
+
+class _DataclassPriorityQueue:
+    """Original priority queue, which never removes stale entries."""
+
+    def __init__(self) -> None:
+        self.items: list[_PrioritisedLocation] = []
+
+    @property
+    def is_empty(self) -> bool:
+        """Check whether the queue is empty."""
+        return not self.items
+
+    def put(self, priority: float, location: int) -> None:
+        """Add a location with priority."""
+        heapq.heappush(self.items, _PrioritisedLocation(priority, location))
+
+    def get(self) -> int:
+        """Remove and return the highest priority location."""
+        return heapq.heappop(self.items).location
+
+
+def _time_queue(
+    queue_class: type[_DataclassPriorityQueue | _PriorityQueue | _IndexedPriorityQueue],
+    operations: list[tuple[float, int]],
+) -> tuple[float, int]:
+    """Put locations, mostly already queued with higher priority, then get them all.
+
+    Returns
+    -------
+    tuple[float, int]
+        Elapsed time and maximum heap size.
+    """
+    start_time = time.perf_counter()
+    queue = queue_class()
+    for priority, location in operations:
+        queue.put(priority, location)
+    heap_size = len(queue.items)
+    while not queue.is_empty:
+        queue.get()
+    return time.perf_counter() - start_time, heap_size
+
+
+def run() -> None:
+    """Time each priority queue, on its own and as a search frontier."""
+    log = logging.getLogger(__name__)
+    random.seed(0)
+    # decreasing priorities, as when a search finds cheaper paths
+    operations = [
+        (PUT_COUNT - i + random.random(), random.randrange(LOCATION_COUNT))
+        for i in range(PUT_COUNT)
+    ]
+    queue_classes: dict[
+        str, type[_DataclassPriorityQueue | _PriorityQueue | _IndexedPriorityQueue]
+    ] = {
+        "dataclass (original)": _DataclassPriorityQueue,
+        "heap": _PriorityQueue,
+        "indexed": _IndexedPriorityQueue,
+    }
+    for name, queue_class in queue_classes.items():
+        elapsed_time, heap_size = _time_queue(queue_class, operations)
+        log_info(
+            log,
+            f"{name}: {PUT_COUNT / elapsed_time:,.0f} puts/s, "
+            f"peak heap size {heap_size:,}",
+        )
+
+    grid = Grid(GRID_SIZE, GRID_SIZE)
+    agent = Agent(grid, GridRef(0, 0))
+    agent.goal = GridRef(GRID_SIZE - 1, GRID_SIZE - 1)
+    for frontier in FRONTIERS:
+        start_time = time.perf_counter()
+        agent.uniform_cost_search(frontier=frontier)
+        elapsed_time = time.perf_counter() - start_time
+        log_info(
+            log, f"uniform_cost_search(frontier={frontier!r}): {elapsed_time:.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
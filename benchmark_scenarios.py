@@ -0,0 +1,262 @@
+"""Benchmark search modes against MovingAI `.scen` scenario files.
+
+Each scenario is a start and goal on a `.map` file, with the cost of the cheapest path.
+Searches are timed in one pass, then run again collecting search stats and with
+memory tracing, to count node expansions, peak frontier size and peak memory. Results
+are written as JSON, to compare between versions.
+
+MovingAI's costs forbid diagonal moves which cut the corners of untraversable
+locations, which `Grid` allows, so searches may find cheaper paths than the
+scenarios' costs. These are counted separately from disagreements.
+
+Example: `python benchmark_scenarios.py arena.map.scen --modes a_star jump_point`
+"""
+
+import argparse
+import datetime as dt
+import json
+import logging
+import math
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+from pathfinding import log_info
+from pathfinding.agent import Agent
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+from pathfinding.hierarchical import HierarchicalPathfinder
+from pathfinding.path import Path as GridPath
+
+COST_TOLERANCE = 1e-4
+"""Maximum difference from a scenario's cost, for a path's cost to agree."""
+
+
+class _SearchMode(Protocol):
+    """Search for the goal of an agent on a grid."""
+
+    def __call__(self, grid: Grid, agent: Agent, *, collect_stats: bool) -> GridPath:
+        """Return the path found, with search stats if collected."""
+        ...
+
+
+_pathfinders: dict[Grid, HierarchicalPathfinder] = {}
+
+SEARCH_MODES: dict[str, _SearchMode] = {
+    "uniform_cost": lambda _, agent, *, collect_stats: agent.uniform_cost_search(
+        collect_stats=collect_stats
+    ),
+    "a_star": lambda _, agent, *, collect_stats: agent.a_star_search(
+        collect_stats=collect_stats
+    ),
+    "bidirectional": lambda _, agent, *, collect_stats: agent.bidirectional_search(
+        collect_stats=collect_stats
+    ),
+    "jump_point": lambda _, agent, *, collect_stats: agent.jump_point_search(
+        collect_stats=collect_stats
+    ),
+    "landmark": lambda _, agent, *, collect_stats: agent.landmark_search(
+        collect_stats=collect_stats
+    ),
+    "hierarchical": lambda grid, agent, **_: _pathfinder(grid).find_path(
+        agent.location, agent.goal or agent.location
+    ),
+}
+"""Search for each mode, given a grid, an agent with a goal and whether to collect
+search stats."""
+
+
+def _pathfinder(grid: Grid) -> HierarchicalPathfinder:
+    """Return the hierarchical pathfinder for a grid, creating it if needed."""
+    pathfinder = _pathfinders.get(grid)
+    if pathfinder is None:
+        pathfinder = _pathfinders[grid] = HierarchicalPathfinder(grid)
+    return pathfinder
+
+
+@dataclass(frozen=True)
+class _Scenario:
+    """Start and goal on a map, with the cost of the cheapest path."""
+
+    map_filename: str
+    start: GridRef
+    goal: GridRef
+    optimal_cost: float
+
+
+def _load_scenarios(filename: Path) -> list[_Scenario]:
+    """Read scenarios from a MovingAI `.scen` file.
+
+    Map filenames are resolved relative to the scenario file's directory, falling
+    back to the map file's name alone in that directory.
+    """
+    scenarios = []
+    with filename.open() as file:
+        for line in file:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) != 9:  # noqa: PLR2004  # e.g. "version 1" header
+                continue
+            _, map_name, _, _, start_x, start_y, goal_x, goal_y, optimal_cost = fields
+            map_filename = filename.parent / map_name
+            if not map_filename.exists():
+                map_filename = filename.parent / Path(map_name).name
+            scenarios.append(
+                _Scenario(
+                    str(map_filename),
+                    GridRef(int(start_x), int(start_y)),
+                    GridRef(int(goal_x), int(goal_y)),
+                    float(optimal_cost),
+                )
+            )
+    return scenarios
+
+
+def _measure_searches(
+    search: _SearchMode, agents: list[tuple[Grid, Agent]]
+) -> tuple[int, int, int]:
+    """Run searches collecting stats, and tracing memory.
+
+    Returns
+    -------
+    tuple[int, int, int]
+        Total node expansions, peak frontier size, and peak memory in bytes.
+    """
+    expansion_count = 0
+    peak_frontier_size = 0
+    peak_memory = 0
+    tracemalloc.start()
+    for grid, agent in agents:
+        tracemalloc.reset_peak()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        stats = search(grid, agent, collect_stats=True).stats
+        _, memory_peak = tracemalloc.get_traced_memory()
+        peak_memory = max(peak_memory, memory_peak - memory_before)
+        if stats is not None:
+            expansion_count += stats.nodes_expanded
+            peak_frontier_size = max(peak_frontier_size, stats.peak_frontier_size)
+    tracemalloc.stop()
+    return expansion_count, peak_frontier_size, peak_memory
+
+
+def _prepare(mode: str, grids: dict[str, Grid]) -> None:
+    """Precompute what a search mode needs on each grid, which isn't timed."""
+    for grid in grids.values():
+        if mode == "hierarchical":
+            _ = _pathfinder(grid).transition_count
+        elif mode == "landmark" and grid.landmarks is None:
+            # as if loaded from a file saved next to the map
+            grid.precompute_landmarks()
+
+
+def _run_mode(
+    mode: str, scenarios: list[_Scenario], grids: dict[str, Grid]
+) -> dict[str, Any]:
+    """Run every scenario with a search mode, timed, then instrumented.
+
+    Returns
+    -------
+    dict[str, Any]
+        Measurements, to be written as JSON.
+    """
+    search = SEARCH_MODES[mode]
+    agents = []
+    for scenario in scenarios:
+        grid = grids[scenario.map_filename]
+        agent = Agent(grid, scenario.start)
+        grid.agents.discard(agent)  # not part of the grid's state
+        agent.goal = scenario.goal
+        agents.append((grid, agent))
+    _prepare(mode, grids)
+
+    start_time = time.perf_counter()
+    paths = [search(grid, agent, collect_stats=False) for grid, agent in agents]
+    elapsed_time = time.perf_counter() - start_time
+
+    expansion_count, peak_frontier_size, peak_memory = _measure_searches(search, agents)
+
+    agreed_count = 0
+    cheaper_count = 0
+    not_found_count = 0
+    cost_ratios = []
+    for scenario, path in zip(scenarios, paths, strict=True):
+        if not path:
+            not_found_count += 1
+            continue
+        if math.isclose(path.cost, scenario.optimal_cost, abs_tol=COST_TOLERANCE):
+            agreed_count += 1
+        elif path.cost < scenario.optimal_cost:
+            cheaper_count += 1
+        if scenario.optimal_cost:
+            cost_ratios.append(path.cost / scenario.optimal_cost)
+
+    query_count = len(scenarios)
+    return {
+        "query_count": query_count,
+        "elapsed_s": elapsed_time,
+        "queries_per_s": query_count / elapsed_time if elapsed_time else None,
+        # searches which don't collect stats count no expansions
+        "expansion_count": expansion_count or None,
+        "expansions_per_s": expansion_count / elapsed_time
+        if expansion_count and elapsed_time
+        else None,
+        "peak_frontier_size": peak_frontier_size or None,
+        "peak_memory_bytes": peak_memory,
+        "optimal_cost_agreed_count": agreed_count,
+        "cheaper_than_optimal_count": cheaper_count,
+        "not_found_count": not_found_count,
+        "mean_cost_ratio": sum(cost_ratios) / len(cost_ratios) if cost_ratios else None,
+    }
+
+
+def run() -> None:
+    """Run scenario files given on the command line, and write results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenario_files", nargs="+", type=Path)
+    parser.add_argument(
+        "--modes", nargs="+", choices=SEARCH_MODES, default=list(SEARCH_MODES)
+    )
+    parser.add_argument(
+        "--limit", type=int, help="maximum number of scenarios per scenario file"
+    )
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    args = parser.parse_args()
+
+    log = logging.getLogger(__name__)
+    scenarios = []
+    for filename in args.scenario_files:
+        scenarios.extend(_load_scenarios(filename)[: args.limit])
+    grids = {
+        map_filename: Grid.load_movingai_map(map_filename)
+        for map_filename in {scenario.map_filename for scenario in scenarios}
+    }
+    for grid in grids.values():  # time searches, not cache hits
+        grid.path_cache.max_size = 0
+    log_info(log, f"Loaded {len(scenarios)} scenarios on {len(grids)} maps.")
+
+    results = {}
+    for mode in args.modes:
+        results[mode] = _run_mode(mode, scenarios, grids)
+        log_info(
+            log,
+            f"{mode}: {results[mode]['queries_per_s']:,.1f} queries/s, "
+            f"{results[mode]['optimal_cost_agreed_count']}/{len(scenarios)} "
+            "agree with optimal cost",
+        )
+
+    report = {
+        "timestamp": dt.datetime.now(tz=dt.UTC).isoformat(),
+        "python_version": platform.python_version(),
+        "scenario_files": [str(filename) for filename in args.scenario_files],
+        "limit": args.limit,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    log_info(log, f"Results written to {args.output}.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
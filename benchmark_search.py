@@ -0,0 +1,72 @@
+"""Benchmark uniform cost search against a reference `GridRef`-based search."""
+
+import heapq
+import itertools
+import logging
+import time
+
+from pathfinding import log_info
+from pathfinding.agent import Agent
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+
+GRID_SIZE = 256
+REPEATS = 3
+
+
+def _reference_search(grid: Grid, start: GridRef, goal: GridRef) -> int:
+    """Perform uniform cost search using `Grid.neighbours()` and `Grid.cost()`.
+
+    Equivalent to `Agent.uniform_cost_search()` before it used flat array indices,
+    other than its priority queue.
+
+    Returns
+    -------
+    int
+        Number of nodes expanded.
+    """
+    cost_so_far: dict[GridRef, float] = {start: 0}
+    counter = itertools.count()  # avoids comparing GridRefs
+    frontier: list[tuple[float, int, GridRef]] = [(0, next(counter), start)]
+    expanded = 0
+    while frontier:
+        _, _, current = heapq.heappop(frontier)
+        expanded += 1
+        if current == goal:
+            break
+        for new in grid.neighbours(current):
+            new_cost = cost_so_far[current] + grid.cost(current, new)
+            if new not in cost_so_far or new_cost < cost_so_far[new]:
+                cost_so_far[new] = new_cost
+                heapq.heappush(frontier, (new_cost, next(counter), new))
+    return expanded
+
+
+def run() -> None:
+    """Time searches across an open grid, with each implementation."""
+    log = logging.getLogger(__name__)
+    grid = Grid(GRID_SIZE, GRID_SIZE)
+    grid.path_cache.max_size = 0  # time searches, not cache hits
+    agent = Agent(grid, GridRef(0, 0))
+    agent.goal = GridRef(GRID_SIZE - 1, GRID_SIZE - 1)
+
+    start_time = time.perf_counter()
+    for _ in range(REPEATS):
+        expanded = _reference_search(grid, agent.location, agent.goal)
+    reference_time = time.perf_counter() - start_time
+    reference_rate = expanded * REPEATS / reference_time
+    log_info(log, f"Reference: {reference_rate:,.0f} expansions/s")
+
+    start_time = time.perf_counter()
+    for _ in range(REPEATS):
+        agent.uniform_cost_search()
+    search_time = time.perf_counter() - start_time
+    # same algorithm, so expands the same nodes
+    search_rate = expanded * REPEATS / search_time
+    log_info(log, f"uniform_cost_search(): {search_rate:,.0f} expansions/s")
+    log_info(log, f"Speedup: {search_rate / reference_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
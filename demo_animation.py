@@ -0,0 +1,51 @@
+"""Run a demo, recording agents moving along their paths as an animated GIF."""
+
+import logging
+import time
+
+from pathfinding import log_info
+from pathfinding.agent import Agent
+from pathfinding.animation import AnimationRecorder
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+
+AGENT_COUNT = 100
+WORKER_COUNT = 4
+FILENAME = "demo_animation.gif"
+
+
+def run() -> None:
+    """Create a Grid and agents, plan paths, then record each step along them."""
+    log = logging.getLogger(__name__)
+    start_time = time.time()
+
+    grid = Grid(64, 64)
+    grid.set_untraversable_area(GridRef(20, 8), GridRef(22, 55))
+    agents = [
+        Agent(
+            grid,
+            location=grid.random_location(),
+        )
+        for _ in range(AGENT_COUNT)
+    ]
+    for agent in agents:
+        agent.goal = grid.random_location()
+    paths = grid.plan_paths(agents, workers=WORKER_COUNT)
+    log_info(log, f"{AGENT_COUNT} paths planned.", start_time)
+
+    with AnimationRecorder(grid, FILENAME, scale=8) as recorder:
+        recorder.record_frame()
+        step = 1
+        while any(step < len(path) for path in paths.values()):
+            for agent, path in paths.items():
+                if step < len(path):
+                    agent.location = path[step]
+                    grid.shared_path_locations.add(path[step])
+            recorder.record_frame()
+            step += 1
+    log_info(log, f"{recorder.frame_count} frames saved to {FILENAME}.", start_time)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
@@ -10,6 +10,7 @@ from pathfinding.grid_ref import GridRef
 from pathfinding.image_renderer import GridRenderer
 
 AGENT_COUNT = 100
+WORKER_COUNT = 4
 
 
 def run() -> None:
@@ -35,9 +36,9 @@ def run() -> None:
 
     for agent in agents:
         agent.goal = grid.random_location()
-        path = agent.uniform_cost_search()
-        for location in path:
-            grid.shared_path_locations.add(location)
+    paths = grid.plan_paths(agents, workers=WORKER_COUNT)
+    for path in paths.values():
+        grid.shared_path_locations.update(path)
 
     log_info(log, f"{AGENT_COUNT} iterations complete.", start_time)
     renderer = GridRenderer(grid, scale=8)
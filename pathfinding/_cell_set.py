@@ -0,0 +1,169 @@
+"""CellSet class."""
+
+from collections.abc import Callable, Iterable, Iterator, MutableSet
+from weakref import WeakMethod
+
+from pathfinding.grid_ref import GridRef
+
+
+class _CellSet(MutableSet[GridRef]):
+    """Set of locations, stored as a flat array of flags.
+
+    The flag for location (x, y) is at index `y * size_x + x`. Out of bounds locations
+    are never members, and are ignored when added.
+    """
+
+    def __init__(self, size_x: int, size_y: int) -> None:
+        self.size_x = size_x
+        self.size_y = size_y
+        self.cells = bytearray(size_x * size_y)
+        """Flag for each location: 1 if a member, otherwise 0. Read only; change
+        members through methods, so that changes are tracked."""
+        self.version = 0
+        """Incremented on each change of members."""
+        self._listeners: list[WeakMethod[Callable[[int, int], None]]] = []
+        self._late_listeners: list[WeakMethod[Callable[[int, int], None]]] = []
+        """Called after `_CellSet._listeners`, once derived data is up to date."""
+
+    def _index(self, location: GridRef) -> int | None:
+        """Return the index of a location, or None if out of bounds."""
+        if 0 <= location.x < self.size_x and 0 <= location.y < self.size_y:
+            return location.y * self.size_x + location.x
+        return None
+
+    def __contains__(self, location: object) -> bool:
+        if not isinstance(location, GridRef):
+            return False
+        index = self._index(location)
+        return index is not None and self.cells[index] == 1
+
+    def __iter__(self) -> Iterator[GridRef]:
+        index = self.cells.find(1)
+        while index != -1:
+            yield GridRef(index % self.size_x, index // self.size_x)
+            index = self.cells.find(1, index + 1)
+
+    def __len__(self) -> int:
+        return self.cells.count(1)
+
+    def __eq__(self, other: object) -> bool:
+        # Explicit, so comparison with built-in sets isn't flagged as non-overlapping
+        return super().__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]  # mutable, like built-in sets
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({set(self)})"
+
+    def add(self, location: GridRef) -> None:
+        """Add a location. Out of bounds locations are ignored."""
+        index = self._index(location)
+        if index is not None and not self.cells[index]:
+            self.cells[index] = 1
+            self._changed(index, index + 1)
+
+    def discard(self, location: GridRef) -> None:
+        """Remove a location if present."""
+        index = self._index(location)
+        if index is not None and self.cells[index]:
+            self.cells[index] = 0
+            self._changed(index, index + 1)
+
+    def update(self, locations: Iterable[GridRef]) -> None:
+        """Add locations. Out of bounds locations are ignored."""
+        for location in locations:
+            self.add(location)
+
+    def clear(self) -> None:
+        """Remove all locations."""
+        self.cells[:] = bytes(len(self.cells))
+        self._changed(0, len(self.cells))
+
+    def add_indices(self, indices: Iterable[int]) -> None:
+        """Add locations by flat array index, as one change per run of adjacent
+        locations in a row which weren't already members.
+        """
+        cells = self.cells
+        size_x = self.size_x
+        new_indices = sorted({index for index in indices if not cells[index]})
+        run_start = 0
+        for position, index in enumerate(new_indices, 1):
+            cells[index] = 1
+            if (
+                position == len(new_indices)
+                or new_indices[position] != index + 1
+                or (index + 1) % size_x == 0
+            ):
+                self._changed(new_indices[run_start], index + 1)
+                run_start = position
+
+    def add_range(self, start: int, stop: int) -> None:
+        """Add locations from flat array index `start` up to `stop`, unless all are
+        already members.
+        """
+        if self.cells.find(0, start, stop) == -1:
+            return
+        self.cells[start:stop] = b"\x01" * (stop - start)
+        self._changed(start, stop)
+
+    def replace(self, cells: bytes | bytearray) -> None:
+        """Replace all members with flags for each flat array index, one per byte."""
+        if len(cells) != len(self.cells):
+            err_msg = f"Expected {len(self.cells)} flags, got {len(cells)}."
+            raise ValueError(err_msg)
+        self.cells[:] = cells
+        self._changed(0, len(self.cells))
+
+    def assign(self, locations: Iterable[GridRef]) -> None:
+        """Replace all members with `locations`, as a single change.
+
+        Out of bounds locations are ignored. Assigning the set to itself, as after an
+        in-place operator such as `|=` on a `.grid.Grid` attribute, changes nothing.
+        """
+        if locations is self:
+            return
+        cells = bytearray(len(self.cells))
+        for location in locations:
+            index = self._index(location)
+            if index is not None:
+                cells[index] = 1
+        self.replace(cells)
+
+    def add_listener(
+        self, callback: Callable[[int, int], None], *, late: bool = False
+    ) -> None:
+        """Call a bound method on each change, with the range of flat array indices
+        changed, `start` to `stop`.
+
+        Only holds a weak reference to the method's object. Late listeners are called
+        after all others, so they see data derived from the set already updated.
+        """
+        listeners = self._late_listeners if late else self._listeners
+        listeners.append(WeakMethod(callback))
+
+    def _changed(self, start: int, stop: int) -> None:
+        """Record a change to locations from flat array index `start` up to `stop`."""
+        self.version += 1
+        if self._listeners:
+            self._listeners = _notify(self._listeners, start, stop)
+        if self._late_listeners:
+            self._late_listeners = _notify(self._late_listeners, start, stop)
+
+
+def _notify(
+    listeners: list[WeakMethod[Callable[[int, int], None]]], start: int, stop: int
+) -> list[WeakMethod[Callable[[int, int], None]]]:
+    """Call each listener whose object is still alive with a change.
+
+    Returns
+    -------
+    list[WeakMethod[Callable[[int, int], None]]]
+        Listeners still alive.
+    """
+    live_listeners = []
+    for listener in listeners:
+        callback = listener()
+        if callback is not None:
+            callback(start, stop)
+            live_listeners.append(listener)
+    return live_listeners
@@ -0,0 +1,119 @@
+"""Functions for saving and loading grids in a compact binary file format.
+
+A file holds a fixed-size header, then one bit per location for untraversable
+locations, then optionally one bit per location for shared path locations. Bits are
+packed in flat array index order, least significant bit first.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .grid import Grid
+
+_MAGIC = b"PFGRID"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<6sBBIId")
+"""Magic bytes, format version, flags, size x, size y, prefer traversed factor."""
+
+_ALLOW_DIAGONAL_MOVES = 1
+_HAS_SHARED_PATH = 2
+
+_BIT_TABLES = [bytes((value >> bit) & 1 for value in range(256)) for bit in range(8)]
+"""For each bit position, the value of that bit in each byte value."""
+
+
+def _save_grid(grid: Grid, filename: str) -> None:
+    """Save a grid's dimensions, settings and locations to a file."""
+    shared_path_cells = grid.shared_path_locations.cells
+    has_shared_path = shared_path_cells.find(1) != -1
+    flags = (_ALLOW_DIAGONAL_MOVES if grid.allow_diagonal_moves else 0) | (
+        _HAS_SHARED_PATH if has_shared_path else 0
+    )
+    with Path(filename).open("wb") as file:
+        file.write(
+            _HEADER.pack(
+                _MAGIC,
+                _FORMAT_VERSION,
+                flags,
+                grid.size_x,
+                grid.size_y,
+                grid.prefer_traversed_factor,
+            )
+        )
+        file.write(_pack_bits(grid.untraversable_locations.cells))
+        if has_shared_path:
+            file.write(_pack_bits(shared_path_cells))
+
+
+def _load_grid[T: Grid](grid_class: type[T], filename: str) -> T:
+    """Create a grid from a file written by `_save_grid()`.
+
+    The file is memory-mapped, and each layer unpacked straight from the mapping.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a grid file, or is truncated.
+    """
+    with (
+        Path(filename).open("rb") as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        if len(mapped) < _HEADER.size:
+            err_msg = f"{filename} is not a grid file."
+            raise ValueError(err_msg)
+        magic, version, flags, size_x, size_y, prefer_traversed_factor = (
+            _HEADER.unpack_from(mapped)
+        )
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            err_msg = f"{filename} is not a grid file, or has an unsupported version."
+            raise ValueError(err_msg)
+        cell_count = size_x * size_y
+        layer_size = -(-cell_count // 8)
+        layer_count = 2 if flags & _HAS_SHARED_PATH else 1
+        if len(mapped) < _HEADER.size + layer_count * layer_size:
+            err_msg = f"{filename} is truncated."
+            raise ValueError(err_msg)
+
+        grid = grid_class(
+            size_x,
+            size_y,
+            allow_diagonal_moves=bool(flags & _ALLOW_DIAGONAL_MOVES),
+            prefer_traversed_factor=prefer_traversed_factor,
+        )
+        with memoryview(mapped) as view:
+            start = _HEADER.size
+            grid.untraversable_locations.replace(
+                _unpack_bits(view[start : start + layer_size], cell_count)
+            )
+            if flags & _HAS_SHARED_PATH:
+                start += layer_size
+                grid.shared_path_locations.replace(
+                    _unpack_bits(view[start : start + layer_size], cell_count)
+                )
+    return grid
+
+
+def _pack_bits(cells: bytes | bytearray) -> bytes:
+    """Pack flags, one per byte, into bits, least significant bit first."""
+    padded = bytes(cells).ljust(-(-len(cells) // 8) * 8, b"\x00")
+    # Each bit plane holds 0 or 1 per byte, so shifted planes never overlap
+    packed = 0
+    for bit in range(8):
+        packed |= int.from_bytes(padded[bit::8], "little") << bit
+    return packed.to_bytes(len(padded) // 8, "little")
+
+
+def _unpack_bits(packed: bytes | memoryview, count: int) -> bytearray:
+    """Unpack `count` flags, one per byte, from bits packed by `_pack_bits()`."""
+    packed = bytes(packed)
+    cells = bytearray(len(packed) * 8)
+    for bit, table in enumerate(_BIT_TABLES):
+        cells[bit::8] = packed.translate(table)
+    del cells[count:]
+    return cells
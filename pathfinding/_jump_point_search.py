@@ -0,0 +1,288 @@
+"""Jump point search, working on flat array indices of grid locations.
+
+Only valid where moves have uniform basic cost, and diagonal moves are allowed.
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+from ._priority_queue import _new_frontier
+from ._search import _PRIORITY_PRECISION, _reconstruct_path
+from .heuristics import octile
+from .path import Path
+
+if TYPE_CHECKING:
+    from ._priority_queue import Frontier
+    from .grid import Grid
+    from .heuristics import Heuristic
+    from .search_stats import SearchStats
+
+_columns_cache: WeakKeyDictionary[Grid, tuple[int, bytes]] = WeakKeyDictionary()
+"""Column-major copy of each grid's untraversable flags, with `Grid.version`."""
+
+_ALL_DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1), (1, 1), (-1, 1), (-1, -1), (1, -1)]
+
+
+def _jump_point_search(  # noqa: C901, PLR0915
+    grid: Grid,
+    start: int,
+    goal: int,
+    heuristic: Heuristic,
+    frontier_type: Frontier = "heap",
+    stats: SearchStats | None = None,
+) -> Path:
+    """Search for `goal` from `start`, expanding only jump points.
+
+    From each location, moves continue in a straight line until reaching `goal` or a
+    location with a forced neighbour, i.e. one which can only be reached optimally via
+    that location. Symmetric paths through open areas are not expanded.
+
+    Returns
+    -------
+    Path
+        Locations on the path, from `start` to `goal` inclusive.
+        Empty if no path found.
+    """
+    size_x = grid.size_x
+    size_y = grid.size_y
+    untraversable_cells = grid.untraversable_locations.cells
+    goal_x = goal % size_x
+    goal_y = goal // size_x
+
+    def is_blocked(x: int, y: int) -> bool:
+        """Determine whether a location is out of bounds or untraversable."""
+        return not (0 <= x < size_x and 0 <= y < size_y) or bool(
+            untraversable_cells[y * size_x + x]
+        )
+
+    columns = _columns(grid)
+
+    def jump(x: int, y: int, dx: int, dy: int) -> int:
+        """Move from a location in a direction until reaching a jump point.
+
+        Returns
+        -------
+        int
+            Index of the jump point, or -1 if none.
+        """
+        if not dy:
+            new_x = _scan(
+                untraversable_cells,
+                size_x,
+                size_y,
+                y,
+                x,
+                dx,
+                goal_x if y == goal_y else -1,
+            )
+            return -1 if new_x == -1 else y * size_x + new_x
+        if not dx:
+            new_y = _scan(
+                columns,
+                size_y,
+                size_x,
+                x,
+                y,
+                dy,
+                goal_y if x == goal_x else -1,
+            )
+            return -1 if new_y == -1 else new_y * size_x + x
+        while True:
+            x += dx
+            y += dy
+            if is_blocked(x, y):
+                return -1
+            index = y * size_x + x
+            if (
+                index == goal
+                or (is_blocked(x - dx, y) and not is_blocked(x - dx, y + dy))
+                or (is_blocked(x, y - dy) and not is_blocked(x + dx, y - dy))
+                or jump(x, y, dx, 0) != -1
+                or jump(x, y, 0, dy) != -1
+            ):
+                return index
+
+    def directions(x: int, y: int, dx: int, dy: int) -> list[tuple[int, int]]:
+        """Return directions to search from a location, reached moving in a direction.
+
+        Natural neighbours (those ahead), plus any forced neighbours.
+        """
+        if dx and dy:
+            result = [(dx, 0), (0, dy), (dx, dy)]
+            if is_blocked(x - dx, y):
+                result.append((-dx, dy))
+            if is_blocked(x, y - dy):
+                result.append((dx, -dy))
+        elif dx:
+            result = [(dx, 0)]
+            if is_blocked(x, y + 1):
+                result.append((dx, 1))
+            if is_blocked(x, y - 1):
+                result.append((dx, -1))
+        else:
+            result = [(0, dy)]
+            if is_blocked(x + 1, y):
+                result.append((1, dy))
+            if is_blocked(x - 1, y):
+                result.append((-1, dy))
+        return result
+
+    came_from: dict[int, int] = {start: start}
+    cost_so_far: dict[int, float] = {start: 0}
+    frontier = _new_frontier(frontier_type, stats)
+    frontier.put(0, start)
+
+    while not frontier.is_empty:
+        current = frontier.get()
+
+        if current == goal:  # early exit
+            break
+
+        current_cost = cost_so_far[current]
+        x = current % size_x
+        y = current // size_x
+        if current == start:
+            current_directions = _ALL_DIRECTIONS
+        else:
+            parent = came_from[current]
+            current_directions = directions(
+                x,
+                y,
+                _sign(x - parent % size_x),
+                _sign(y - parent // size_x),
+            )
+        for dx, dy in current_directions:
+            new = jump(x, y, dx, dy)
+            if new == -1:
+                continue
+            new_x = new % size_x
+            new_y = new // size_x
+            new_cost = current_cost + octile(abs(new_x - x), abs(new_y - y))
+            old_cost = cost_so_far.get(new)
+            if old_cost is None or new_cost < old_cost:
+                # add new to frontier if cheaper
+                cost_so_far[new] = new_cost
+                came_from[new] = current
+                estimate = heuristic(abs(goal_x - new_x), abs(goal_y - new_y))
+                # Break ties towards goal, to avoid expanding many equal-cost
+                # paths. Round so that float error doesn't hide ties.
+                frontier.put(
+                    round(new_cost + estimate, _PRIORITY_PRECISION), new, estimate
+                )
+
+    if goal not in came_from:
+        return Path(size_x)
+    reconstruction_start_ns = time.perf_counter_ns()
+    indices = _interpolate(_reconstruct_path(came_from, start, goal), size_x)
+    if stats is not None:
+        stats.reconstruction_ns = time.perf_counter_ns() - reconstruction_start_ns
+    return Path(size_x, indices, cost_so_far[goal])
+
+
+def _scan(
+    cells: bytes | bytearray,
+    length: int,
+    line_count: int,
+    line: int,
+    position: int,
+    direction: int,
+    goal_position: int,
+) -> int:
+    """Move along a line of cells until reaching a jump point, without diagonal moves.
+
+    Each line is a row (or column) of `cells`, `length` long. A jump point is the goal,
+    or a location with a forced neighbour, i.e. one where a neighbouring line is
+    blocked alongside the location and open ahead of it.
+
+    Parameters
+    ----------
+    cells
+        Flags for untraversable locations, in `line_count` lines of `length`.
+    line
+        Line to move along.
+    position
+        Position along `line` to move from.
+    direction
+        1 or -1.
+    goal_position
+        Position of the goal along `line`; -1 if the goal isn't on `line`.
+
+    Returns
+    -------
+    int
+        Position of the jump point along `line`, or -1 if none.
+    """
+    line_start = line * length
+    side_line_starts = [
+        side_line * length
+        for side_line in (line - 1, line + 1)
+        if 0 <= side_line < line_count
+    ]
+    if direction == 1:
+        blocked = cells.find(1, line_start + position + 1, line_start + length)
+        stop = length if blocked == -1 else blocked - line_start
+        jump_point = goal_position if position < goal_position < stop else stop
+        for side_start in side_line_starts:
+            forced = cells.find(
+                b"\x01\x00",
+                side_start + position + 1,
+                side_start + min(jump_point + 1, length),
+            )
+            if forced != -1:
+                jump_point = forced - side_start
+        return -1 if jump_point == stop else jump_point
+
+    blocked = cells.rfind(1, line_start, line_start + position)
+    stop = -1 if blocked == -1 else blocked - line_start
+    jump_point = goal_position if stop < goal_position < position else stop
+    for side_start in side_line_starts:
+        forced = cells.rfind(
+            b"\x00\x01",
+            side_start + max(jump_point, 0),
+            side_start + position,
+        )
+        if forced != -1:
+            jump_point = forced - side_start + 1
+    return -1 if jump_point == stop else jump_point
+
+
+def _columns(grid: Grid) -> bytes:
+    """Return flags for untraversable locations, column by column.
+
+    Cached until the grid changes.
+    """
+    cached = _columns_cache.get(grid)
+    if cached is not None and cached[0] == grid.version:
+        return cached[1]
+    cells = grid.untraversable_locations.cells
+    columns = b"".join(cells[x :: grid.size_x] for x in range(grid.size_x))
+    _columns_cache[grid] = (grid.version, columns)
+    return columns
+
+
+def _sign(value: int) -> int:
+    """Return -1, 0 or 1, matching the sign of `value`."""
+    return (value > 0) - (value < 0)
+
+
+def _interpolate(jump_points: list[int], size_x: int) -> list[int]:
+    """Return every index on straight or diagonal lines between jump points."""
+    indices = jump_points[:1]
+    for from_index, to_index in itertools.pairwise(jump_points):
+        x_dist = to_index % size_x - from_index % size_x
+        y_dist = to_index // size_x - from_index // size_x
+        offset = _sign(y_dist) * size_x + _sign(x_dist)
+        step_count = max(abs(x_dist), abs(y_dist))
+        indices.extend(from_index + offset * step for step in range(1, step_count + 1))
+    return indices
+
+
+def _has_uniform_costs(grid: Grid) -> bool:
+    """Determine whether jump point search is valid on a grid."""
+    return grid.allow_diagonal_moves and (
+        grid.prefer_traversed_factor == 0 or not grid.shared_path_locations
+    )
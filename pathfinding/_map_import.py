@@ -0,0 +1,92 @@
+"""Functions for importing untraversable locations in bulk, from image masks and
+MovingAI benchmark `.map` files.
+
+Each fills a whole array of flags, then replaces a grid's untraversable locations in
+one step, without creating a `GridRef` per location.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+    from .grid import Grid
+
+_MOVINGAI_UNTRAVERSABLE = b"@OTW"
+"""MovingAI map characters for out of bounds, trees and water; all others are
+traversable."""
+_MOVINGAI_FLAGS = bytes(
+    1 if value in _MOVINGAI_UNTRAVERSABLE else 0 for value in range(256)
+)
+
+
+def _set_untraversable_from_image(
+    grid: Grid, image: Image.Image, threshold: int
+) -> None:
+    """Add untraversable locations where an image is darker than `threshold`.
+
+    Pixel (x, y) maps to location (x, y). Pixels off the grid are ignored.
+    """
+    cell_count = grid.size_x * grid.size_y
+    mask = (
+        image.convert("L")
+        .point([1 if value < threshold else 0 for value in range(256)])
+        # cropping pads pixels beyond the image with 0, i.e. traversable
+        .crop((0, 0, grid.size_x, grid.size_y))
+    )
+    # Flags are 0 or 1 per byte, so OR never carries between bytes
+    cells = int.from_bytes(grid.untraversable_locations.cells) | int.from_bytes(
+        mask.tobytes()
+    )
+    grid.untraversable_locations.replace(cells.to_bytes(cell_count))
+
+
+def _load_movingai_map[T: Grid](grid_class: type[T], filename: str) -> T:
+    """Create a grid from a MovingAI benchmark `.map` file.
+
+    The file is read a row at a time, each row translated to flags in one step.
+
+    Raises
+    ------
+    ValueError
+        If the header or any row is malformed.
+    """
+    with Path(filename).open("rb") as file:
+        header: dict[str, str] = {}
+        for line in file:
+            fields = line.decode("ascii").split()
+            if fields == ["map"]:
+                break
+            if len(fields) == 2:  # noqa: PLR2004
+                header[fields[0]] = fields[1]
+        try:
+            size_x = int(header["width"])
+            size_y = int(header["height"])
+        except (KeyError, ValueError) as err:
+            err_msg = f"{filename} has no valid width and height in its header."
+            raise ValueError(err_msg) from err
+
+        cells = bytearray(size_x * size_y)
+        y = 0
+        for line in file:
+            row = line.rstrip(b"\r\n")
+            if not row:
+                continue
+            if y == size_y:
+                err_msg = f"{filename} has more than {size_y} rows."
+                raise ValueError(err_msg)
+            if len(row) != size_x:
+                err_msg = f"{filename} row {y} has {len(row)} locations, not {size_x}."
+                raise ValueError(err_msg)
+            cells[y * size_x : (y + 1) * size_x] = row.translate(_MOVINGAI_FLAGS)
+            y += 1
+        if y != size_y:
+            err_msg = f"{filename} has {y} rows, expected {size_y}."
+            raise ValueError(err_msg)
+
+    grid = grid_class(size_x, size_y)
+    grid.untraversable_locations.replace(cells)
+    return grid
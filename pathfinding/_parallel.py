@@ -0,0 +1,182 @@
+"""Worker processes for planning paths.
+
+Each worker process holds one copy of the grid, which it reads from shared memory.
+Workers are kept between calls; when the grid changes, its locations are written to
+shared memory again, and each worker refreshes its copy before its next task. Tasks
+only carry the start and goal of each path.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING
+
+from ._search import _find_path
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .grid import Grid
+    from .path import Path
+
+_TASKS_PER_WORKER = 4
+"""Number of tasks to split each worker's share of paths into, to balance load."""
+_HEADER = struct.Struct("<qd")
+"""Generation, incremented each time the grid is written, and prefer traversed
+factor; followed in shared memory by untraversable then shared path locations."""
+
+_worker_grid: Grid | None = None
+"""Worker process's copy of the grid."""
+_worker_memory: shared_memory.SharedMemory | None = None
+"""Worker process's attachment to the shared grid."""
+_worker_generation = 0
+"""Generation of the shared grid last read by the worker process."""
+
+
+class _WorkerPool:
+    """Worker processes, each with a copy of a grid, kept between calls to
+    `.grid.Grid.plan_paths()`.
+
+    Shut down, and the shared memory released, when the grid is garbage collected or
+    the interpreter exits.
+    """
+
+    def __init__(self, grid: Grid, workers: int) -> None:
+        self.workers = workers
+        """Number of worker processes."""
+        self._version = grid.version
+        self._prefer_traversed_factor = grid.prefer_traversed_factor
+        self._generation = 0
+        cell_count = grid.size_x * grid.size_y
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=_HEADER.size + 2 * cell_count
+        )
+        self._write(grid)
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                self._memory.name,
+                type(grid),
+                grid.size_x,
+                grid.size_y,
+                grid.allow_diagonal_moves,
+            ),
+        )
+        self._finalizer = weakref.finalize(
+            grid, _shut_down, self._executor, self._memory
+        )
+
+    def plan(self, grid: Grid, queries: Sequence[tuple[int, int]]) -> list[Path]:
+        """Find a path for each `(start, goal)` query, across worker processes.
+
+        Returns
+        -------
+        list[Path]
+            Locations on each path, in the same order as `queries`.
+        """
+        if (grid.version, grid.prefer_traversed_factor) != (
+            self._version,
+            self._prefer_traversed_factor,
+        ):
+            self._write(grid)
+        chunksize = math.ceil(len(queries) / (self.workers * _TASKS_PER_WORKER))
+        return list(
+            self._executor.map(_plan_path, queries, chunksize=max(chunksize, 1))
+        )
+
+    def close(self) -> None:
+        """Shut down the worker processes, and release the shared memory."""
+        self._finalizer()
+
+    def _write(self, grid: Grid) -> None:
+        """Write the grid's locations to shared memory, for workers to refresh from."""
+        cell_count = grid.size_x * grid.size_y
+        buffer = _buffer(self._memory)
+        start = _HEADER.size
+        buffer[start : start + cell_count] = grid.untraversable_locations.cells
+        buffer[start + cell_count : start + 2 * cell_count] = (
+            grid.shared_path_locations.cells
+        )
+        self._generation += 1
+        _HEADER.pack_into(buffer, 0, self._generation, grid.prefer_traversed_factor)
+        self._version = grid.version
+        self._prefer_traversed_factor = grid.prefer_traversed_factor
+
+
+def _shut_down(
+    executor: ProcessPoolExecutor, memory: shared_memory.SharedMemory
+) -> None:
+    """Shut down worker processes, and release their shared memory."""
+    executor.shutdown()
+    memory.close()
+    memory.unlink()
+
+
+def _buffer(memory: shared_memory.SharedMemory) -> memoryview:
+    """Return a shared memory block's buffer."""
+    if memory.buf is None:
+        err_msg = f"Shared memory {memory.name} is closed."
+        raise ValueError(err_msg)
+    return memory.buf
+
+
+def _init_worker(
+    memory_name: str,
+    grid_class: type[Grid],
+    size_x: int,
+    size_y: int,
+    allow_diagonal_moves: bool,  # noqa: FBT001
+) -> None:
+    """Create the worker process's copy of the grid, from shared memory."""
+    global _worker_grid, _worker_memory  # noqa: PLW0603
+    _worker_grid = grid_class(size_x, size_y, allow_diagonal_moves=allow_diagonal_moves)
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _refresh_worker_grid(_worker_grid, _worker_memory)
+
+
+def _refresh_worker_grid(grid: Grid, memory: shared_memory.SharedMemory) -> None:
+    """Update the worker process's copy of the grid, if written since last read.
+
+    Layers are only replaced if they changed, so the copy's connected components are
+    only relabelled when untraversable locations change.
+    """
+    global _worker_generation  # noqa: PLW0603
+    buffer = _buffer(memory)
+    generation, prefer_traversed_factor = _HEADER.unpack_from(buffer)
+    if generation == _worker_generation:
+        return
+    cell_count = grid.size_x * grid.size_y
+    start = _HEADER.size
+    for cell_set, cells in (
+        (grid.untraversable_locations, buffer[start : start + cell_count]),
+        (
+            grid.shared_path_locations,
+            buffer[start + cell_count : start + 2 * cell_count],
+        ),
+    ):
+        if cell_set.cells != cells:
+            cell_set.replace(cells.tobytes())
+    grid.prefer_traversed_factor = prefer_traversed_factor
+    _worker_generation = generation
+
+
+def _plan_path(query: tuple[int, int]) -> Path:
+    """Find a path on the worker process's copy of the grid.
+
+    Returns
+    -------
+    Path
+        Locations on the path, from start to goal inclusive.
+        Empty if no path found.
+    """
+    if _worker_grid is None or _worker_memory is None:
+        err_msg = "Worker process not initialised."
+        raise RuntimeError(err_msg)
+    _refresh_worker_grid(_worker_grid, _worker_memory)
+    start, goal = query
+    return _find_path(_worker_grid, start, goal, _worker_grid.default_heuristic)
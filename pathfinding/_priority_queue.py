@@ -1,48 +1,268 @@
-"""PriorityQueue class."""
+"""PriorityQueue classes.
+
+Specialised for holding locations as flat array indices. Entries are
+`(priority, tiebreak, location)` tuples, so they are compared by `heapq` without
+calling Python code.
+
+Putting a location which is already queued changes its priority.
+"""
+
+from __future__ import annotations
 
 import heapq
-from dataclasses import dataclass
-from typing import Self
+import math
+from typing import TYPE_CHECKING, Literal
 
-from pathfinding.grid_ref import GridRef
+if TYPE_CHECKING:
+    from .search_stats import SearchStats
 
+type Frontier = Literal["heap", "indexed"]
+"""Name of a priority queue class, to be used as a search frontier."""
 
-@dataclass
-class _PrioritisedLocation:
-    """Wrapper for prioritised location.
+_COMPACT_MIN_STALE = 1024
+"""Minimum number of stale entries before `_PriorityQueue` removes them."""
+
+
+class _PriorityQueue:
+    """Priority queue, using heapq.
 
-    Avoids unintended prioritisation attempts on `location` itself.
+    When a location's priority is changed, its old entry is left in the heap and
+    skipped when reached (lazy deletion). Stale entries are removed when they outnumber
+    current entries.
     """
 
-    priority: float
-    location: GridRef
+    def __init__(self) -> None:
+        self.items: list[tuple[float, float, int]] = []
+        self._priorities: dict[int, float] = {}
+        """Current priority of each queued location."""
+        self._stale_count = 0
 
-    def __lt__(self, other: Self) -> bool:
-        """Determine priority for `heapq`."""
-        return self.priority < other.priority
+    @property
+    def is_empty(self) -> bool:
+        """Check whether the queue is empty."""
+        return not self._priorities
 
+    def __len__(self) -> int:
+        return len(self._priorities)
 
-class _PriorityQueue:
-    """Simple priority queue, using heapq.
+    @property
+    def min_priority(self) -> float:
+        """Priority of the highest priority location; `math.inf` if empty."""
+        items = self.items
+        priorities = self._priorities
+        while items and priorities.get(items[0][2]) != items[0][0]:
+            heapq.heappop(items)
+            self._stale_count -= 1
+        return items[0][0] if items else math.inf
 
-    Specialised for holding locations.
+    def put(self, priority: float, location: int, tiebreak: float = 0) -> None:
+        """Add a location with priority, and optional tiebreak for equal priority."""
+        if location in self._priorities:
+            self._stale_count += 1
+        self._priorities[location] = priority
+        heapq.heappush(self.items, (priority, tiebreak, location))
+        if self._stale_count > max(_COMPACT_MIN_STALE, len(self._priorities)):
+            self._compact()
+
+    def get(self) -> int:
+        """Remove and return the highest priority location.
+
+        NB this is the lowest `priority` value.
+        """
+        priorities = self._priorities
+        while True:
+            priority, _, location = heapq.heappop(self.items)
+            if priorities.get(location) == priority:
+                del priorities[location]
+                return location
+            self._stale_count -= 1
+
+    def _compact(self) -> None:
+        """Remove stale entries."""
+        priorities = self._priorities
+        self.items = [item for item in self.items if priorities.get(item[2]) == item[0]]
+        heapq.heapify(self.items)
+        self._stale_count = len(self.items) - len(priorities)
+
+
+class _IndexedPriorityQueue:
+    """Priority queue, using a binary heap indexed by location.
+
+    When a location's priority is changed, its entry is moved within the heap
+    (decrease-key), so the heap holds no stale entries.
     """
 
     def __init__(self) -> None:
-        self.items: list[_PrioritisedLocation] = []
+        self.items: list[tuple[float, float, int]] = []
+        self._positions: dict[int, int] = {}
+        """Position in `items` of each queued location."""
 
     @property
     def is_empty(self) -> bool:
         """Check whether the queue is empty."""
         return not self.items
 
-    def put(self, priority: float, location: GridRef) -> None:
-        """Add a location with priority."""
-        heapq.heappush(self.items, _PrioritisedLocation(priority, location))
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def min_priority(self) -> float:
+        """Priority of the highest priority location; `math.inf` if empty."""
+        return self.items[0][0] if self.items else math.inf
+
+    def put(self, priority: float, location: int, tiebreak: float = 0) -> None:
+        """Add a location with priority, and optional tiebreak for equal priority."""
+        item = (priority, tiebreak, location)
+        position = self._positions.get(location)
+        if position is None:
+            self.items.append(item)
+            self._sift_up(len(self.items) - 1, item)
+        elif item < self.items[position]:
+            self._sift_up(position, item)
+        else:
+            self._sift_down(position, item)
 
-    def get(self) -> GridRef:
+    def get(self) -> int:
         """Remove and return the highest priority location.
 
         NB this is the lowest `priority` value.
         """
-        return heapq.heappop(self.items).location
+        location = self.items[0][2]
+        del self._positions[location]
+        last_item = self.items.pop()
+        if self.items:
+            self._sift_down(0, last_item)
+        return location
+
+    def remove(self, location: int) -> None:
+        """Remove a location if queued."""
+        position = self._positions.pop(location, None)
+        if position is None:
+            return
+        last_item = self.items.pop()
+        if position < len(self.items):
+            # refill the gap with the last item, moving it up or down as needed
+            if last_item < self.items[position]:
+                self._sift_up(position, last_item)
+            else:
+                self._sift_down(position, last_item)
+
+    def __contains__(self, location: int) -> bool:
+        return location in self._positions
+
+    def _sift_up(self, position: int, item: tuple[float, float, int]) -> None:
+        """Place `item` at `position` or above, moving lower priority items down."""
+        items = self.items
+        positions = self._positions
+        while position > 0:
+            parent_position = (position - 1) >> 1
+            parent = items[parent_position]
+            if not item < parent:
+                break
+            items[position] = parent
+            positions[parent[2]] = position
+            position = parent_position
+        items[position] = item
+        positions[item[2]] = position
+
+    def _sift_down(self, position: int, item: tuple[float, float, int]) -> None:
+        """Place `item` at `position` or below, moving higher priority items up."""
+        items = self.items
+        positions = self._positions
+        end = len(items)
+        child_position = 2 * position + 1
+        while child_position < end:
+            right_position = child_position + 1
+            if right_position < end and items[right_position] < items[child_position]:
+                child_position = right_position
+            child = items[child_position]
+            if not child < item:
+                break
+            items[position] = child
+            positions[child[2]] = position
+            position = child_position
+            child_position = 2 * position + 1
+        items[position] = item
+        positions[item[2]] = position
+
+
+class _InstrumentedPriorityQueue(_PriorityQueue):
+    """`_PriorityQueue` which records its work in a `SearchStats` instance."""
+
+    def __init__(self, stats: SearchStats) -> None:
+        super().__init__()
+        self.stats = stats
+
+    @property
+    def min_priority(self) -> float:
+        """Priority of the highest priority location; `math.inf` if empty."""
+        stale_count = self._stale_count
+        min_priority = super().min_priority
+        self.stats.stale_pops += stale_count - self._stale_count
+        return min_priority
+
+    def put(self, priority: float, location: int, tiebreak: float = 0) -> None:
+        """Add a location with priority, and optional tiebreak for equal priority."""
+        stats = self.stats
+        # stale entries after putting, if none were removed by compaction
+        stale_count = self._stale_count + (location in self._priorities)
+        super().put(priority, location, tiebreak)
+        stats.nodes_pushed += 1
+        stats.stale_pops += stale_count - self._stale_count
+        stats.peak_frontier_size = max(stats.peak_frontier_size, len(self.items))
+
+    def get(self) -> int:
+        """Remove and return the highest priority location."""
+        stale_count = self._stale_count
+        location = super().get()
+        self.stats.nodes_expanded += 1
+        self.stats.stale_pops += stale_count - self._stale_count
+        return location
+
+
+class _InstrumentedIndexedPriorityQueue(_IndexedPriorityQueue):
+    """`_IndexedPriorityQueue` which records its work in a `SearchStats` instance."""
+
+    def __init__(self, stats: SearchStats) -> None:
+        super().__init__()
+        self.stats = stats
+
+    def put(self, priority: float, location: int, tiebreak: float = 0) -> None:
+        """Add a location with priority, and optional tiebreak for equal priority."""
+        super().put(priority, location, tiebreak)
+        stats = self.stats
+        stats.nodes_pushed += 1
+        stats.peak_frontier_size = max(stats.peak_frontier_size, len(self.items))
+
+    def get(self) -> int:
+        """Remove and return the highest priority location."""
+        self.stats.nodes_expanded += 1
+        return super().get()
+
+
+FRONTIERS: dict[Frontier, type[_PriorityQueue | _IndexedPriorityQueue]] = {
+    "heap": _PriorityQueue,
+    "indexed": _IndexedPriorityQueue,
+}
+"""Priority queue class for each `Frontier` name."""
+
+_INSTRUMENTED_FRONTIERS: dict[
+    Frontier,
+    type[_InstrumentedPriorityQueue | _InstrumentedIndexedPriorityQueue],
+] = {
+    "heap": _InstrumentedPriorityQueue,
+    "indexed": _InstrumentedIndexedPriorityQueue,
+}
+"""Instrumented priority queue class for each `Frontier` name."""
+
+
+def _new_frontier(
+    frontier_type: Frontier, stats: SearchStats | None = None
+) -> _PriorityQueue | _IndexedPriorityQueue:
+    """Create a frontier, which records its work in `stats` if given.
+
+    Without `stats`, the frontier is uninstrumented, so costs nothing extra.
+    """
+    if stats is None:
+        return FRONTIERS[frontier_type]()
+    return _INSTRUMENTED_FRONTIERS[frontier_type](stats)
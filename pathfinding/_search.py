@@ -0,0 +1,401 @@
+"""Search functions, working on flat array indices of grid locations.
+
+Locations are converted to and from `GridRef` by callers, so that no `GridRef` is
+created within a search.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from typing import TYPE_CHECKING
+
+from ._priority_queue import _new_frontier, _PriorityQueue
+from .heuristics import zero
+from .path import Path
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from ._priority_queue import Frontier
+    from .grid import Grid
+    from .heuristics import Heuristic
+    from .search_stats import SearchStats
+
+    type SearchFunction = Callable[
+        [Grid, int, int, Heuristic, Frontier, SearchStats | None], Path
+    ]
+
+_PRIORITY_PRECISION = 9
+"""Decimal places used when comparing search priorities."""
+
+
+def _find_path(
+    grid: Grid,
+    start: int,
+    goal: int,
+    heuristic: Heuristic,
+    frontier_type: Frontier = "heap",
+    search: SearchFunction | None = None,
+    stats: SearchStats | None = None,
+) -> Path:
+    """Find path from `start` to `goal` with `search`, unless trivial or impossible.
+
+    By default, `search` is `_best_first_search()`. Its work is recorded in `stats`,
+    if given. Goals in another of the grid's connected components are rejected
+    without searching.
+
+    Returns
+    -------
+    Path
+        Locations on the path, from `start` to `goal` inclusive.
+        Empty if no path found.
+    """
+    if goal == start:
+        return Path(grid.size_x, [start])
+    untraversable_cells = grid.untraversable_locations.cells
+    if untraversable_cells[start] or untraversable_cells[goal]:
+        return Path(grid.size_x)
+    if not grid.components.connected_indices(start, goal):
+        return Path(grid.size_x)
+    if search is None:
+        search = _best_first_search
+    if stats is None:
+        return search(grid, start, goal, heuristic, frontier_type, None)
+    start_ns = time.perf_counter_ns()
+    path = search(grid, start, goal, heuristic, frontier_type, stats)
+    stats.search_ns = time.perf_counter_ns() - start_ns
+    return path
+
+
+def _best_first_search(  # noqa: C901
+    grid: Grid,
+    start: int,
+    goal: int,
+    heuristic: Heuristic,
+    frontier_type: Frontier = "heap",
+    stats: SearchStats | None = None,
+    *,
+    landmark_estimate: Callable[[int], float] | None = None,
+) -> Path:
+    """Search for `goal` from `start`, prioritised by cost so far plus `heuristic`
+    estimate of remaining cost.
+
+    If `landmark_estimate` is given, the estimate is the larger of `heuristic` and
+    `landmark_estimate` of a location's flat array index.
+
+    Returns
+    -------
+    Path
+        Locations on the path, from `start` to `goal` inclusive.
+        Empty if no path found.
+    """
+    size_x = grid.size_x
+    size_y = grid.size_y
+    untraversable_cells = grid.untraversable_locations.cells
+    shared_path_cells = grid.shared_path_locations.cells
+    steps = grid._steps  # noqa: SLF001
+    prefer_traversed = grid.prefer_traversed_factor != 0
+    discount_factor = max(1 - grid.prefer_traversed_factor, 0)
+    # Scale heuristic by the largest possible discount, so it stays admissible; a
+    # negative factor is a penalty, which leaves other moves at basic cost
+    heuristic_scale = min(discount_factor, 1)
+    informed = heuristic is not zero
+    goal_x = goal % size_x
+    goal_y = goal // size_x
+
+    came_from: dict[int, int] = {start: start}
+    cost_so_far: dict[int, float] = {start: 0}
+    frontier = _new_frontier(frontier_type, stats)
+    frontier.put(0, start)
+
+    while not frontier.is_empty:
+        current = frontier.get()
+
+        if current == goal:  # early exit
+            break
+
+        current_cost = cost_so_far[current]
+        x = current % size_x
+        y = current // size_x
+        for dx, dy, offset, basic_cost in steps:
+            new_x = x + dx
+            new_y = y + dy
+            if not (0 <= new_x < size_x and 0 <= new_y < size_y):
+                continue
+            new = current + offset
+            if untraversable_cells[new]:
+                continue
+
+            new_cost = current_cost + (
+                basic_cost * discount_factor
+                if prefer_traversed and shared_path_cells[new]
+                else basic_cost
+            )
+            old_cost = cost_so_far.get(new)
+            if old_cost is None or new_cost < old_cost:
+                # add new to frontier if cheaper
+                cost_so_far[new] = new_cost
+                came_from[new] = current
+                if informed:
+                    estimate = heuristic(abs(goal_x - new_x), abs(goal_y - new_y))
+                    if landmark_estimate is not None:
+                        estimate = max(estimate, landmark_estimate(new))
+                    estimate *= heuristic_scale
+                    # Break ties towards goal, to avoid expanding many equal-cost
+                    # paths. Round so that float error doesn't hide ties.
+                    frontier.put(
+                        round(new_cost + estimate, _PRIORITY_PRECISION),
+                        new,
+                        estimate,
+                    )
+                else:
+                    frontier.put(new_cost, new)
+
+    if goal not in came_from:
+        return Path(size_x)
+    reconstruction_start_ns = time.perf_counter_ns()
+    indices = _reconstruct_path(came_from, start, goal)
+    if stats is not None:
+        stats.reconstruction_ns = time.perf_counter_ns() - reconstruction_start_ns
+    return Path(size_x, indices, cost_so_far[goal])
+
+
+def _landmark_search(
+    grid: Grid,
+    start: int,
+    goal: int,
+    heuristic: Heuristic,
+    frontier_type: Frontier = "heap",
+    stats: SearchStats | None = None,
+) -> Path:
+    """Search as `_best_first_search()`, also estimating with the grid's landmark
+    table (ALT), unless missing, empty or out of date.
+
+    Returns
+    -------
+    Path
+        Locations on the path, from `start` to `goal` inclusive.
+        Empty if no path found.
+    """
+    landmarks = grid.landmarks
+    return _best_first_search(
+        grid,
+        start,
+        goal,
+        heuristic,
+        frontier_type,
+        stats,
+        landmark_estimate=landmarks._estimator(goal)  # noqa: SLF001
+        if landmarks is not None and landmarks.landmarks and landmarks.is_current
+        else None,
+    )
+
+
+def _reconstruct_path(came_from: dict[int, int], start: int, goal: int) -> list[int]:
+    """Construct path by retracing from `goal` to `start`.
+
+    Returns
+    -------
+    list[int]
+        Indices on the path, from `start` to `goal` inclusive.
+    """
+    path = [goal]
+    current = goal
+    while current != start:
+        current = came_from[current]
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def _bidirectional_search(  # noqa: C901, PLR0912, PLR0915
+    grid: Grid,
+    start: int,
+    goal: int,
+    heuristic: Heuristic,
+    frontier_type: Frontier = "heap",
+    stats: SearchStats | None = None,
+) -> Path:
+    """Search from both `start` and `goal`, until the searches meet on a cheapest
+    path.
+
+    Each search is prioritised by cost so far, plus half the difference between
+    `heuristic` estimates towards its target and towards its origin. That keeps
+    priorities consistent between the two searches, so they can stop when the sum of
+    their lowest priorities can't improve on the cheapest path found.
+
+    Returns
+    -------
+    Path
+        Locations on the path, from `start` to `goal` inclusive.
+        Empty if no path found.
+    """
+    size_x = grid.size_x
+    size_y = grid.size_y
+    untraversable_cells = grid.untraversable_locations.cells
+    shared_path_cells = grid.shared_path_locations.cells
+    steps = grid._steps  # noqa: SLF001
+    prefer_traversed = grid.prefer_traversed_factor != 0
+    discount_factor = max(1 - grid.prefer_traversed_factor, 0)
+    # Scale heuristic by the largest possible discount, so it stays admissible; a
+    # negative factor is a penalty, which leaves other moves at basic cost
+    heuristic_scale = min(discount_factor, 1)
+    informed = heuristic is not zero
+    start_x = start % size_x
+    start_y = start // size_x
+    goal_x = goal % size_x
+    goal_y = goal // size_x
+
+    def potential(x: int, y: int) -> float:
+        """Return half the difference between estimates to goal and to start."""
+        return (
+            heuristic_scale
+            * (
+                heuristic(abs(goal_x - x), abs(goal_y - y))
+                - heuristic(abs(start_x - x), abs(start_y - y))
+            )
+            / 2
+        )
+
+    forward_costs: dict[int, float] = {start: 0}
+    backward_costs: dict[int, float] = {goal: 0}
+    came_from: dict[int, int] = {start: start}
+    goes_to: dict[int, int] = {goal: goal}
+    forward_frontier = _new_frontier(frontier_type, stats)
+    forward_frontier.put(potential(start_x, start_y) if informed else 0, start)
+    backward_frontier = _new_frontier(frontier_type, stats)
+    backward_frontier.put(-potential(goal_x, goal_y) if informed else 0, goal)
+    best_cost = math.inf
+    meeting = -1
+
+    while not (forward_frontier.is_empty or backward_frontier.is_empty):
+        if forward_frontier.min_priority + backward_frontier.min_priority >= best_cost:
+            break
+
+        # expand the smaller search
+        is_forward = len(forward_frontier) <= len(backward_frontier)
+        if is_forward:
+            frontier, costs, other_costs = (
+                forward_frontier,
+                forward_costs,
+                backward_costs,
+            )
+            links, sign = came_from, 1
+        else:
+            frontier, costs, other_costs = (
+                backward_frontier,
+                backward_costs,
+                forward_costs,
+            )
+            links, sign = goes_to, -1
+
+        current = frontier.get()
+        current_cost = costs[current]
+        # cost of stepping onto `current` from a neighbour, relative to basic cost
+        current_factor = (
+            discount_factor if prefer_traversed and shared_path_cells[current] else 1
+        )
+        x = current % size_x
+        y = current // size_x
+        for dx, dy, offset, basic_cost in steps:
+            new_x = x + dx
+            new_y = y + dy
+            if not (0 <= new_x < size_x and 0 <= new_y < size_y):
+                continue
+            new = current + offset
+            if untraversable_cells[new]:
+                continue
+
+            if not is_forward:
+                new_cost = current_cost + basic_cost * current_factor
+            elif prefer_traversed and shared_path_cells[new]:
+                new_cost = current_cost + basic_cost * discount_factor
+            else:
+                new_cost = current_cost + basic_cost
+            old_cost = costs.get(new)
+            if old_cost is None or new_cost < old_cost:
+                costs[new] = new_cost
+                links[new] = current
+                frontier.put(
+                    new_cost + sign * potential(new_x, new_y) if informed else new_cost,
+                    new,
+                )
+                other_cost = other_costs.get(new)
+                if other_cost is not None and new_cost + other_cost < best_cost:
+                    best_cost = new_cost + other_cost
+                    meeting = new
+
+    if meeting == -1:
+        return Path(size_x)
+    reconstruction_start_ns = time.perf_counter_ns()
+    path = _reconstruct_path(came_from, start, meeting)
+    current = meeting
+    while current != goal:
+        current = goes_to[current]
+        path.append(current)
+    if stats is not None:
+        stats.reconstruction_ns = time.perf_counter_ns() - reconstruction_start_ns
+    return Path(size_x, path, best_cost)
+
+
+def _reverse_dijkstra(
+    grid: Grid, goal: int, *, basic_costs: bool = False
+) -> tuple[array[float], array[int]]:
+    """Search outwards from `goal` until every location which can reach it is found.
+
+    Costs are basic costs if `basic_costs`, ignoring shared path locations.
+
+    Returns
+    -------
+    tuple[array[float], array[int]]
+        For each location: the cost of the cheapest path to `goal` (`math.inf` if
+        none); and the position in `grid._steps` of the first step on that path (-1 if
+        none).
+    """
+    size_x = grid.size_x
+    size_y = grid.size_y
+    cell_count = size_x * size_y
+    untraversable_cells = grid.untraversable_locations.cells
+    shared_path_cells = grid.shared_path_locations.cells
+    steps = grid._steps  # noqa: SLF001
+    prefer_traversed = not basic_costs and grid.prefer_traversed_factor != 0
+    discount_factor = max(1 - grid.prefer_traversed_factor, 0)
+    # position in `steps` of the opposite step, i.e. back towards `current`
+    reverse_steps = [
+        steps.index((-dx, -dy, -offset, cost)) for dx, dy, offset, cost in steps
+    ]
+
+    distances = array("d", [math.inf]) * cell_count
+    next_steps = array("b", [-1]) * cell_count
+    if untraversable_cells[goal]:
+        return distances, next_steps
+    distances[goal] = 0
+    frontier = _PriorityQueue()
+    frontier.put(0, goal)
+
+    while not frontier.is_empty:
+        current = frontier.get()
+        current_distance = distances[current]
+        # cost of stepping onto `current`, relative to basic cost
+        step_factor = (
+            discount_factor if prefer_traversed and shared_path_cells[current] else 1
+        )
+        x = current % size_x
+        y = current // size_x
+        for step_position, (dx, dy, offset, basic_cost) in enumerate(steps):
+            new_x = x + dx
+            new_y = y + dy
+            if not (0 <= new_x < size_x and 0 <= new_y < size_y):
+                continue
+            new = current + offset
+            if untraversable_cells[new]:
+                continue
+            new_distance = current_distance + basic_cost * step_factor
+            if new_distance < distances[new]:
+                distances[new] = new_distance
+                next_steps[new] = reverse_steps[step_position]
+                frontier.put(new_distance, new)
+
+    return distances, next_steps
@@ -0,0 +1,188 @@
+"""Helpers for searches in space and time, where agents move or wait at each
+timestep, used by `.cooperative.CooperativePlanner` and
+`.conflict_based.ConflictBasedSolver`.
+
+A location at a timestep is a single integer, `timestep * cell_count + index`, so
+states and reservations are stored without tuples.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+from typing import TYPE_CHECKING
+
+from ._priority_queue import _PriorityQueue
+
+if TYPE_CHECKING:
+    from .grid import Grid
+
+_WAIT_COST = 1.0
+"""Cost of waiting one timestep."""
+
+
+def _moves(grid: Grid, current: int, wait_cost: float) -> list[tuple[int, float]]:
+    """Return the locations an agent can be at after one timestep, with the cost
+    of moving there, or `wait_cost` to wait.
+    """
+    size_x = grid.size_x
+    untraversable_cells = grid.untraversable_locations.cells
+    shared_path_cells = grid.shared_path_locations.cells
+    discount_factor = (
+        max(1 - grid.prefer_traversed_factor, 0) if grid.prefer_traversed_factor else 1
+    )
+    x = current % size_x
+    y = current // size_x
+    moves = [(current, wait_cost)]
+    for dx, dy, offset, basic_cost in grid._steps:  # noqa: SLF001
+        if not (0 <= x + dx < size_x and 0 <= y + dy < grid.size_y):
+            continue
+        new = current + offset
+        if untraversable_cells[new]:
+            continue
+        moves.append(
+            (
+                new,
+                basic_cost * discount_factor if shared_path_cells[new] else basic_cost,
+            )
+        )
+    return moves
+
+
+def _timed_cost(grid: Grid, indices: list[int]) -> float:
+    """Return the cost of moving and waiting along a location at each timestep."""
+    shared_path_cells = grid.shared_path_locations.cells
+    discount_factor = max(1 - grid.prefer_traversed_factor, 0)
+    cost = 0.0
+    for current, new in itertools.pairwise(indices):
+        if new == current:
+            cost += _WAIT_COST
+            continue
+        dx = abs(new % grid.size_x - current % grid.size_x)
+        dy = abs(new // grid.size_x - current // grid.size_x)
+        basic_cost = math.sqrt(dx**2 + dy**2)
+        cost += (
+            basic_cost * discount_factor
+            if grid.prefer_traversed_factor and shared_path_cells[new]
+            else basic_cost
+        )
+    return cost
+
+
+class _ReservationTable:
+    """Locations and moves reserved by agents, or forbidden to an agent, by timestep.
+
+    Stored as sets of integers rather than tuples: a location at a timestep as
+    `timestep * cell_count + index`, and a move as the location it starts from at
+    its timestep, times `cell_count`, plus the index it ends at.
+    """
+
+    def __init__(self, cell_count: int) -> None:
+        self.cell_count = cell_count
+        self.locations: set[int] = set()
+        self.moves: set[int] = set()
+
+    def reserve(self, indices: list[int]) -> None:
+        """Reserve an agent's location at each timestep, and its moves between them."""
+        cell_count = self.cell_count
+        for timestep, index in enumerate(indices):
+            self.locations.add(timestep * cell_count + index)
+            if timestep:
+                previous = indices[timestep - 1]
+                self.moves.add(
+                    ((timestep - 1) * cell_count + previous) * cell_count + index
+                )
+
+    def copy(self) -> _ReservationTable:
+        """Return a copy, which can be changed independently."""
+        table = _ReservationTable(self.cell_count)
+        table.locations = set(self.locations)
+        table.moves = set(self.moves)
+        return table
+
+    @property
+    def last_timestep(self) -> int:
+        """Latest timestep which any reservation applies to; -1 if none."""
+        cell_count = self.cell_count
+        return max(
+            max((key // cell_count for key in self.locations), default=-1),
+            max((key // cell_count**2 + 1 for key in self.moves), default=-1),
+        )
+
+    def last_timestep_at(self, index: int) -> int:
+        """Latest timestep at which a location is reserved; -1 if never."""
+        cell_count = self.cell_count
+        return max(
+            (key // cell_count for key in self.locations if key % cell_count == index),
+            default=-1,
+        )
+
+    def is_free(self, current: int, new: int, timestep: int) -> bool:
+        """Determine whether moving (or waiting) from `current` to `new` after
+        `timestep` avoids reservations: `new` must be free at the next timestep, and
+        no agent may be moving the opposite way.
+        """
+        cell_count = self.cell_count
+        return (timestep + 1) * cell_count + new not in self.locations and (
+            timestep * cell_count + new
+        ) * cell_count + current not in self.moves
+
+
+class _ReverseSearch:
+    """Cost of the cheapest path from each location to a goal, ignoring other agents.
+
+    Uniform cost search outwards from the goal, resumed only until the location asked
+    about has been reached (reverse resumable A*, without the heuristic).
+    """
+
+    def __init__(self, grid: Grid, goal: int) -> None:
+        self.grid = grid
+        self.distances: dict[int, float] = {}
+        """Settled cost from each location reached."""
+        self._costs: dict[int, float] = {goal: 0}
+        self._frontier = _PriorityQueue()
+        if not grid.untraversable_locations.cells[goal]:
+            self._frontier.put(0, goal)
+
+    def distance(self, index: int) -> float:
+        """Return the cost of the cheapest path from a location to the goal;
+        `math.inf` if none.
+        """
+        distance = self.distances.get(index)
+        if distance is not None:
+            return distance
+        grid = self.grid
+        size_x = grid.size_x
+        size_y = grid.size_y
+        untraversable_cells = grid.untraversable_locations.cells
+        shared_path_cells = grid.shared_path_locations.cells
+        steps = grid._steps  # noqa: SLF001
+        discount_factor = (
+            max(1 - grid.prefer_traversed_factor, 0)
+            if grid.prefer_traversed_factor
+            else 1
+        )
+        frontier = self._frontier
+        costs = self._costs
+        while not frontier.is_empty:
+            current = frontier.get()
+            current_cost = costs[current]
+            self.distances[current] = current_cost
+            # cost of stepping onto `current`, relative to basic cost
+            step_factor = discount_factor if shared_path_cells[current] else 1
+            x = current % size_x
+            y = current // size_x
+            for dx, dy, offset, basic_cost in steps:
+                if not (0 <= x + dx < size_x and 0 <= y + dy < size_y):
+                    continue
+                new = current + offset
+                if untraversable_cells[new] or new in self.distances:
+                    continue
+                new_cost = current_cost + basic_cost * step_factor
+                old_cost = costs.get(new)
+                if old_cost is None or new_cost < old_cost:
+                    costs[new] = new_cost
+                    frontier.put(new_cost, new)
+            if current == index:
+                return current_cost
+        return math.inf
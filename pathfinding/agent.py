@@ -4,11 +4,19 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from ._priority_queue import _PriorityQueue
+from ._jump_point_search import _has_uniform_costs, _jump_point_search
+from ._search import _bidirectional_search, _find_path, _landmark_search
+from .heuristics import zero
+from .incremental import IncrementalPlanner
+from .path import Path
+from .search_stats import SearchStats
 
 if TYPE_CHECKING:
+    from ._priority_queue import Frontier
+    from ._search import SearchFunction
     from .grid import Grid
     from .grid_ref import GridRef
+    from .heuristics import Heuristic
 
 
 class Agent:
@@ -25,68 +33,274 @@ class Agent:
 
         self.goal: GridRef | None = None
         """Needs to be set directly, at present."""
-        self.path_to_goal: set[GridRef] = set()
-        """Locations on the path to goal.
+        self.path_to_goal = Path(self.grid.size_x)
+        """Locations on the path to goal, in order.
         Set indirectly by `Agent.uniform_cost_search()` at present."""
+        self._planner: IncrementalPlanner | None = None
 
         self.grid.agents.add(self)
 
     def uniform_cost_search(
         self,
-    ) -> set[GridRef]:
+        frontier: Frontier = "heap",
+        *,
+        collect_stats: bool = False,
+    ) -> Path:
         """Perform uniform cost search for`self.goal`.
 
         Variation of Dijkstra's algorithm.
 
+        Parameters
+        ----------
+        frontier
+            Priority queue implementation: "heap" (binary heap with lazy deletion) or
+            "indexed" (indexed binary heap with decrease-key).
+        collect_stats
+            Record the search's work in the returned path's `stats`; see
+            `.search_stats.SearchStats`.
+
+        Returns
+        -------
+        Path
+            Locations on the path to `self.goal`, in order, with its cost.
+            Empty if no path found.
+        """
+        return self._search(zero, frontier, collect_stats=collect_stats)
+
+    def a_star_search(
+        self,
+        heuristic: Heuristic | None = None,
+        frontier: Frontier = "heap",
+        *,
+        collect_stats: bool = False,
+    ) -> Path:
+        """Perform A* search for `self.goal`.
+
+        Parameters
+        ----------
+        heuristic
+            Function estimating the cost to `self.goal`; see `.heuristics`.
+            By default, `octile()` if the grid allows diagonal moves, otherwise
+            `manhattan()`.
+        frontier
+            Priority queue implementation; see `Agent.uniform_cost_search()`.
+        collect_stats
+            Record the search's work in the returned path's `stats`; see
+            `.search_stats.SearchStats`.
+
+        Returns
+        -------
+        Path
+            Locations on the path to `self.goal`, in order, with its cost.
+            Empty if no path found.
+        """
+        if heuristic is None:
+            heuristic = self.grid.default_heuristic
+        return self._search(heuristic, frontier, collect_stats=collect_stats)
+
+    def bidirectional_search(
+        self,
+        heuristic: Heuristic | None = None,
+        frontier: Frontier = "heap",
+        *,
+        collect_stats: bool = False,
+    ) -> Path:
+        """Perform bidirectional A* search, from both `self.location` and `self.goal`.
+
+        Finds a path with the same cost as `Agent.uniform_cost_search()`, usually
+        expanding fewer locations on long paths.
+
+        Parameters
+        ----------
+        heuristic
+            Function estimating the cost between locations; see `.heuristics`.
+            By default, `.grid.Grid.default_heuristic`. Use `.heuristics.zero()` for
+            bidirectional uniform cost search.
+        frontier
+            Priority queue implementation; see `Agent.uniform_cost_search()`.
+        collect_stats
+            Record the search's work in the returned path's `stats`; see
+            `.search_stats.SearchStats`.
+
+        Returns
+        -------
+        Path
+            Locations on the path to `self.goal`, in order, with its cost.
+            Empty if no path found.
+        """
+        if heuristic is None:
+            heuristic = self.grid.default_heuristic
+        return self._search(
+            heuristic, frontier, _bidirectional_search, collect_stats=collect_stats
+        )
+
+    def jump_point_search(
+        self,
+        heuristic: Heuristic | None = None,
+        frontier: Frontier = "heap",
+        *,
+        collect_stats: bool = False,
+    ) -> Path:
+        """Perform jump point search for `self.goal`.
+
+        A* search which only expands locations where the path may turn, skipping
+        symmetric paths through open areas. Only valid where diagonal moves are
+        allowed and moves have uniform cost, i.e. traversed locations aren't
+        preferred; otherwise falls back to `Agent.a_star_search()`.
+
+        Parameters
+        ----------
+        heuristic
+            Function estimating the cost to `self.goal`; see `.heuristics`.
+            By default, `.grid.Grid.default_heuristic`.
+        frontier
+            Priority queue implementation; see `Agent.uniform_cost_search()`.
+        collect_stats
+            Record the search's work in the returned path's `stats`; see
+            `.search_stats.SearchStats`.
+
+        Returns
+        -------
+        Path
+            Locations on the path to `self.goal`, in order, with its cost.
+            Empty if no path found.
+        """
+        if heuristic is None:
+            heuristic = self.grid.default_heuristic
+        if not _has_uniform_costs(self.grid):
+            return self._search(heuristic, frontier, collect_stats=collect_stats)
+        return self._search(
+            heuristic, frontier, _jump_point_search, collect_stats=collect_stats
+        )
+
+    def landmark_search(
+        self,
+        heuristic: Heuristic | None = None,
+        frontier: Frontier = "heap",
+        *,
+        collect_stats: bool = False,
+    ) -> Path:
+        """Perform A* search for `self.goal`, estimating with distances from the
+        grid's landmarks (ALT).
+
+        Finds a path with the same cost as `Agent.a_star_search()`, expanding far
+        fewer locations where untraversable locations force detours. Needs
+        `.grid.Grid.landmarks`, from `.grid.Grid.precompute_landmarks()` or
+        `.grid.Grid.load_landmarks()`; if missing or out of date, behaves as
+        `Agent.a_star_search()`.
+
+        Parameters
+        ----------
+        heuristic
+            Function estimating the cost to `self.goal`, where it's higher than the
+            landmarks' estimate; see `.heuristics`. By default,
+            `.grid.Grid.default_heuristic`.
+        frontier
+            Priority queue implementation; see `Agent.uniform_cost_search()`.
+        collect_stats
+            Record the search's work in the returned path's `stats`; see
+            `.search_stats.SearchStats`.
+
+        Returns
+        -------
+        Path
+            Locations on the path to `self.goal`, in order, with its cost.
+            Empty if no path found.
+        """
+        if heuristic is None:
+            heuristic = self.grid.default_heuristic
+        return self._search(
+            heuristic, frontier, _landmark_search, collect_stats=collect_stats
+        )
+
+    def incremental_search(self, *, collect_stats: bool = False) -> Path:
+        """Perform D* Lite search for `self.goal`, repairing the agent's previous
+        search rather than starting afresh.
+
+        Cheap to repeat after small changes to the grid, or after the agent moves
+        along its path; see `.incremental.IncrementalPlanner`. Changing the goal
+        starts a new search.
+
+        Parameters
+        ----------
+        collect_stats
+            Record the work done by this call in the returned path's `stats`; see
+            `.search_stats.SearchStats`.
+
         Returns
         -------
-        set[GridRef]
-            Locations on the path to `self.goal`.
+        Path
+            Locations on the path to `self.goal`, in order, with its cost.
             Empty if no path found.
         """
         if self.goal is None:
             raise ValueError
-        if self.goal == self.location:
-            return {self.location}
-        if (
-            self.location in self.grid.untraversable_locations
-            or self.goal in self.grid.untraversable_locations
-        ):
-            return set()
-
-        came_from: dict[GridRef, GridRef | None] = {self.location: None}
-        cost_so_far: dict[GridRef, float] = {self.location: 0}
-        frontier: _PriorityQueue = _PriorityQueue()
-        frontier.put(0, self.location)
-
-        while not frontier.is_empty:
-            current_location = frontier.get()
-
-            if current_location == self.goal:  # early exit
-                break
-
-            for new_location in self.grid.neighbours(current_location):
-                new_cost = cost_so_far[current_location] + self.grid.cost(
-                    current_location, new_location
-                )
-                if (
-                    new_location not in came_from
-                    or new_cost < cost_so_far[new_location]
-                    # add new_location to frontier if cheaper
-                ):
-                    cost_so_far[new_location] = new_cost
-                    frontier.put(priority=new_cost, location=new_location)
-                    came_from[new_location] = current_location
-
-        # Construct path starting at goal and retracing to agent location...
-        self.path_to_goal = {self.goal}
-        current_location = self.goal
-
-        while current_location is not self.location:
-            came_from_location = came_from.get(current_location)
-            if came_from_location is None:
-                return set()
-            current_location = came_from_location
-            self.path_to_goal.add(current_location)
+        if self._planner is None:
+            self._planner = IncrementalPlanner(self.grid)
+        stats = SearchStats() if collect_stats else None
+        self.path_to_goal = self._planner.find_path(self.location, self.goal, stats)
+        self.path_to_goal.stats = stats
+        return self.path_to_goal
+
+    def cost_field_path(self) -> Path:
+        """Read path to `self.goal` from the grid's cost field for the goal.
+
+        Faster than searching when many agents share a goal; see
+        `.grid.Grid.cost_field()`.
+
+        Returns
+        -------
+        Path
+            Locations on the path to `self.goal`, in order, with its cost.
+            Empty if no path found.
+        """
+        if self.goal is None:
+            raise ValueError
+        if not self.grid.in_bounds(self.goal):
+            return Path(self.grid.size_x)
+        self.path_to_goal = self.grid.cost_field(self.goal).path(self.location)
+        return self.path_to_goal
+
+    def _search(
+        self,
+        heuristic: Heuristic,
+        frontier: Frontier,
+        search: SearchFunction | None = None,
+        *,
+        collect_stats: bool = False,
+    ) -> Path:
+        """Perform search for `self.goal`, by default best-first search prioritised
+        by cost so far plus `heuristic` estimate of remaining cost.
+
+        Paths are reused from the grid's `.path_cache.PathCache` unless collecting
+        stats.
+        """
+        if self.goal is None:
+            raise ValueError
+        if not self.grid.in_bounds(self.goal):
+            return Path(self.grid.size_x)
+
+        start = self.grid.index(self.location)
+        goal = self.grid.index(self.goal)
+        search_key = (heuristic, frontier, search)
+        if not collect_stats:
+            path = self.grid.path_cache.get(start, goal, search_key)
+            if path is None:
+                path = _find_path(self.grid, start, goal, heuristic, frontier, search)
+                self.grid.path_cache.put(start, goal, search_key, path)
+            self.path_to_goal = path
+            return self.path_to_goal
 
+        # stats describe a search, so are never read from the cache
+        stats = SearchStats()
+        self.path_to_goal = _find_path(
+            self.grid,
+            start=start,
+            goal=goal,
+            heuristic=heuristic,
+            frontier_type=frontier,
+            search=search,
+            stats=stats,
+        )
+        self.path_to_goal.stats = stats
         return self.path_to_goal
@@ -0,0 +1,135 @@
+"""Module containing `AnimationRecorder` class."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Literal, Self
+
+from PIL import GifImagePlugin, Image
+
+from .image_renderer import GridRenderer
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from .grid import Grid
+
+type AnimationFormat = Literal["gif", "raw"]
+"""`"gif"` for an animated GIF; `"raw"` for 8-bit RGB frames one after another, as
+read by ffmpeg with `-f rawvideo -pix_fmt rgb24`."""
+
+
+class AnimationRecorder:
+    """Records frames of a `.grid.Grid` as agents plan and move, streaming them to a
+    file.
+
+    Each frame is encoded and written when recorded, so memory use doesn't grow with
+    the number of frames. Frames are painted by a `.image_renderer.GridRenderer`,
+    which repaints only locations changed since the previous frame. GIF frames after
+    the first hold only the changed area, drawn over the previous frame.
+
+    Use as a context manager, or call `AnimationRecorder.close()` when done.
+    """
+
+    def __init__(
+        self,
+        grid: Grid,
+        output: str | IO[bytes],
+        *,
+        animation_format: AnimationFormat = "gif",
+        scale: int = 8,
+        frame_duration: int = 100,
+    ) -> None:
+        """Create a new `AnimationRecorder` instance bound to `grid`.
+
+        Parameters
+        ----------
+        output
+            Filename, or binary stream such as ffmpeg's standard input. A stream is
+            left open by `AnimationRecorder.close()`.
+        frame_duration
+            Milliseconds each GIF frame is shown for. Ignored for raw frames, whose
+            rate is set when reading them.
+        """
+        self.grid = grid
+        """Reference to a `.grid.Grid` instance."""
+        self.animation_format = animation_format
+        self.frame_duration = frame_duration
+        self.frame_count = 0
+        """Number of frames recorded."""
+        self._renderer: GridRenderer | None = None
+        self._scale = scale
+        self._palette_image = Image.new("P", (1, 1))
+        self._palette_image.putpalette(
+            [
+                value
+                for color in GridRenderer._COLOR_MAPPING.values()  # noqa: SLF001
+                for value in color[:3]
+            ]
+        )
+        self._file: IO[bytes]
+        if isinstance(output, str):
+            self._file = Path(output).open("wb")  # noqa: SIM115
+            self._owns_file = True
+        else:
+            self._file = output
+            self._owns_file = False
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def frame_size(self) -> tuple[int, int]:
+        """Width and height of each frame, in pixels."""
+        return (self._scale * self.grid.size_x, self._scale * self.grid.size_y)
+
+    def record_frame(self) -> None:
+        """Encode the grid and its agents as they are now, and write the frame."""
+        if self._renderer is None:
+            self._renderer = GridRenderer(self.grid, scale=self._scale)
+        else:
+            self._renderer.update()
+        image = self._renderer.image
+
+        if self.animation_format == "raw":
+            self._file.write(image.tobytes())
+        elif self.frame_count == 0:
+            frame = self._palette_frame(image)
+            header, _ = GifImagePlugin.getheader(
+                frame, info={"loop": 0, "optimize": False}
+            )
+            self._write_gif_frame(header, frame, (0, 0))
+        else:
+            # unchanged frames still need an image, to keep time
+            box = self._renderer.changed_box or (0, 0, 1, 1)
+            self._write_gif_frame([], self._palette_frame(image.crop(box)), box[:2])
+        self.frame_count += 1
+
+    def close(self) -> None:
+        """Finish the animation, closing the file if opened by name."""
+        if self.animation_format == "gif" and self.frame_count:
+            self._file.write(b";")  # GIF trailer
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+
+    def _palette_frame(self, image: Image.Image) -> Image.Image:
+        """Convert an RGB image to the renderer's palette, without dithering."""
+        return image.quantize(palette=self._palette_image, dither=Image.Dither.NONE)
+
+    def _write_gif_frame(
+        self, header: list[bytes], frame: Image.Image, offset: tuple[int, int]
+    ) -> None:
+        """Write a GIF frame, drawn over the previous frame at `offset`."""
+        data = GifImagePlugin.getdata(
+            frame, offset, duration=self.frame_duration, disposal=1
+        )
+        self._file.write(b"".join([*header, *data]))
@@ -0,0 +1,213 @@
+"""Module containing `ConnectedComponents` class."""
+
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .grid import Grid
+    from .grid_ref import GridRef
+
+_BLOCKED = -1
+"""Label of untraversable locations."""
+
+
+class ConnectedComponents:
+    """Labels of the regions of a `.grid.Grid` which are reachable from each other.
+
+    Two traversable locations have the same component exactly when there is a path
+    between them, so searches can reject a goal in another component without
+    exploring. Usually accessed as `.grid.Grid.components`.
+
+    Labels are merged with union-find when a location becomes traversable, so
+    connecting regions is cheap. Making a location untraversable may split a region;
+    if its neighbours stay connected around it, nothing changes, otherwise every
+    location is relabelled the next time components are queried.
+    """
+
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
+        """Reference to a `.grid.Grid` instance."""
+        self.relabel_count = 0
+        """Number of times every location has been labelled."""
+        size_x = grid.size_x
+        self._offsets = [
+            (dx, dy, dy * size_x + dx)
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            if (dx or dy) and (grid.allow_diagonal_moves or not (dx and dy))
+        ]
+        """Offsets `(dx, dy, index offset)` of neighbouring locations."""
+        self._labels = array("q")
+        """Label of each location, by flat array index, or `_BLOCKED`. Labels of the
+        same component share a root in `ConnectedComponents._parents`."""
+        self._parents: list[int] = []
+        """Union-find parent of each label."""
+        self._dirty = True
+        grid.untraversable_locations.add_listener(self._cells_changed)
+
+    def component(self, location: GridRef) -> int | None:
+        """Return a location's component, or None if untraversable or off the grid.
+
+        Components are only comparable until the grid next changes.
+        """
+        if not self.grid.in_bounds(location):
+            return None
+        return self.component_of_index(self.grid.index(location))
+
+    def component_of_index(self, index: int) -> int | None:
+        """Return the component of the location at a flat array index, or None if
+        untraversable.
+        """
+        if self._dirty:
+            self._relabel()
+        label = self._labels[index]
+        return None if label == _BLOCKED else self._find(label)
+
+    def connected(self, location1: GridRef, location2: GridRef) -> bool:
+        """Determine whether there is a path between two locations."""
+        component = self.component(location1)
+        return component is not None and component == self.component(location2)
+
+    def connected_indices(self, index1: int, index2: int) -> bool:
+        """Determine whether there is a path between locations at flat array
+        indices.
+        """
+        component = self.component_of_index(index1)
+        return component is not None and component == self.component_of_index(index2)
+
+    def _cells_changed(self, start: int, stop: int) -> None:
+        """Update labels after untraversable locations changed."""
+        if self._dirty:
+            return
+        if stop - start > 1:
+            self._dirty = True
+        elif self.grid.untraversable_locations.cells[start]:
+            self._blocked(start)
+        else:
+            self._unblocked(start)
+
+    def _unblocked(self, index: int) -> None:
+        """Join a newly traversable location to its neighbours' components."""
+        root = _BLOCKED
+        for neighbour in self._neighbours(index):
+            label = self._labels[neighbour]
+            if label == _BLOCKED:
+                continue
+            neighbour_root = self._find(label)
+            if root == _BLOCKED:
+                root = neighbour_root
+            elif neighbour_root != root:
+                self._parents[neighbour_root] = root
+        if root == _BLOCKED:
+            root = len(self._parents)
+            self._parents.append(root)
+        self._labels[index] = root
+
+    def _blocked(self, index: int) -> None:
+        """Remove a newly untraversable location, relabelling later if that may
+        disconnect its neighbours.
+
+        Neighbours which stay connected to each other within the 3x3 area around the
+        location can't have been split apart. Paths may go through any traversable
+        location of that area, including corners which aren't neighbours when
+        diagonal moves aren't allowed.
+        """
+        self._labels[index] = _BLOCKED
+        open_neighbours = [
+            neighbour
+            for neighbour in self._neighbours(index)
+            if self._labels[neighbour] != _BLOCKED
+        ]
+        if len(open_neighbours) < 2:  # noqa: PLR2004
+            return
+        size_x = self.grid.size_x
+        x, y = index % size_x, index // size_x
+        local = {
+            index + dy * size_x + dx
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            if (dx or dy)
+            and 0 <= x + dx < size_x
+            and 0 <= y + dy < self.grid.size_y
+            and self._labels[index + dy * size_x + dx] != _BLOCKED
+        }
+        reached = {open_neighbours[0]}
+        to_visit = [open_neighbours[0]]
+        while to_visit:
+            for neighbour in self._neighbours(to_visit.pop()):
+                if neighbour in local and neighbour not in reached:
+                    reached.add(neighbour)
+                    to_visit.append(neighbour)
+        if not reached.issuperset(open_neighbours):
+            self._dirty = True
+
+    def _neighbours(self, index: int) -> list[int]:
+        """Return flat array indices of a location's neighbours on the grid."""
+        size_x = self.grid.size_x
+        x, y = index % size_x, index // size_x
+        return [
+            index + offset
+            for dx, dy, offset in self._offsets
+            if 0 <= x + dx < size_x and 0 <= y + dy < self.grid.size_y
+        ]
+
+    def _find(self, label: int) -> int:
+        """Return the root label of a label's component, halving paths on the way."""
+        parents = self._parents
+        while parents[label] != label:
+            parents[label] = parents[parents[label]]
+            label = parents[label]
+        return label
+
+    def _relabel(self) -> None:
+        """Label every location, a run of traversable locations in a row at a time.
+
+        Each run is joined to the overlapping runs of the row above, or also those
+        touching diagonally if diagonal moves are allowed.
+        """
+        grid = self.grid
+        size_x = grid.size_x
+        cells = grid.untraversable_locations.cells
+        reach = 1 if grid.allow_diagonal_moves else 0
+        self._labels = array("q", [_BLOCKED]) * (size_x * grid.size_y)
+        parents: list[int] = []
+        self._parents = parents
+        previous_runs: list[tuple[int, int, int]] = []
+        for row_start in range(0, len(cells), size_x):
+            row = cells[row_start : row_start + size_x]
+            runs = []
+            first_previous = 0
+            x = row.find(0)
+            while x != -1:
+                stop = row.find(1, x)
+                if stop == -1:
+                    stop = size_x
+                root = _BLOCKED
+                # runs are in order, so earlier runs can't overlap later ones
+                while (
+                    first_previous < len(previous_runs)
+                    and previous_runs[first_previous][1] + reach <= x
+                ):
+                    first_previous += 1
+                for previous in range(first_previous, len(previous_runs)):
+                    previous_x, _, label = previous_runs[previous]
+                    if previous_x >= stop + reach:
+                        break
+                    previous_root = self._find(label)
+                    if root == _BLOCKED:
+                        root = previous_root
+                    elif previous_root != root:
+                        parents[previous_root] = root
+                if root == _BLOCKED:
+                    root = len(parents)
+                    parents.append(root)
+                self._labels[row_start + x : row_start + stop] = array("q", [root]) * (
+                    stop - x
+                )
+                runs.append((x, stop, root))
+                x = row.find(0, stop)
+            previous_runs = runs
+        self._dirty = False
+        self.relabel_count += 1
@@ -0,0 +1,415 @@
+"""Module containing `ConflictBasedSolver` class."""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ._priority_queue import _PriorityQueue
+from ._search import _PRIORITY_PRECISION
+from ._space_time import _WAIT_COST, _moves, _ReservationTable, _ReverseSearch
+from .path import Path
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .agent import Agent
+    from .grid import Grid
+
+    type _Constraint = tuple[int, bool, int]
+    """Agent, whether a move (otherwise a location), and its `_ReservationTable` key."""
+
+_CLASSIFY_LIMIT = 8
+"""Maximum number of each constraint tree node's conflicts classified by replanning,
+to choose one to split on."""
+_COST_TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class _Conflict:
+    """Two agents at the same location at a timestep, or swapping locations."""
+
+    timestep: int
+    constraints: tuple[_Constraint, _Constraint]
+    """Constraint on each agent which would avoid the conflict."""
+
+
+@dataclass
+class _Node:
+    """Node of the constraint tree: constraints on each agent, and a path for each
+    which satisfies them.
+    """
+
+    paths: list[list[int]]
+    """Location of each agent at each timestep, by flat array index."""
+    costs: list[float]
+    constraints: list[_ReservationTable | None]
+    """Locations and moves forbidden to each agent, if any."""
+    conflicts: list[_Conflict]
+
+    @property
+    def cost(self) -> float:
+        """Sum of the costs of every agent's path."""
+        return sum(self.costs)
+
+
+class ConflictBasedSolver:
+    """Collision-free paths for agents on a `.grid.Grid`, with the least total cost
+    (conflict-based search, CBS).
+
+    Each agent moves to a neighbouring location, or waits at the same cost as a
+    cardinal move, at each timestep. Agents stay at their goal once there.
+
+    Searches a tree of constraints: each node holds a path for every agent, each the
+    cheapest which satisfies that agent's constraints. Nodes are expanded cheapest
+    first; a node whose paths conflict is split on one conflict, into two nodes
+    which each forbid one of the agents from its part in it. Paths are found by A*
+    in space and time, estimating with each agent's true distance to its goal.
+
+    Two improvements over basic CBS keep the tree small. Conflicts which raise the
+    cost of both agents' paths when split on (cardinal conflicts) are split on
+    first, then those which raise one. If a path found when splitting costs no more
+    than before and reduces conflicts, it replaces the node's path instead of
+    splitting (bypass).
+
+    Search stops once `max_nodes` nodes have been expanded, or after `time_limit`
+    seconds, returning the paths of the node with fewest conflicts.
+    """
+
+    def __init__(
+        self,
+        grid: Grid,
+        max_nodes: int = 1000,
+        time_limit: float | None = None,
+    ) -> None:
+        self.grid = grid
+        """Reference to a `.grid.Grid` instance."""
+        self.max_nodes = max_nodes
+        """Maximum number of constraint tree nodes expanded by each solve."""
+        self.time_limit = time_limit
+        """Maximum seconds taken by each solve, if any."""
+        self.expanded_count = 0
+        """Number of constraint tree nodes expanded by the last solve."""
+        self.generated_count = 0
+        """Number of constraint tree nodes created by the last solve."""
+        self.solved = False
+        """Whether the last solve found collision-free paths within its budget."""
+        self.conflict_count = 0
+        """Number of conflicts between the paths returned by the last solve."""
+        self._starts: list[int] = []
+        self._goals: list[int] = []
+        self._distances: dict[int, _ReverseSearch] = {}
+        """Distances to each goal, by flat array index of goal."""
+        self._version = grid.version
+        self._prefer_traversed_factor = grid.prefer_traversed_factor
+
+    def solve(self, agents: Sequence[Agent]) -> dict[Agent, Path]:
+        """Plan collision-free paths for agents, with the least total cost.
+
+        Agents whose goal can't be reached stay where they are, moving aside only to
+        let others pass.
+
+        Returns
+        -------
+        dict[Agent, Path]
+            Location of each agent at each timestep, from its location to its goal,
+            with repeated locations where it waits; also set as
+            `.agent.Agent.path_to_goal`. If the budget ran out first, paths with the
+            fewest conflicts found; see `ConflictBasedSolver.solved`.
+        """
+        grid = self.grid
+        if (grid.version, grid.prefer_traversed_factor) != (
+            self._version,
+            self._prefer_traversed_factor,
+        ):
+            self._distances.clear()
+            self._version = grid.version
+            self._prefer_traversed_factor = grid.prefer_traversed_factor
+        self._starts = []
+        self._goals = []
+        for agent in agents:
+            if agent.goal is None:
+                raise ValueError
+            start = grid.index(agent.location)
+            goal = grid.index(agent.goal) if grid.in_bounds(agent.goal) else start
+            if self._distances_to(goal).distance(start) == math.inf:
+                goal = start
+            self._starts.append(start)
+            self._goals.append(goal)
+
+        best = self._search(time.perf_counter())
+        self.conflict_count = len(best.conflicts)
+        self.solved = not best.conflicts
+        paths = {}
+        for agent_index, agent in enumerate(agents):
+            agent.path_to_goal = paths[agent] = Path(
+                grid.size_x, best.paths[agent_index], best.costs[agent_index]
+            )
+        return paths
+
+    def _search(self, start_time: float) -> _Node:
+        """Expand constraint tree nodes, cheapest first, until one has no conflicts
+        or the budget runs out.
+
+        Returns
+        -------
+        _Node
+            Node without conflicts, or otherwise with the fewest conflicts found.
+        """
+        agent_count = len(self._starts)
+        paths = []
+        costs = []
+        for agent_index in range(agent_count):
+            # without constraints, every agent has a path, its goal being reachable
+            path, cost = self._find_path(agent_index, None) or (
+                [self._starts[agent_index]],
+                0.0,
+            )
+            paths.append(path)
+            costs.append(cost)
+        root = _Node(paths, costs, [None] * agent_count, self._conflicts(paths))
+        nodes = [root]
+        best = root
+        frontier = _PriorityQueue()
+        frontier.put(round(root.cost, _PRIORITY_PRECISION), 0, len(root.conflicts))
+        self.expanded_count = 0
+        self.generated_count = 1
+
+        while not frontier.is_empty:
+            node_id = frontier.get()
+            node = nodes[node_id]
+            if not node.conflicts:
+                return node
+            if self.expanded_count >= self.max_nodes or (
+                self.time_limit is not None
+                and time.perf_counter() - start_time >= self.time_limit
+            ):
+                break
+            self.expanded_count += 1
+
+            children = self._split(node)
+            if self._bypass(node, children):
+                # re-queue the node, with fewer conflicts than before
+                frontier.put(
+                    round(node.cost, _PRIORITY_PRECISION), node_id, len(node.conflicts)
+                )
+                best = min(best, node, key=_rank)
+                continue
+            for child in children:
+                if child is None:
+                    continue
+                nodes.append(child)
+                self.generated_count += 1
+                frontier.put(
+                    round(child.cost, _PRIORITY_PRECISION),
+                    len(nodes) - 1,
+                    len(child.conflicts),
+                )
+                best = min(best, child, key=_rank)
+        return best
+
+    def _split(self, node: _Node) -> list[_Node | None]:
+        """Choose a conflict to split a node on, and create a child node for each of
+        its constraints; None where the constrained agent has no path.
+
+        Prefers cardinal conflicts, where both children cost more than the node, then
+        semi-cardinal conflicts, where one does. Only the first `_CLASSIFY_LIMIT`
+        conflicts are classified.
+        """
+        first_children: list[_Node | None] = []
+        semi_cardinal_children: list[_Node | None] = []
+        for conflict in node.conflicts[:_CLASSIFY_LIMIT]:
+            children = [
+                self._child(node, constraint) for constraint in conflict.constraints
+            ]
+            cost_increases = [
+                child is None or child.cost > node.cost + _COST_TOLERANCE
+                for child in children
+            ]
+            if all(cost_increases):
+                return children
+            if any(cost_increases) and not semi_cardinal_children:
+                semi_cardinal_children = children
+            if not first_children:
+                first_children = children
+        return semi_cardinal_children or first_children
+
+    def _bypass(self, node: _Node, children: list[_Node | None]) -> bool:
+        """Adopt a child's path into the node if it costs no more and reduces
+        conflicts.
+
+        Returns
+        -------
+        bool
+            Whether a path was adopted.
+        """
+        for child in children:
+            if (
+                child is not None
+                and child.cost <= node.cost + _COST_TOLERANCE
+                and len(child.conflicts) < len(node.conflicts)
+            ):
+                # the child's constraints aren't adopted, only its paths
+                node.paths = child.paths
+                node.costs = child.costs
+                node.conflicts = child.conflicts
+                return True
+        return False
+
+    def _child(self, node: _Node, constraint: _Constraint) -> _Node | None:
+        """Create a child node with an extra constraint on one agent, replanning that
+        agent; None if it then has no path.
+        """
+        agent_index, is_move, key = constraint
+        table = node.constraints[agent_index]
+        table = (
+            _ReservationTable(self.grid.size_x * self.grid.size_y)
+            if table is None
+            else table.copy()
+        )
+        (table.moves if is_move else table.locations).add(key)
+        found = self._find_path(agent_index, table)
+        if found is None:
+            return None
+        paths = list(node.paths)
+        costs = list(node.costs)
+        constraints = list(node.constraints)
+        paths[agent_index], costs[agent_index] = found
+        constraints[agent_index] = table
+        return _Node(paths, costs, constraints, self._conflicts(paths))
+
+    def _conflicts(self, paths: list[list[int]]) -> list[_Conflict]:
+        """Find every conflict between paths, earliest first.
+
+        Agents stay at the end of their path once there.
+        """
+        cell_count = self.grid.size_x * self.grid.size_y
+        conflicts = []
+        previous: list[int] = []
+        for timestep in range(max((len(path) for path in paths), default=0)):
+            locations = [path[min(timestep, len(path) - 1)] for path in paths]
+            occupied: dict[int, int] = {}
+            for agent_index, index in enumerate(locations):
+                other_index = occupied.setdefault(index, agent_index)
+                if other_index != agent_index:
+                    key = timestep * cell_count + index
+                    conflicts.append(
+                        _Conflict(
+                            timestep,
+                            ((other_index, False, key), (agent_index, False, key)),
+                        )
+                    )
+            moves = {
+                (from_index, to_index): agent_index
+                for agent_index, (from_index, to_index) in enumerate(
+                    zip(previous, locations, strict=False)
+                )
+                if from_index != to_index
+            }
+            for (from_index, to_index), agent_index in moves.items():
+                swapping_index = moves.get((to_index, from_index))
+                if swapping_index is not None and agent_index < swapping_index:
+                    # each agent is forbidden the move the other makes, reversed
+                    move_time = timestep - 1
+                    conflicts.append(
+                        _Conflict(
+                            move_time,
+                            (
+                                (
+                                    agent_index,
+                                    True,
+                                    (move_time * cell_count + to_index) * cell_count
+                                    + from_index,
+                                ),
+                                (
+                                    swapping_index,
+                                    True,
+                                    (move_time * cell_count + from_index) * cell_count
+                                    + to_index,
+                                ),
+                            ),
+                        )
+                    )
+            previous = locations
+        conflicts.sort(key=lambda conflict: conflict.timestep)
+        return conflicts
+
+    def _find_path(
+        self, agent_index: int, constraints: _ReservationTable | None
+    ) -> tuple[list[int], float] | None:
+        """Search space and time for an agent's cheapest path to its goal, satisfying
+        its constraints.
+
+        After the last constraint, time no longer matters, so states are merged across
+        timesteps and the search space stays finite.
+
+        Returns
+        -------
+        tuple[list[int], float] | None
+            Location at each timestep, by flat array index, and the path's cost; None
+            if no path satisfies the constraints.
+        """
+        cell_count = self.grid.size_x * self.grid.size_y
+        start = self._starts[agent_index]
+        goal = self._goals[agent_index]
+        distances = self._distances_to(goal)
+        last_timestep = -1 if constraints is None else constraints.last_timestep
+        last_goal_timestep = (
+            -1 if constraints is None else constraints.last_timestep_at(goal)
+        )
+        if constraints is not None and start in constraints.locations:
+            return None
+
+        # each state is a location at a timestep, as `timestep * cell_count + index`
+        came_from = {start: start}
+        cost_so_far = {start: 0.0}
+        frontier = _PriorityQueue()
+        frontier.put(distances.distance(start), start)
+        while not frontier.is_empty:
+            state = frontier.get()
+            timestep, current = divmod(state, cell_count)
+            if current == goal and timestep > last_goal_timestep:
+                path = [current]
+                final_state = state
+                while state != start:
+                    state = came_from[state]
+                    path.append(state % cell_count)
+                path.reverse()
+                return path, cost_so_far[final_state]
+
+            current_cost = cost_so_far[state]
+            new_timestep = min(timestep + 1, last_timestep + 1)
+            for new, move_cost in _moves(self.grid, current, _WAIT_COST):
+                if constraints is not None and not constraints.is_free(
+                    current, new, timestep
+                ):
+                    continue
+                new_state = new_timestep * cell_count + new
+                if new_state == state:  # waiting after the last constraint
+                    continue
+                new_cost = current_cost + move_cost
+                old_cost = cost_so_far.get(new_state)
+                if old_cost is None or new_cost < old_cost:
+                    cost_so_far[new_state] = new_cost
+                    came_from[new_state] = state
+                    estimate = distances.distance(new)
+                    frontier.put(
+                        round(new_cost + estimate, _PRIORITY_PRECISION),
+                        new_state,
+                        estimate,
+                    )
+        return None
+
+    def _distances_to(self, goal: int) -> _ReverseSearch:
+        """Return the reverse search from `goal`, creating it if needed."""
+        distances = self._distances.get(goal)
+        if distances is None:
+            distances = self._distances[goal] = _ReverseSearch(self.grid, goal)
+        return distances
+
+
+def _rank(node: _Node) -> tuple[int, float]:
+    """Rank nodes by number of conflicts, then cost, to keep the best so far."""
+    return len(node.conflicts), node.cost
@@ -0,0 +1,190 @@
+"""Module containing `CooperativePlanner` class."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+from ._priority_queue import _PriorityQueue
+from ._search import _PRIORITY_PRECISION
+from ._space_time import (
+    _WAIT_COST,
+    _moves,
+    _ReservationTable,
+    _ReverseSearch,
+    _timed_cost,
+)
+from .path import Path
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .agent import Agent
+    from .grid import Grid
+
+
+class CooperativePlanner:
+    """Collision-free paths for many agents on a `.grid.Grid`, planned one agent at a
+    time in priority order (windowed hierarchical cooperative A*, WHCA*).
+
+    Each agent moves to a neighbouring location, or waits, at each timestep. Waiting
+    costs the same as a cardinal move, except at the goal where it's free. Agents
+    search in space and time, avoiding the locations and moves reserved by agents
+    planned before them, but only `window` timesteps ahead; beyond that, each
+    agent's true distance to its goal, ignoring other agents, completes its
+    estimate. Agents follow half of each window's plan, then all plan again from
+    where they are, so memory and time per timestep depend on the window rather
+    than the length of paths.
+
+    Reservations only cover the current window: a `_ReservationTable` keyed by
+    location and timestep, and by the move made between timesteps so agents don't
+    swap places. Distances to each goal are found by a reverse search, resumed
+    only as far as needed and kept between windows, and between calls until the
+    grid changes.
+    """
+
+    def __init__(self, grid: Grid, window: int = 16) -> None:
+        if window < 2:  # noqa: PLR2004
+            err_msg = f"Window {window} must be at least 2 timesteps."
+            raise ValueError(err_msg)
+        self.grid = grid
+        """Reference to a `.grid.Grid` instance."""
+        self.window = window
+        """Number of timesteps each agent plans ahead, avoiding other agents."""
+        self.blocked_count = 0
+        """Number of times an agent found no plan avoiding reservations, e.g. when
+        trapped by an agent planned before it, and waited regardless. Such agents
+        may collide."""
+        self._distances: dict[int, _ReverseSearch] = {}
+        """Distances to each goal, by flat array index of goal."""
+        self._version = grid.version
+        self._prefer_traversed_factor = grid.prefer_traversed_factor
+
+    def plan(self, agents: Sequence[Agent], max_steps: int = 1024) -> dict[Agent, Path]:
+        """Plan collision-free paths for agents, highest priority first.
+
+        Parameters
+        ----------
+        agents
+            Agents on the grid, each with a goal, in priority order.
+        max_steps
+            Maximum number of timesteps planned, if agents haven't all reached their
+            goals sooner.
+
+        Returns
+        -------
+        dict[Agent, Path]
+            Location of each agent at each timestep, from its location to its goal,
+            with repeated locations where it waits; also set as
+            `.agent.Agent.path_to_goal`. Stops short of the goal if it can't be
+            reached in `max_steps`, or at all.
+        """
+        grid = self.grid
+        if (grid.version, grid.prefer_traversed_factor) != (
+            self._version,
+            self._prefer_traversed_factor,
+        ):
+            self._distances.clear()
+            self._version = grid.version
+            self._prefer_traversed_factor = grid.prefer_traversed_factor
+        starts = []
+        goals = []
+        for agent in agents:
+            if agent.goal is None:
+                raise ValueError
+            starts.append(grid.index(agent.location))
+            goals.append(grid.index(agent.goal) if grid.in_bounds(agent.goal) else -1)
+        timed_indices = [[start] for start in starts]
+        advance = self.window // 2
+
+        step = 0
+        while step < max_steps and any(
+            indices[-1] != goal and self._reachable(indices[-1], goal)
+            for indices, goal in zip(timed_indices, goals, strict=True)
+        ):
+            reservations = _ReservationTable(grid.size_x * grid.size_y)
+            for indices, goal in zip(timed_indices, goals, strict=True):
+                planned = self._plan_window(indices[-1], goal, reservations)
+                reservations.reserve(planned)
+                indices.extend(planned[1 : advance + 1])
+            step += advance
+
+        paths = {}
+        for agent, indices, goal in zip(agents, timed_indices, goals, strict=True):
+            del indices[max_steps + 1 :]
+            # no need to wait at the goal once there
+            while len(indices) > 1 and indices[-1] == indices[-2] == goal:
+                indices.pop()
+            agent.path_to_goal = paths[agent] = Path(
+                grid.size_x, indices, _timed_cost(grid, indices)
+            )
+        return paths
+
+    def _reachable(self, index: int, goal: int) -> bool:
+        """Determine whether `goal` can be reached from a location."""
+        return goal != -1 and self._distances_to(goal).distance(index) < math.inf
+
+    def _distances_to(self, goal: int) -> _ReverseSearch:
+        """Return the reverse search from `goal`, creating it if needed."""
+        distances = self._distances.get(goal)
+        if distances is None:
+            distances = self._distances[goal] = _ReverseSearch(self.grid, goal)
+        return distances
+
+    def _plan_window(
+        self, start: int, goal: int, reservations: _ReservationTable
+    ) -> list[int]:
+        """Search space and time from `start` for the cheapest plan towards `goal`,
+        avoiding reservations, until the end of the window.
+
+        Returns
+        -------
+        list[int]
+            Flat array index of the agent's location at each timestep of the window,
+            from `start`. If no plan avoids reservations, or `goal` can't be reached,
+            the agent waits at `start`.
+        """
+        cell_count = self.grid.size_x * self.grid.size_y
+        window = self.window
+        waiting = [start] * (window + 1)
+        if not self._reachable(start, goal):
+            return waiting
+        distances = self._distances_to(goal)
+
+        # each state is a location at a timestep, as `timestep * cell_count + index`
+        came_from = {start: start}
+        cost_so_far = {start: 0.0}
+        frontier = _PriorityQueue()
+        frontier.put(distances.distance(start), start)
+        while not frontier.is_empty:
+            state = frontier.get()
+            timestep, current = divmod(state, cell_count)
+            if timestep == window:
+                planned = []
+                while state != start:
+                    planned.append(state % cell_count)
+                    state = came_from[state]
+                planned.append(start)
+                planned.reverse()
+                return planned
+
+            current_cost = cost_so_far[state]
+            for new, move_cost in _moves(
+                self.grid, current, 0 if current == goal else _WAIT_COST
+            ):
+                if not reservations.is_free(current, new, timestep):
+                    continue
+                new_state = state + cell_count + new - current
+                new_cost = current_cost + move_cost
+                old_cost = cost_so_far.get(new_state)
+                if old_cost is None or new_cost < old_cost:
+                    cost_so_far[new_state] = new_cost
+                    came_from[new_state] = state
+                    estimate = distances.distance(new)
+                    frontier.put(
+                        round(new_cost + estimate, _PRIORITY_PRECISION),
+                        new_state,
+                        estimate,
+                    )
+        self.blocked_count += 1
+        return waiting
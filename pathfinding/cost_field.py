@@ -0,0 +1,95 @@
+"""Module containing `CostField` class."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+from ._search import _reverse_dijkstra
+from .grid_ref import GridRef
+from .path import Path
+
+if TYPE_CHECKING:
+    from .grid import Grid
+
+
+class CostField:
+    """Cheapest paths from every location on a `.grid.Grid` to a single goal.
+
+    Calculated once, with a single search outwards from the goal. Any agent heading for
+    the goal can then read its path without searching.
+    Usually created by `.grid.Grid.cost_field()`, which caches instances.
+    """
+
+    def __init__(self, grid: Grid, goal: GridRef) -> None:
+        self.grid = grid
+        """Reference to a `.grid.Grid` instance."""
+        self.goal = goal
+        self.version = grid.version
+        """`Grid.version` when calculated."""
+        self.prefer_traversed_factor = grid.prefer_traversed_factor
+        """`Grid.prefer_traversed_factor` when calculated."""
+
+        if not grid.in_bounds(goal):
+            err_msg = f"Goal {goal} not on grid."
+            raise IndexError(err_msg)
+        self.distances, self._next_steps = _reverse_dijkstra(grid, grid.index(goal))
+        """Cost of the cheapest path from each location to goal, by flat array index.
+        `math.inf` if no path."""
+
+    @property
+    def is_current(self) -> bool:
+        """Check whether the grid is unchanged since calculation."""
+        return (
+            self.version == self.grid.version
+            and self.prefer_traversed_factor == self.grid.prefer_traversed_factor
+        )
+
+    def cost(self, location: GridRef) -> float:
+        """Return the cost of the cheapest path from a location to goal.
+
+        `math.inf` if no path.
+        """
+        if not self.grid.in_bounds(location):
+            return math.inf
+        return self.distances[self.grid.index(location)]
+
+    def next_step(self, location: GridRef) -> GridRef | None:
+        """Return the next location on the cheapest path from a location to goal.
+
+        None if at goal, or no path.
+        """
+        if not self.grid.in_bounds(location):
+            return None
+        step = self._next_steps[self.grid.index(location)]
+        if step == -1:
+            return None
+        dx, dy, _, _ = self.grid._steps[step]  # noqa: SLF001
+        return GridRef(location.x + dx, location.y + dy)
+
+    def path(self, start: GridRef) -> Path:
+        """Return the cheapest path from `start` to goal.
+
+        Takes time proportional to path length.
+
+        Returns
+        -------
+        Path
+            Locations on the path, from `start` to goal inclusive, with its cost.
+            Empty if no path found.
+        """
+        if not self.grid.in_bounds(start):
+            return Path(self.grid.size_x)
+        index = self.grid.index(start)
+        cost = self.distances[index]
+        if cost == math.inf:
+            return Path(self.grid.size_x)
+        next_steps = self._next_steps
+        offsets = [offset for _, _, offset, _ in self.grid._steps]  # noqa: SLF001
+        indices = [index]
+        step = next_steps[index]
+        while step != -1:
+            index += offsets[step]
+            indices.append(index)
+            step = next_steps[index]
+        return Path(self.grid.size_x, indices, cost)
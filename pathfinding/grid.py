@@ -4,12 +4,40 @@ from __future__ import annotations
 
 import math
 import random
-from typing import TYPE_CHECKING
+from collections import deque
+from typing import TYPE_CHECKING, Self
 
+from ._cell_set import _CellSet
+from ._grid_file import _load_grid, _save_grid
+from ._map_import import _load_movingai_map, _set_untraversable_from_image
+from ._parallel import _WorkerPool
+from ._search import _find_path
+from .components import ConnectedComponents
+from .cost_field import CostField
+from .grid_change import GridChange
 from .grid_ref import GridRef
+from .heuristics import manhattan, octile
+from .landmarks import LandmarkTable
+from .path import Path
+from .path_cache import PathCache
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from PIL import Image
+
     from .agent import Agent
+    from .grid_change import Layer
+    from .heuristics import Heuristic
+
+_TEXT_RENDER_CODES = b".#+AG".ljust(256, b".")
+"""Placeholder character for each code used by `Grid.text_render()`."""
+_TEXT_RENDER_CHARS = str.maketrans({".": "·", "#": "█"})
+
+_COST_FIELD_CACHE_SIZE = 16
+"""Maximum number of cost fields cached by each grid."""
+_CHANGE_LOG_SIZE = 256
+"""Maximum number of recent changes kept by each grid, for `Grid.changes_since()`."""
 
 _CARDINAL_DIRECTIONS = {(1, 0), (0, 1), (-1, 0), (0, -1)}
 _DIAGONAL_DIRECTIONS = {(1, 1), (-1, 1), (-1, -1), (1, -1)}
@@ -31,21 +59,142 @@ class Grid:
         self.allow_diagonal_moves = allow_diagonal_moves
         self.prefer_traversed_factor = prefer_traversed_factor
 
-        self.untraversable_locations: set[GridRef] = set()
-        """Locations which cannot be traversed."""
-        self.shared_path_locations: set[GridRef] = set()
-        """Locations on an agent's path.
-        Currently populated externally."""
+        self._untraversable = _CellSet(size_x, size_y)
+        self._shared_path = _CellSet(size_x, size_y)
+        self._subscribers: list[Callable[[GridChange], None]] = []
+        self._changes: deque[GridChange] = deque(maxlen=_CHANGE_LOG_SIZE)
+        """Most recent changes, oldest first."""
+        # after derived data, e.g. components, so subscribers can search
+        self._untraversable.add_listener(self._untraversable_changed, late=True)
+        self._shared_path.add_listener(self._shared_path_changed, late=True)
 
-        self._directions = _CARDINAL_DIRECTIONS
+        self._directions = set(_CARDINAL_DIRECTIONS)
         if self.allow_diagonal_moves:
             self._directions.update(_DIAGONAL_DIRECTIONS)
+        self._steps = [
+            (dx, dy, dy * size_x + dx, math.sqrt(dx**2 + dy**2))
+            for dx, dy in sorted(self._directions)
+        ]
+        """Neighbour offsets `(dx, dy, index offset, basic cost)`, for searches."""
         self.agents: set[Agent] = set()
+        self._cost_fields: dict[GridRef, CostField] = {}
+        self._components: ConnectedComponents | None = None
+        self.path_cache = PathCache(self)
+        """Paths found by searches on the grid, reused until the grid changes."""
+        self._worker_pool: _WorkerPool | None = None
+        self.landmarks: LandmarkTable | None = None
+        """Distances from landmarks, used by `Agent.landmark_search()`; see
+        `Grid.precompute_landmarks()`."""
+
+    @property
+    def untraversable_locations(self) -> _CellSet:
+        """Locations which cannot be traversed.
+
+        Set-like view of the grid's flat occupancy array; out of bounds locations are
+        ignored.
+        """
+        return self._untraversable
+
+    @untraversable_locations.setter
+    def untraversable_locations(self, locations: Iterable[GridRef]) -> None:
+        self._untraversable.assign(locations)
+
+    @property
+    def shared_path_locations(self) -> _CellSet:
+        """Locations on an agent's path.
+
+        Currently populated externally. Set-like view of a flat array; out of bounds
+        locations are ignored.
+        """
+        return self._shared_path
+
+    @shared_path_locations.setter
+    def shared_path_locations(self, locations: Iterable[GridRef]) -> None:
+        self._shared_path.assign(locations)
+
+    @property
+    def version(self) -> int:
+        """Count of changes to untraversable or shared path locations.
+
+        Derived data, e.g. a `.cost_field.CostField`, is out of date if the version has
+        changed since it was calculated.
+        """
+        return self._untraversable.version + self._shared_path.version
+
+    def subscribe(self, callback: Callable[[GridChange], None]) -> None:
+        """Call `callback` after each change to untraversable or shared path
+        locations.
+
+        Every change made through `Grid.untraversable_locations`,
+        `Grid.shared_path_locations` or other `Grid` methods is reported, including
+        assigning either attribute. Data derived from the grid, e.g.
+        `Grid.components`, is updated first, so `callback` may search the grid. The
+        grid holds a strong reference to `callback` until `Grid.unsubscribe()`.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[GridChange], None]) -> None:
+        """Stop calling a callback registered with `Grid.subscribe()`."""
+        self._subscribers.remove(callback)
+
+    def changes_since(self, version: int) -> list[GridChange] | None:
+        """Return changes made after `Grid.version` was `version`, oldest first.
+
+        Only recent changes are kept. None if some have been forgotten, in which case
+        anything derived from the grid at `version` must be recalculated in full.
+        """
+        if version == self.version:
+            return []
+        if not self._changes or self._changes[0].version > version + 1:
+            return None
+        return [change for change in self._changes if change.version > version]
+
+    @property
+    def components(self) -> ConnectedComponents:
+        """Regions of locations reachable from each other.
+
+        Labelled on first access, then kept up to date as untraversable locations
+        change. Searches use it to reject unreachable goals without exploring.
+        """
+        if self._components is None:
+            self._components = ConnectedComponents(self)
+        return self._components
+
+    @property
+    def default_heuristic(self) -> Heuristic:
+        """Most informed admissible heuristic for moves on the grid.
+
+        `octile()` if diagonal moves are allowed, otherwise `manhattan()`.
+        """
+        return octile if self.allow_diagonal_moves else manhattan
+
+    def _untraversable_changed(self, start: int, stop: int) -> None:
+        """Record a change to untraversable locations."""
+        self._record_change("untraversable", start, stop)
+
+    def _shared_path_changed(self, start: int, stop: int) -> None:
+        """Record a change to shared path locations."""
+        self._record_change("shared_path", start, stop)
+
+    def _record_change(self, layer: Layer, start: int, stop: int) -> None:
+        """Log a change, and notify subscribers."""
+        change = GridChange(layer, start, stop, self.version, self.size_x)
+        self._changes.append(change)
+        for callback in self._subscribers:
+            callback(change)
 
     def in_bounds(self, location: GridRef) -> bool:
         """Determine whether a location is within the grid."""
         return 0 <= location.x < self.size_x and 0 <= location.y < self.size_y
 
+    def index(self, location: GridRef) -> int:
+        """Return the flat array index of an in bounds location."""
+        return location.y * self.size_x + location.x
+
+    def location(self, index: int) -> GridRef:
+        """Return the location at a flat array index."""
+        return GridRef(index % self.size_x, index // self.size_x)
+
     def random_location(self, *, allow_untraversable: bool = False) -> GridRef:
         """Return a random location on the Grid.
 
@@ -61,19 +210,25 @@ class Grid:
 
     def is_traversable(self, location: GridRef) -> bool:
         """Determine whether a location is traversable."""
-        return location not in self.untraversable_locations
+        return location not in self._untraversable
 
     def neighbours(self, location: GridRef) -> set[GridRef]:
         """Return a location's reachable neighbours."""
         reachable_neighbours: set[GridRef] = set()
 
-        if location in self.untraversable_locations:
+        if location in self._untraversable:
             return reachable_neighbours
 
+        untraversable_cells = self._untraversable.cells
         for dir_ in self._directions:
-            neighbour = GridRef(location.x + dir_[0], location.y + dir_[1])
-            if self.in_bounds(neighbour) and self.is_traversable(neighbour):
-                reachable_neighbours.add(neighbour)
+            x = location.x + dir_[0]
+            y = location.y + dir_[1]
+            if (
+                0 <= x < self.size_x
+                and 0 <= y < self.size_y
+                and not untraversable_cells[y * self.size_x + x]
+            ):
+                reachable_neighbours.add(GridRef(x, y))
         return reachable_neighbours
 
     def set_untraversable_area(self, location1: GridRef, location2: GridRef) -> None:
@@ -81,9 +236,13 @@ class Grid:
 
         Out of bounds locations are ignored.
         """
-        for x in range(location1.x, location2.x):
-            for y in range(location1.y, location2.y):
-                self.untraversable_locations.add(GridRef(x, y))
+        x_min = max(location1.x, 0)
+        x_max = min(location2.x, self.size_x)
+        if x_min >= x_max:
+            return
+        for y in range(max(location1.y, 0), min(location2.y, self.size_y)):
+            start = y * self.size_x
+            self._untraversable.add_range(start + x_min, start + x_max)
 
     def set_untraversable_from_map(self, grid_map: list[str]) -> None:
         """Set untraversable locations from 'X's in text representation.
@@ -100,12 +259,165 @@ class Grid:
             "..X",
             ]
         """
-        for y, row in enumerate(grid_map):
-            self.untraversable_locations.update(
-                GridRef(x, y)
-                for x, cell in enumerate(row)
-                if cell == "X" and self.in_bounds(GridRef(x, y))
-            )
+        self._untraversable.add_indices(
+            y * self.size_x + x
+            for y, row in enumerate(grid_map[: self.size_y])
+            for x, cell in enumerate(row[: self.size_x])
+            if cell == "X"
+        )
+
+    def set_untraversable_from_image(
+        self, image: Image.Image, threshold: int = 128
+    ) -> None:
+        """Set untraversable locations from pixels of an image mask darker than
+        `threshold`, once converted to greyscale.
+
+        Pixel (x, y) maps to location (x, y). Does not set grid dimensions. Out of
+        bounds pixels are ignored.
+        """
+        _set_untraversable_from_image(self, image, threshold)
+
+    @classmethod
+    def load_movingai_map(cls, filename: str) -> Self:
+        """Create a grid from a MovingAI benchmark `.map` file.
+
+        Locations marked '@', 'O', 'T' or 'W' are untraversable; all others are
+        traversable. Diagonal moves are allowed, as in MovingAI's octile maps, but may
+        cut corners of untraversable locations, unlike MovingAI's benchmarks.
+
+        Raises
+        ------
+        ValueError
+            If the file's header or any row is malformed.
+        """
+        return _load_movingai_map(cls, filename)
+
+    def save(self, filename: str) -> None:
+        """Save dimensions, settings, untraversable and shared path locations to a
+        compact binary file.
+
+        Each location takes one bit per layer. The shared path layer is only written if
+        it has any locations. Agents are not saved.
+        """
+        _save_grid(self, filename)
+
+    @classmethod
+    def load(cls, filename: str) -> Self:
+        """Create a grid from a file written by `Grid.save()`.
+
+        The file is memory-mapped rather than read in full.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a grid file, or is truncated.
+        """
+        return _load_grid(cls, filename)
+
+    def precompute_landmarks(self, count: int = 8) -> LandmarkTable:
+        """Calculate distances from `count` landmarks to every location, for
+        `Agent.landmark_search()`, and keep them as `Grid.landmarks`.
+
+        Takes one search over the grid per landmark, so best done once per map and
+        saved with `.landmarks.LandmarkTable.save()`, e.g. next to the grid's file.
+        """
+        self.landmarks = LandmarkTable.select(self, count)
+        return self.landmarks
+
+    def load_landmarks(self, filename: str) -> LandmarkTable:
+        """Load distances from landmarks saved by `.landmarks.LandmarkTable.save()`,
+        and keep them as `Grid.landmarks`.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a landmark file, or was calculated for a different
+            grid.
+        """
+        self.landmarks = LandmarkTable.load(self, filename)
+        return self.landmarks
+
+    def plan_paths(
+        self,
+        agents: Sequence[Agent],
+        workers: int = 1,
+    ) -> dict[Agent, Path]:
+        """Perform A* search for each agent's goal, across worker processes.
+
+        Searches are independent, as if each agent called `Agent.a_star_search()` with
+        the default heuristic. Each worker process gets one copy of the grid, via shared
+        memory. Workers are kept for later calls with the same number of workers, and
+        their copies refreshed only if the grid has changed.
+
+        Parameters
+        ----------
+        agents
+            Agents on the grid, each with a goal.
+        workers
+            Number of worker processes. If 1, search in this process.
+
+        Returns
+        -------
+        dict[Agent, Path]
+            Locations on the path to each agent's goal, in order; also set as
+            `Agent.path_to_goal`. Empty if no path found.
+        """
+        queries: list[tuple[int, int]] = []
+        planned_agents: list[Agent] = []
+        paths: dict[Agent, Path] = {}
+        for agent in agents:
+            if agent.goal is None:
+                raise ValueError
+            if self.in_bounds(agent.goal):
+                queries.append((self.index(agent.location), self.index(agent.goal)))
+                planned_agents.append(agent)
+            else:
+                paths[agent] = Path(self.size_x)
+
+        # same cache entries as `Agent.a_star_search()` with default arguments
+        search_key = (self.default_heuristic, "heap", None)
+        cached_paths = [
+            self.path_cache.get(start, goal, search_key) for start, goal in queries
+        ]
+        missed_queries = [
+            query
+            for query, path in zip(queries, cached_paths, strict=True)
+            if path is None
+        ]
+        if workers > 1 and len(missed_queries) > 1:
+            if self._worker_pool is None or self._worker_pool.workers != workers:
+                if self._worker_pool is not None:
+                    self._worker_pool.close()
+                self._worker_pool = _WorkerPool(self, workers)
+            found_paths = self._worker_pool.plan(self, missed_queries)
+        else:
+            found_paths = [
+                _find_path(self, start, goal, self.default_heuristic)
+                for start, goal in missed_queries
+            ]
+        for (start, goal), path in zip(missed_queries, found_paths, strict=True):
+            self.path_cache.put(start, goal, search_key, path)
+        found = iter(found_paths)
+        planned_paths = [next(found) if path is None else path for path in cached_paths]
+
+        paths.update(zip(planned_agents, planned_paths, strict=True))
+        for agent, path in paths.items():
+            agent.path_to_goal = path
+        return paths
+
+    def cost_field(self, goal: GridRef) -> CostField:
+        """Return cheapest paths from every location to `goal`.
+
+        Cached per goal; recalculated if the grid has changed since.
+        """
+        cost_field = self._cost_fields.pop(goal, None)
+        if cost_field is None or not cost_field.is_current:
+            cost_field = CostField(self, goal)
+        # re-insert as most recently used
+        self._cost_fields[goal] = cost_field
+        if len(self._cost_fields) > _COST_FIELD_CACHE_SIZE:
+            del self._cost_fields[next(iter(self._cost_fields))]
+        return cost_field
 
     def cost(self, from_location: GridRef, to_location: GridRef) -> float:
         """Calculate the cost as Euclidean distance from one location to another.
@@ -129,20 +441,19 @@ class Grid:
 
     def text_render(self) -> str:
         """Output a text-based visual representation."""
-        output = "\n"
-        for y in range(self.size_y):
-            for x in range(self.size_x):
-                location = GridRef(x, y)
-                char = "· "
-                if location in self.untraversable_locations:
-                    char = "█ "
-                for agent in self.agents:
-                    if location in agent.path_to_goal:
-                        char = "+ "
-                    if location == agent.location:
-                        char = "A "
-                    if location == agent.goal:
-                        char = "G "
-                output += char
-            output += "\n"
-        return output
+        # One character code per location, painted layer by layer: untraversable,
+        # then each agent's path, location and goal, later agents on top
+        codes = bytearray(self.untraversable_locations.cells)
+        for agent in self.agents:
+            for index in agent.path_to_goal.indices:
+                codes[index] = 2
+            if self.in_bounds(agent.location):
+                codes[self.index(agent.location)] = 3
+            if agent.goal is not None and self.in_bounds(agent.goal):
+                codes[self.index(agent.goal)] = 4
+        chars = codes.translate(_TEXT_RENDER_CODES).decode("ascii")
+        rows = (
+            " ".join(chars[start : start + self.size_x]) + " \n"
+            for start in range(0, len(chars), self.size_x)
+        )
+        return ("\n" + "".join(rows)).translate(_TEXT_RENDER_CHARS)
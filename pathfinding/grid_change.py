@@ -0,0 +1,42 @@
+"""Module containing `GridChange` class."""
+
+from dataclasses import dataclass
+from typing import Literal
+
+type Layer = Literal["untraversable", "shared_path"]
+"""Name of a grid's set of locations, as reported in a `GridChange`."""
+
+
+@dataclass(frozen=True, slots=True)
+class GridChange:
+    """Change to a grid's untraversable or shared path locations.
+
+    Passed to callbacks registered with `.grid.Grid.subscribe()`, and kept in a short
+    log; see `.grid.Grid.changes_since()`.
+    """
+
+    layer: Layer
+    start: int
+    """Flat array index of the first location which may have changed."""
+    stop: int
+    """Flat array index after the last location which may have changed."""
+    version: int
+    """`.grid.Grid.version` after the change."""
+    size_x: int
+    """Width of the grid, to convert flat array indices to locations."""
+
+    @property
+    def box(self) -> tuple[int, int, int, int]:
+        """Rectangle containing the changed locations: minimum x and y, and maximum x
+        and y (exclusive).
+        """
+        first_row = self.start // self.size_x
+        last_row = (self.stop - 1) // self.size_x
+        if first_row == last_row:
+            return (
+                self.start % self.size_x,
+                first_row,
+                (self.stop - 1) % self.size_x + 1,
+                first_row + 1,
+            )
+        return (0, first_row, self.size_x, last_row + 1)
@@ -0,0 +1,44 @@
+"""Heuristic functions for informed searches, e.g. `Agent.a_star_search()`.
+
+Each heuristic estimates the basic cost of moving between two locations, given the
+absolute distances between them along the x and y axes.
+"""
+
+import math
+from collections.abc import Callable
+
+Heuristic = Callable[[int, int], float]
+"""Signature of a heuristic function: `(x_dist, y_dist) -> estimated cost`."""
+
+_DIAGONAL_EXTRA_COST = math.sqrt(2) - 1
+
+
+def octile(x_dist: int, y_dist: int) -> float:
+    """Estimate cost where diagonal moves are allowed.
+
+    Exact basic cost on an open grid with diagonal moves.
+    """
+    return max(x_dist, y_dist) + _DIAGONAL_EXTRA_COST * min(x_dist, y_dist)
+
+
+def manhattan(x_dist: int, y_dist: int) -> float:
+    """Estimate cost where only cardinal moves are allowed.
+
+    Exact basic cost on an open grid without diagonal moves. Not admissible if
+    diagonal moves are allowed.
+    """
+    return x_dist + y_dist
+
+
+def euclidean(x_dist: int, y_dist: int) -> float:
+    """Estimate cost as straight line distance.
+
+    Admissible whether or not diagonal moves are allowed, but less informed than
+    `octile()` or `manhattan()`.
+    """
+    return math.sqrt(x_dist**2 + y_dist**2)
+
+
+def zero(x_dist: int, y_dist: int) -> float:  # noqa: ARG001
+    """Estimate zero cost. A* search then behaves as uniform cost search."""
+    return 0
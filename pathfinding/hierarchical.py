@@ -0,0 +1,521 @@
+"""Module containing `HierarchicalPathfinder` class."""
+
+from __future__ import annotations
+
+import itertools
+import math
+from typing import TYPE_CHECKING
+
+from ._priority_queue import _PriorityQueue
+from ._search import _PRIORITY_PRECISION, _reconstruct_path
+from .path import Path
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .grid import Grid
+    from .grid_ref import GridRef
+
+    type _Border = tuple[bool, int, int]
+    """Whether vertical, and cluster x and y on its top or left side."""
+    type _Bounds = tuple[int, int, int, int]
+    """Minimum x and y, and maximum x and y (exclusive) of a cluster."""
+
+_SPLIT_ENTRANCE_LENGTH = 6
+"""Length of an open section of border, from which it has a transition at each end
+rather than one in the middle."""
+
+
+class HierarchicalPathfinder:
+    """Approximately cheapest paths on a `.grid.Grid`, by hierarchical search (HPA*).
+
+    The grid is divided into square clusters. Transitions are placed on the open
+    sections of borders between clusters, and the cost of crossing each cluster between
+    its transitions precalculated. A path is found by a search over transitions only,
+    then refined into locations with a small search within each cluster crossed.
+
+    Paths are usually within a few percent of the cheapest cost. When cells of the
+    grid change, only the clusters containing them (and the transitions on their
+    borders) are recalculated, at the next search.
+    """
+
+    def __init__(self, grid: Grid, cluster_size: int = 16) -> None:
+        if cluster_size < 1:
+            err_msg = f"Cluster size {cluster_size} must be positive."
+            raise ValueError(err_msg)
+        self.grid = grid
+        """Reference to a `.grid.Grid` instance."""
+        self.cluster_size = cluster_size
+        """Width and height of each cluster, in locations."""
+        self.clusters_x = math.ceil(grid.size_x / cluster_size)
+        self.clusters_y = math.ceil(grid.size_y / cluster_size)
+        self.rebuild_count = 0
+        """Number of times clusters have been marked for recalculation."""
+
+        self._transitions: dict[_Border, list[tuple[int, int]]] = {}
+        """Pairs of locations either side of each border, by flat array index."""
+        self._crossings: dict[int, list[int]] = {}
+        """Locations across borders from each transition."""
+        self._cluster_transitions: dict[int, list[int]] = {}
+        """Transitions in each cluster, calculated when first needed."""
+        self._edges: dict[int, dict[int, float]] = {}
+        """Cost from each transition to the others in its cluster, calculated when
+        first needed."""
+        self._prefer_traversed_factor = grid.prefer_traversed_factor
+        self._dirty_clusters = set(range(self.clusters_x * self.clusters_y))
+        grid.untraversable_locations.add_listener(self._cells_changed)
+        grid.shared_path_locations.add_listener(self._cells_changed)
+
+    @property
+    def transition_count(self) -> int:
+        """Number of locations in the abstract graph."""
+        self._update()
+        return len(self._crossings)
+
+    def find_path(self, start: GridRef, goal: GridRef) -> Path:
+        """Find an approximately cheapest path from `start` to `goal`.
+
+        Returns
+        -------
+        Path
+            Locations on the path, from `start` to `goal` inclusive, with its cost.
+            Empty if no path found.
+        """
+        grid = self.grid
+        if not (grid.in_bounds(start) and grid.in_bounds(goal)):
+            return Path(grid.size_x)
+        start_index = grid.index(start)
+        goal_index = grid.index(goal)
+        if start_index == goal_index:
+            return Path(grid.size_x, [start_index])
+        if not grid.components.connected_indices(start_index, goal_index):
+            return Path(grid.size_x)
+        self._update()
+
+        waypoints, cost = self._abstract_search(start_index, goal_index)
+        if not waypoints:
+            return Path(grid.size_x)
+        return Path(grid.size_x, self._refine(waypoints), cost)
+
+    def abstract_path(self, start: GridRef, goal: GridRef) -> list[GridRef]:
+        """Find the transitions on an approximately cheapest path, without refining
+        it into every location.
+
+        Returns
+        -------
+        list[GridRef]
+            `start`, transitions crossed, then `goal`. Empty if no path found.
+        """
+        grid = self.grid
+        if not (grid.in_bounds(start) and grid.in_bounds(goal)):
+            return []
+        untraversable_cells = grid.untraversable_locations.cells
+        start_index = grid.index(start)
+        goal_index = grid.index(goal)
+        if untraversable_cells[start_index] or untraversable_cells[goal_index]:
+            return []
+        self._update()
+        waypoints, _ = self._abstract_search(start_index, goal_index)
+        return [grid.location(index) for index in waypoints]
+
+    def _cells_changed(self, start: int, stop: int) -> None:
+        """Mark clusters containing changed locations for recalculation."""
+        size_x = self.grid.size_x
+        first_row, first_x = divmod(start, size_x)
+        last_row, last_x = divmod(stop - 1, size_x)
+        if first_row == last_row:
+            self._mark_dirty(first_row, last_row, first_x, last_x)
+            return
+        # partial first and last rows, and full rows between
+        self._mark_dirty(first_row, first_row, first_x, size_x - 1)
+        if last_row - first_row > 1:
+            self._mark_dirty(first_row + 1, last_row - 1, 0, size_x - 1)
+        self._mark_dirty(last_row, last_row, 0, last_x)
+
+    def _mark_dirty(
+        self, first_row: int, last_row: int, first_x: int, last_x: int
+    ) -> None:
+        """Mark clusters overlapping a rectangle of locations for recalculation."""
+        cluster_size = self.cluster_size
+        columns = range(first_x // cluster_size, last_x // cluster_size + 1)
+        for cluster_y in range(first_row // cluster_size, last_row // cluster_size + 1):
+            self._dirty_clusters.update(
+                cluster_y * self.clusters_x + cluster_x for cluster_x in columns
+            )
+
+    def _update(self) -> None:
+        """Recalculate transitions and costs of clusters with changed locations."""
+        if self._prefer_traversed_factor != self.grid.prefer_traversed_factor:
+            self._prefer_traversed_factor = self.grid.prefer_traversed_factor
+            self._dirty_clusters.update(range(self.clusters_x * self.clusters_y))
+        if not self._dirty_clusters:
+            return
+        clusters_x = self.clusters_x
+        borders = {
+            border
+            for cluster in self._dirty_clusters
+            for border in self._cluster_borders(cluster)
+        }
+
+        # neighbouring clusters need new costs only if their transitions change
+        clusters = set(self._dirty_clusters)
+        for border in borders:
+            transitions = self._border_transitions(border)
+            old_transitions = self._transitions.get(border)
+            if transitions == old_transitions:
+                continue
+            self._set_transitions(border, transitions)
+            is_vertical, cluster_x, cluster_y = border
+            clusters.add(cluster_y * clusters_x + cluster_x)
+            clusters.add(
+                cluster_y * clusters_x + cluster_x + (1 if is_vertical else clusters_x)
+            )
+            # diagonal transitions at corners may be in other clusters
+            clusters.update(
+                self._cluster(index)
+                for pair in [*(old_transitions or []), *transitions]
+                for index in pair
+            )
+        for cluster in clusters:
+            for transition in self._cluster_transitions.pop(cluster, []):
+                self._edges.pop(transition, None)
+        self.rebuild_count += len(clusters)
+        self._dirty_clusters.clear()
+
+    def _cluster_borders(self, cluster: int) -> list[_Border]:
+        """Return the borders of a cluster with its neighbours.
+
+        Where diagonal moves are allowed, also the vertical borders meeting its
+        corners, whose transitions may cross diagonally to or from it.
+        """
+        cluster_x = cluster % self.clusters_x
+        cluster_y = cluster // self.clusters_x
+        borders = []
+        if cluster_x + 1 < self.clusters_x:
+            borders.append((True, cluster_x, cluster_y))
+        if cluster_x > 0:
+            borders.append((True, cluster_x - 1, cluster_y))
+        if cluster_y + 1 < self.clusters_y:
+            borders.append((False, cluster_x, cluster_y))
+        if cluster_y > 0:
+            borders.append((False, cluster_x, cluster_y - 1))
+        if self.grid.allow_diagonal_moves:
+            borders.extend(
+                (True, cluster_x + dx, cluster_y + dy)
+                for dx in (-1, 0)
+                for dy in (-1, 1)
+                if 0 <= cluster_x + dx < self.clusters_x - 1
+                and 0 <= cluster_y + dy < self.clusters_y
+            )
+        return borders
+
+    def _set_transitions(
+        self, border: _Border, transitions: list[tuple[int, int]]
+    ) -> None:
+        """Replace the transitions on a border."""
+        for first, second in self._transitions.get(border, []):
+            for index, other in ((first, second), (second, first)):
+                self._crossings[index].remove(other)
+                if not self._crossings[index]:
+                    del self._crossings[index]
+        for first, second in transitions:
+            self._crossings.setdefault(first, []).append(second)
+            self._crossings.setdefault(second, []).append(first)
+        self._transitions[border] = transitions
+
+    def _bounds(self, cluster: int) -> _Bounds:
+        """Return the bounds of a cluster."""
+        cluster_size = self.cluster_size
+        x = cluster % self.clusters_x * cluster_size
+        y = cluster // self.clusters_x * cluster_size
+        return (
+            x,
+            y,
+            min(x + cluster_size, self.grid.size_x),
+            min(y + cluster_size, self.grid.size_y),
+        )
+
+    def _cluster(self, index: int) -> int:
+        """Return the cluster containing a location."""
+        size_x = self.grid.size_x
+        return (index // size_x // self.cluster_size) * self.clusters_x + (
+            index % size_x // self.cluster_size
+        )
+
+    def _border_transitions(self, border: _Border) -> list[tuple[int, int]]:
+        """Place transitions on each open section of a border between two clusters.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            Pairs of locations, on the top or left side then on the other side.
+        """
+        is_vertical, cluster_x, cluster_y = border
+        size_x = self.grid.size_x
+        untraversable_cells = self.grid.untraversable_locations.cells
+        min_x, min_y, max_x, max_y = self._bounds(
+            cluster_y * self.clusters_x + cluster_x
+        )
+        if is_vertical:
+            first_indices = range(min_y * size_x + max_x - 1, max_y * size_x, size_x)
+            offset = 1
+        else:
+            first_indices = range(
+                (max_y - 1) * size_x + min_x, (max_y - 1) * size_x + max_x
+            )
+            offset = size_x
+
+        transitions: list[tuple[int, int]] = []
+        for is_open, section in itertools.groupby(
+            first_indices,
+            lambda index: (
+                not (untraversable_cells[index] or untraversable_cells[index + offset])
+            ),
+        ):
+            if not is_open:
+                continue
+            indices = list(section)
+            if len(indices) < _SPLIT_ENTRANCE_LENGTH:
+                ends = [indices[len(indices) // 2]]
+            else:
+                ends = [indices[0], indices[-1]]
+            transitions.extend((index, index + offset) for index in ends)
+        if self.grid.allow_diagonal_moves:
+            transitions.extend(
+                self._diagonal_transitions(
+                    first_indices, offset, is_vertical=is_vertical
+                )
+            )
+        return transitions
+
+    def _diagonal_transitions(
+        self, first_indices: range, offset: int, *, is_vertical: bool
+    ) -> list[tuple[int, int]]:
+        """Place transitions where a border can only be crossed diagonally, between
+        the corners of untraversable locations.
+
+        Where either location beside a diagonal move is traversable, a transition on
+        an open section of border is reachable instead. Vertical borders also cross
+        diagonally at their ends, into the clusters above and below their right side.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            Pairs of locations, on the top or left side then on the other side.
+        """
+        grid = self.grid
+        size_x = grid.size_x
+        untraversable_cells = grid.untraversable_locations.cells
+        along = size_x if is_vertical else 1
+        transitions = []
+        for index in first_indices:
+            if untraversable_cells[index] or not untraversable_cells[index + offset]:
+                continue
+            y = index // size_x
+            for sign in (-1, 1):
+                beside = index + sign * along
+                if is_vertical:
+                    if not 0 <= y + sign < grid.size_y:
+                        continue
+                elif beside not in first_indices:
+                    continue
+                other = beside + offset
+                if untraversable_cells[beside] and not untraversable_cells[other]:
+                    transitions.append((index, other))
+        return transitions
+
+    def _transitions_in(self, cluster: int) -> list[int]:
+        """Return the transitions in a cluster."""
+        transitions = self._cluster_transitions.get(cluster)
+        if transitions is None:
+            transitions = list(
+                {
+                    index
+                    for border in self._cluster_borders(cluster)
+                    for pair in self._transitions[border]
+                    for index in pair
+                    if self._cluster(index) == cluster
+                }
+            )
+            self._cluster_transitions[cluster] = transitions
+        return transitions
+
+    def _transition_edges(self, transition: int) -> dict[int, float]:
+        """Return the cost from a transition to each other reachable within its
+        cluster.
+        """
+        edges = self._edges.get(transition)
+        if edges is None:
+            cluster = self._cluster(transition)
+            edges, _ = self._cluster_costs(
+                transition, self._bounds(cluster), self._transitions_in(cluster)
+            )
+            self._edges[transition] = edges
+        return edges
+
+    def _cluster_costs(
+        self,
+        source: int,
+        bounds: _Bounds,
+        targets: Iterable[int],
+        *,
+        reverse: bool = False,
+    ) -> tuple[dict[int, float], dict[int, int]]:
+        """Search outwards from `source` within a cluster, until reaching all `targets`.
+
+        Parameters
+        ----------
+        reverse
+            Find costs of paths to `source`, rather than from it.
+
+        Returns
+        -------
+        tuple[dict[int, float], dict[int, int]]
+            Cost of the cheapest path to each target reached, other than `source`,
+            then the previous location on the path to each location reached.
+        """
+        grid = self.grid
+        size_x = grid.size_x
+        min_x, min_y, max_x, max_y = bounds
+        untraversable_cells = grid.untraversable_locations.cells
+        shared_path_cells = grid.shared_path_locations.cells
+        prefer_traversed = grid.prefer_traversed_factor != 0
+        discount_factor = max(1 - grid.prefer_traversed_factor, 0)
+        remaining = set(targets)
+        remaining.discard(source)
+        target_costs: dict[int, float] = {}
+
+        came_from: dict[int, int] = {source: source}
+        cost_so_far: dict[int, float] = {source: 0}
+        frontier = _PriorityQueue()
+        frontier.put(0, source)
+        while remaining and not frontier.is_empty:
+            current = frontier.get()
+            current_cost = cost_so_far[current]
+            if current in remaining:
+                remaining.remove(current)
+                target_costs[current] = current_cost
+            x = current % size_x
+            y = current // size_x
+            for dx, dy, offset, basic_cost in grid._steps:  # noqa: SLF001
+                if not (min_x <= x + dx < max_x and min_y <= y + dy < max_y):
+                    continue
+                new = current + offset
+                if untraversable_cells[new]:
+                    continue
+                new_cost = current_cost + (
+                    basic_cost * discount_factor
+                    if prefer_traversed
+                    and shared_path_cells[current if reverse else new]
+                    else basic_cost
+                )
+                old_cost = cost_so_far.get(new)
+                if old_cost is None or new_cost < old_cost:
+                    cost_so_far[new] = new_cost
+                    came_from[new] = current
+                    frontier.put(round(new_cost, _PRIORITY_PRECISION), new)
+        return target_costs, came_from
+
+    def _step_cost(self, from_index: int, to_index: int) -> float:
+        """Return the cost of crossing a border from a location onto a neighbour."""
+        size_x = self.grid.size_x
+        basic_cost = (
+            math.sqrt(2)
+            if from_index % size_x != to_index % size_x
+            and from_index // size_x != to_index // size_x
+            else 1
+        )
+        if (
+            self.grid.prefer_traversed_factor
+            and self.grid.shared_path_locations.cells[to_index]
+        ):
+            return basic_cost * max(1 - self.grid.prefer_traversed_factor, 0)
+        return basic_cost
+
+    def _abstract_search(self, start: int, goal: int) -> tuple[list[int], float]:
+        """Search over transitions from `start` to `goal`.
+
+        `start` and `goal` are joined to the transitions of their clusters, and to each
+        other within a shared cluster.
+
+        Returns
+        -------
+        tuple[list[int], float]
+            `start`, transitions crossed, then `goal`, with the path's cost.
+            Empty if no path found.
+        """
+        grid = self.grid
+        size_x = grid.size_x
+        heuristic = grid.default_heuristic
+        # largest possible discount, so the heuristic stays admissible
+        heuristic_scale = min(max(1 - grid.prefer_traversed_factor, 0), 1)
+        goal_x = goal % size_x
+        goal_y = goal // size_x
+
+        start_cluster = self._cluster(start)
+        goal_cluster = self._cluster(goal)
+        start_edges = self._cluster_costs(
+            start,
+            self._bounds(start_cluster),
+            [*self._transitions_in(start_cluster), goal]
+            if start_cluster == goal_cluster
+            else self._transitions_in(start_cluster),
+        )[0]
+        goal_edges = self._cluster_costs(
+            goal,
+            self._bounds(goal_cluster),
+            self._transitions_in(goal_cluster),
+            reverse=True,
+        )[0]
+
+        came_from: dict[int, int] = {start: start}
+        cost_so_far: dict[int, float] = {start: 0}
+        frontier = _PriorityQueue()
+        frontier.put(0, start)
+        while not frontier.is_empty:
+            current = frontier.get()
+            if current == goal:
+                break
+            current_cost = cost_so_far[current]
+            neighbours = [
+                *(
+                    start_edges if current == start else self._transition_edges(current)
+                ).items(),
+                *(
+                    (other, self._step_cost(current, other))
+                    for other in self._crossings.get(current, [])
+                ),
+            ]
+            if current in goal_edges:
+                neighbours.append((goal, goal_edges[current]))
+            for new, cost in neighbours:
+                new_cost = current_cost + cost
+                old_cost = cost_so_far.get(new)
+                if old_cost is None or new_cost < old_cost:
+                    cost_so_far[new] = new_cost
+                    came_from[new] = current
+                    estimate = heuristic_scale * heuristic(
+                        abs(goal_x - new % size_x), abs(goal_y - new // size_x)
+                    )
+                    frontier.put(
+                        round(new_cost + estimate, _PRIORITY_PRECISION), new, estimate
+                    )
+
+        if goal not in came_from:
+            return [], math.inf
+        return _reconstruct_path(came_from, start, goal), cost_so_far[goal]
+
+    def _refine(self, waypoints: list[int]) -> list[int]:
+        """Return every location on a path through `waypoints`."""
+        indices = waypoints[:1]
+        for from_index, to_index in itertools.pairwise(waypoints):
+            cluster = self._cluster(from_index)
+            if self._cluster(to_index) != cluster:
+                # crossing a border
+                indices.append(to_index)
+                continue
+            _, came_from = self._cluster_costs(
+                from_index, self._bounds(cluster), [to_index]
+            )
+            indices.extend(_reconstruct_path(came_from, from_index, to_index)[1:])
+        return indices
@@ -8,20 +8,30 @@ from PIL import Image
 
 from . import log_info
 from ._pygame_colordict import THECOLORS
+from .agent import Agent
 from .grid import Grid
-from .grid_ref import GridRef
 
 
 class GridRenderer:
-    """Renders a `.grid.Grid` as a static image."""
+    """Renders a `.grid.Grid` as an image.
+
+    Call `GridRenderer.update()` to repaint locations changed since the last render.
+    """
 
     _COLOR_MAPPING: ClassVar = {
         "EMPTY": THECOLORS["grey50"],
         "BLOCK": THECOLORS["grey40"],
+        "ON_AGENT_PATH": THECOLORS["goldenrod1"],
         "AGENT_START": THECOLORS["green4"],
         "AGENT_GOAL": THECOLORS["red2"],
-        "ON_AGENT_PATH": THECOLORS["goldenrod1"],
     }
+    """Colour of each layer, in order of palette index."""
+
+    _LAYER_CODES: ClassVar = bytes([0, 1, 2, 2])
+    """Palette index by untraversable flag plus twice shared path flag."""
+
+    _MAX_CHANGED_FRACTION = 0.25
+    """Fraction of locations changed, above which the whole image is repainted."""
 
     def __init__(
         self,
@@ -29,46 +39,180 @@ class GridRenderer:
         scale: int = 32,
     ) -> None:
         """Create a new `GridRenderer` instance bound to `grid`."""
+        self.grid = grid
+        self.scale = scale
+        self._changed_cells: set[int] = set()
+        self._repaint_all = False
+        self._agent_cells: dict[Agent, tuple[int, int]] = {}
+        """Flat array indices of each agent's location and goal when last rendered;
+        -1 if not on the grid."""
+        self.changed_box: tuple[int, int, int, int] | None = None
+        """Pixel bounds (left, upper, right, lower) of the area painted by the last
+        render or update. None if nothing changed."""
+        grid.untraversable_locations.add_listener(self._cells_changed)
+        grid.shared_path_locations.add_listener(self._cells_changed)
+        self._image = self._render()
+
+    @property
+    def image(self) -> Image.Image:
+        """Current image. Changed in place by `GridRenderer.update()`."""
+        return self._image
+
+    def update(self) -> int:
+        """Repaint locations changed since the last render, at scale.
+
+        Changes are untraversable and shared path locations edited on the grid, and
+        agents moved, given new goals, added or removed.
+
+        Returns
+        -------
+        int
+            Number of locations repainted.
+        """
+        agent_cells = self._current_agent_cells()
+        changed_cells = self._changed_cells
+        for agent in agent_cells.keys() | self._agent_cells.keys():
+            old_cells = self._agent_cells.get(agent, (-1, -1))
+            new_cells = agent_cells.get(agent, (-1, -1))
+            for old_cell, new_cell in zip(old_cells, new_cells, strict=True):
+                if old_cell != new_cell:
+                    changed_cells.update((old_cell, new_cell))
+        changed_cells.discard(-1)
+        self._agent_cells = agent_cells
+
+        grid = self.grid
+        cell_count = grid.size_x * grid.size_y
+        if self._repaint_all or len(changed_cells) > self._MAX_CHANGED_FRACTION * (
+            cell_count
+        ):
+            self._image = self._render()
+            return cell_count
+
+        # agents' layers are painted over the others, in the same order as a full render
+        layer_names = list(self._COLOR_MAPPING)
+        start_index = layer_names.index("AGENT_START")
+        goal_index = layer_names.index("AGENT_GOAL")
+        untraversable_cells = grid.untraversable_locations.cells
+        shared_path_cells = grid.shared_path_locations.cells
+        palette_indices = {
+            cell: self._LAYER_CODES[
+                untraversable_cells[cell] + 2 * shared_path_cells[cell]
+            ]
+            for cell in changed_cells
+        }
+        for location_cell, goal_cell in agent_cells.values():
+            if location_cell in palette_indices:
+                palette_indices[location_cell] = start_index
+            if goal_cell in palette_indices:
+                palette_indices[goal_cell] = goal_index
+
+        colors = [color[:3] for color in self._COLOR_MAPPING.values()]
+        scale = self.scale
+        for cell, palette_index in palette_indices.items():
+            x = cell % grid.size_x * scale
+            y = cell // grid.size_x * scale
+            self._image.paste(colors[palette_index], (x, y, x + scale, y + scale))
+        if changed_cells:
+            xs = [cell % grid.size_x for cell in changed_cells]
+            ys = [cell // grid.size_x for cell in changed_cells]
+            self.changed_box = (
+                min(xs) * scale,
+                min(ys) * scale,
+                (max(xs) + 1) * scale,
+                (max(ys) + 1) * scale,
+            )
+        else:
+            self.changed_box = None
+        changed_cells.clear()
+        return len(palette_indices)
+
+    def _cells_changed(self, start: int, stop: int) -> None:
+        """Record locations changed on the grid, for the next update."""
+        if self._repaint_all:
+            return
+        if stop - start > self._MAX_CHANGED_FRACTION * len(
+            self.grid.untraversable_locations.cells
+        ):
+            self._repaint_all = True
+            self._changed_cells.clear()
+        else:
+            self._changed_cells.update(range(start, stop))
+
+    def _current_agent_cells(self) -> dict[Agent, tuple[int, int]]:
+        """Return flat array indices of each agent's location and goal; -1 if not on
+        the grid.
+        """
+        grid = self.grid
+        return {
+            agent: (
+                grid.index(agent.location) if grid.in_bounds(agent.location) else -1,
+                grid.index(agent.goal)
+                if agent.goal is not None and grid.in_bounds(agent.goal)
+                else -1,
+            )
+            for agent in grid.agents
+        }
+
+    def _render(self) -> Image.Image:
+        """Paint every location, then resize to scale.
+
+        Returns
+        -------
+        Image.Image
+            RGB image, `scale` pixels per location.
+        """
         log = logging.getLogger(__name__)
         start_time = time.time()
-        self.grid = grid
-        self._image = Image.new(
-            mode="RGB",  # 3x8-bit pixels, true color
-            size=(self.grid.size_x, self.grid.size_y),
-        )
+        grid = self.grid
+        self._agent_cells = self._current_agent_cells()
+        self._changed_cells.clear()
+        self._repaint_all = False
+        self.changed_box = (0, 0, self.scale * grid.size_x, self.scale * grid.size_y)
         # populate pixels
         log_info(log, "Calculating pixels...", start_time)
-        pixels = [
-            self._pixel_color(x, y)
-            for y in range(self.grid.size_y)
-            for x in range(self.grid.size_x)
-        ]
+        image = Image.frombytes(
+            mode="P",  # 8-bit palette indices
+            size=(grid.size_x, grid.size_y),
+            data=bytes(self._palette_indices()),
+        )
+        image.putpalette(
+            [value for color in self._COLOR_MAPPING.values() for value in color[:3]]
+        )
+        image = image.convert("RGB")  # 3x8-bit pixels, true color
         log_info(log, "Done.", start_time)
-        self._image.putdata(pixels)
         # resize for output
-        self._image = self._image.resize(
-            size=(scale * grid.size_x, scale * self.grid.size_y),
+        return image.resize(
+            size=(self.scale * grid.size_x, self.scale * grid.size_y),
             resample=Image.Resampling.NEAREST,
         )
 
-    def _pixel_color(self, x: int, y: int) -> tuple[int, int, int]:
-        """Determine the pixel colour."""
-        location = GridRef(x, y)
-        color = self._COLOR_MAPPING["EMPTY"]
-
-        if location in self.grid.untraversable_locations:
-            color = self._COLOR_MAPPING["BLOCK"]
+    def _palette_indices(self) -> bytearray:
+        """Paint each layer's palette index over the layers beneath it, for every
+        location.
 
-        if location in self.grid.shared_path_locations:
-            color = self._COLOR_MAPPING["ON_AGENT_PATH"]
-
-        for agent in self.grid.agents:
-            if location == agent.location:
-                color = self._COLOR_MAPPING["AGENT_START"]
-            if location == agent.goal:
-                color = self._COLOR_MAPPING["AGENT_GOAL"]
+        Whole-grid layers are combined as large integers, then mapped to palette
+        indices in one step. Only agent starts and goals are painted location by
+        location.
+        """
+        grid = self.grid
+        cell_count = grid.size_x * grid.size_y
+        # Flags are 0 or 1 per byte, so adding layers never carries between bytes
+        layers = int.from_bytes(grid.untraversable_locations.cells) + 2 * (
+            int.from_bytes(grid.shared_path_locations.cells)
+        )
+        indices = bytearray(
+            layers.to_bytes(cell_count).translate(self._LAYER_CODES.ljust(256, b"\x00"))
+        )
 
-        return color  # type: ignore[no-any-return]
+        layer_names = list(self._COLOR_MAPPING)
+        start_index = layer_names.index("AGENT_START")
+        goal_index = layer_names.index("AGENT_GOAL")
+        for location_cell, goal_cell in self._agent_cells.values():
+            if location_cell != -1:
+                indices[location_cell] = start_index
+            if goal_cell != -1:
+                indices[goal_cell] = goal_index
+        return indices
 
     def show(
         self,
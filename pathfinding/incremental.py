@@ -0,0 +1,339 @@
+"""Module containing `IncrementalPlanner` class."""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import TYPE_CHECKING
+
+from ._priority_queue import _IndexedPriorityQueue
+from ._search import _PRIORITY_PRECISION, _find_path
+from .path import Path
+
+if TYPE_CHECKING:
+    from .grid import Grid
+    from .grid_ref import GridRef
+    from .search_stats import SearchStats
+
+_MAX_CHANGED_FRACTION = 0.25
+"""Fraction of locations changed, above which the planner starts afresh rather than
+repairing its search."""
+
+
+class IncrementalPlanner:
+    """Cheapest paths to a goal on a `.grid.Grid`, repaired as the grid changes
+    (D* Lite).
+
+    Searches backwards from the goal, keeping the cost to the goal of each location
+    explored between calls. When untraversable or shared path locations change, only
+    those locations and their neighbours are updated, and the search resumes from
+    there, re-expanding only locations whose cost changed. The start may move
+    between calls, e.g. as an agent follows its path, without invalidating the
+    search.
+
+    Usually used through `.agent.Agent.incremental_search()`, which keeps one
+    planner per agent.
+    """
+
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
+        """Reference to a `.grid.Grid` instance."""
+        size_x = grid.size_x
+        self._steps = [
+            (dx, dy, dy * size_x + dx, basic_cost)
+            for dx, dy, _, basic_cost in grid._steps  # noqa: SLF001
+        ]
+        self._goal: int | None = None
+        self._start = 0
+        self._key_modifier = 0.0
+        """Total heuristic distance the start has moved, added to new priorities so
+        queued ones stay comparable (D* Lite's k_m)."""
+        self._prefer_traversed_factor = grid.prefer_traversed_factor
+        self._discount_factor = 1.0
+        """Discount on moves onto shared path locations."""
+        self._heuristic_scale = 1.0
+        """Largest possible discount on any move, which keeps estimates admissible."""
+        self._heuristic = grid.default_heuristic
+        self._costs: dict[int, float] = {}
+        """Cost to goal of each expanded location (D* Lite's g); `math.inf` if
+        missing."""
+        self._lookahead: dict[int, float] = {}
+        """Cost to goal of each location, via its neighbours' costs (D* Lite's rhs);
+        `math.inf` if missing."""
+        self._frontier = _IndexedPriorityQueue()
+        self._changed_cells: set[int] = set()
+        self._reset = True
+        grid.untraversable_locations.add_listener(self._untraversable_changed)
+        grid.shared_path_locations.add_listener(self._shared_path_changed)
+
+    def find_path(
+        self, start: GridRef, goal: GridRef, stats: SearchStats | None = None
+    ) -> Path:
+        """Find a cheapest path from `start` to `goal`, reusing previous searches for
+        the same goal.
+
+        Parameters
+        ----------
+        stats
+            Record the work done by this call, if given.
+
+        Returns
+        -------
+        Path
+            Locations on the path, from `start` to `goal` inclusive, with its cost.
+            Empty if no path found.
+        """
+        grid = self.grid
+        if not (grid.in_bounds(start) and grid.in_bounds(goal)):
+            return Path(grid.size_x)
+        start_ns = time.perf_counter_ns()
+        start_index = grid.index(start)
+        goal_index = grid.index(goal)
+        if (
+            self._reset
+            or goal_index != self._goal
+            or grid.prefer_traversed_factor != self._prefer_traversed_factor
+        ):
+            self._restart(start_index, goal_index)
+        else:
+            self._move_start(start_index)
+            self._repair(stats)
+
+        path = Path(grid.size_x)
+        if grid.components.connected_indices(start_index, goal_index):
+            self._compute(stats)
+            reconstruction_start_ns = time.perf_counter_ns()
+            path = self._path(goal_index)
+            if stats is not None:
+                stats.reconstruction_ns = (
+                    time.perf_counter_ns() - reconstruction_start_ns
+                )
+        if stats is not None:
+            stats.search_ns = time.perf_counter_ns() - start_ns
+        return path
+
+    def _untraversable_changed(self, start: int, stop: int) -> None:
+        """Record changed locations, to be repaired at the next search."""
+        if self._reset:
+            return
+        if (
+            len(self._changed_cells) + stop - start
+            > _MAX_CHANGED_FRACTION * self.grid.size_x * self.grid.size_y
+        ):
+            self._reset = True
+            self._changed_cells.clear()
+        else:
+            self._changed_cells.update(range(start, stop))
+
+    def _shared_path_changed(self, start: int, stop: int) -> None:
+        """Record changed locations, if they change the cost of moves."""
+        if self.grid.prefer_traversed_factor:
+            self._untraversable_changed(start, stop)
+
+    def _restart(self, start: int, goal: int) -> None:
+        """Discard previous searches, and queue `goal` for a new search."""
+        self._goal = goal
+        self._start = start
+        self._key_modifier = 0.0
+        self._prefer_traversed_factor = self.grid.prefer_traversed_factor
+        self._discount_factor = max(1 - self._prefer_traversed_factor, 0)
+        self._heuristic_scale = min(self._discount_factor, 1)
+        self._costs = {}
+        self._lookahead = {goal: 0.0}
+        self._frontier = _IndexedPriorityQueue()
+        self._queue(goal, 0.0)
+        self._changed_cells.clear()
+        self._reset = False
+
+    def _move_start(self, start: int) -> None:
+        """Move the start, raising later priorities by the distance moved."""
+        if start != self._start:
+            self._key_modifier += self._estimate(self._start, start)
+            self._start = start
+
+    def _repair(self, stats: SearchStats | None) -> None:
+        """Update changed locations and their neighbours, whose cost to goal may have
+        changed.
+        """
+        to_update = set(self._changed_cells)
+        for index in self._changed_cells:
+            to_update.update(neighbour for neighbour, _ in self._neighbours(index))
+        self._changed_cells.clear()
+        for index in to_update:
+            self._update(index, stats)
+
+    def _compute(self, stats: SearchStats | None) -> None:
+        """Expand locations until the start's cost to goal is settled."""
+        frontier = self._frontier
+        costs = self._costs
+        lookahead = self._lookahead
+        shared_path_cells = self.grid.shared_path_locations.cells
+        start = self._start
+        goal = self._goal
+        while not frontier.is_empty:
+            start_cost = costs.get(start, math.inf)
+            start_lookahead = lookahead.get(start, math.inf)
+            priority, tiebreak, index = frontier.items[0]
+            if start_cost == start_lookahead and (priority, tiebreak) >= self._priority(
+                start, start_cost
+            ):
+                break
+            cost = costs.get(index, math.inf)
+            index_lookahead = lookahead.get(index, math.inf)
+            if (priority, tiebreak) < self._priority(index, min(cost, index_lookahead)):
+                # the start moved since it was queued
+                self._queue(index, min(cost, index_lookahead))
+                continue
+            frontier.get()
+            if stats is not None:
+                stats.nodes_expanded += 1
+            # moves onto a location cost the same from every neighbour, by direction
+            discount_factor = self._discount_factor if shared_path_cells[index] else 1
+            if cost > index_lookahead:
+                costs[index] = index_lookahead
+                for neighbour, basic_cost in self._neighbours(index):
+                    via_cost = basic_cost * discount_factor + index_lookahead
+                    if neighbour != goal and via_cost < lookahead.get(
+                        neighbour, math.inf
+                    ):
+                        lookahead[neighbour] = via_cost
+                        self._queue_if_inconsistent(neighbour, stats)
+            else:
+                costs[index] = math.inf
+                self._queue_if_inconsistent(index, stats)
+                for neighbour, basic_cost in self._neighbours(index):
+                    if (
+                        neighbour != goal
+                        and lookahead.get(neighbour, math.inf)
+                        == basic_cost * discount_factor + cost
+                    ):
+                        self._update(neighbour, stats)
+
+    def _update(self, index: int, stats: SearchStats | None = None) -> None:
+        """Recalculate a location's cost to goal via its neighbours, and queue it if
+        that differs from its expanded cost.
+        """
+        if index == self._goal:
+            self._queue_if_inconsistent(index, stats)
+            return
+        lookahead = math.inf
+        if not self.grid.untraversable_locations.cells[index]:
+            costs = self._costs
+            shared_path_cells = self.grid.shared_path_locations.cells
+            discount_factor = self._discount_factor
+            for neighbour, basic_cost in self._neighbours(index):
+                move_cost = (
+                    basic_cost * discount_factor
+                    if shared_path_cells[neighbour]
+                    else basic_cost
+                )
+                lookahead = min(lookahead, move_cost + costs.get(neighbour, math.inf))
+        self._lookahead[index] = lookahead
+        self._queue_if_inconsistent(index, stats)
+
+    def _queue_if_inconsistent(
+        self, index: int, stats: SearchStats | None = None
+    ) -> None:
+        """Queue a location if its cost to goal via its neighbours differs from its
+        expanded cost, otherwise remove it from the frontier.
+        """
+        lookahead = self._lookahead.get(index, math.inf)
+        cost = self._costs.get(index, math.inf)
+        if cost == lookahead:
+            self._frontier.remove(index)
+            return
+        self._queue(index, min(cost, lookahead))
+        if stats is not None:
+            stats.nodes_pushed += 1
+            stats.peak_frontier_size = max(
+                stats.peak_frontier_size, len(self._frontier)
+            )
+
+    def _queue(self, index: int, cost: float) -> None:
+        """Queue a location with a cost to goal, or change its priority."""
+        priority, tiebreak = self._priority(index, cost)
+        self._frontier.put(priority, index, tiebreak)
+
+    def _priority(self, index: int, cost: float) -> tuple[float, float]:
+        """Return priority and tiebreak of a location with a cost to goal."""
+        return (
+            round(
+                cost + self._estimate(self._start, index) + self._key_modifier,
+                _PRIORITY_PRECISION,
+            ),
+            cost,
+        )
+
+    def _estimate(self, index1: int, index2: int) -> float:
+        """Estimate the cost between locations, scaled by the largest possible
+        discount so it stays admissible.
+        """
+        size_x = self.grid.size_x
+        return self._heuristic_scale * self._heuristic(
+            abs(index1 % size_x - index2 % size_x),
+            abs(index1 // size_x - index2 // size_x),
+        )
+
+    def _neighbours(self, index: int) -> list[tuple[int, float]]:
+        """Return traversable neighbours of a location, with the basic cost of moving
+        between them, the same in either direction.
+        """
+        grid = self.grid
+        size_x = grid.size_x
+        size_y = grid.size_y
+        untraversable_cells = grid.untraversable_locations.cells
+        x = index % size_x
+        y = index // size_x
+        return [
+            (index + offset, basic_cost)
+            for dx, dy, offset, basic_cost in self._steps
+            if 0 <= x + dx < size_x
+            and 0 <= y + dy < size_y
+            and not untraversable_cells[index + offset]
+        ]
+
+    def _path(self, goal: int) -> Path:
+        """Follow the cheapest moves from the start to the goal.
+
+        Where moves onto shared path locations are free, following the cheapest
+        moves may go round in circles; the path is then found by A* search instead.
+
+        Returns
+        -------
+        Path
+            Locations on the path, with its cost. Empty if no path found.
+        """
+        costs = self._costs
+        shared_path_cells = self.grid.shared_path_locations.cells
+        discount_factor = self._discount_factor
+        index = self._start
+        size_x = self.grid.size_x
+        start_cost = self._lookahead.get(index, math.inf)
+        if start_cost == math.inf:
+            return Path(size_x)
+        indices = [index]
+        visited = {index}
+        total_cost = 0.0
+        while index != goal:
+            moves = []
+            for neighbour, basic_cost in self._neighbours(index):
+                if neighbour in visited:
+                    continue
+                move_cost = (
+                    basic_cost * discount_factor
+                    if shared_path_cells[neighbour]
+                    else basic_cost
+                )
+                moves.append(
+                    (move_cost + costs.get(neighbour, math.inf), move_cost, neighbour)
+                )
+            if not moves or min(moves)[0] == math.inf:
+                break
+            _, move_cost, index = min(moves)
+            total_cost += move_cost
+            indices.append(index)
+            visited.add(index)
+        else:
+            if math.isclose(total_cost, start_cost, abs_tol=1e-9):
+                return Path(size_x, indices, total_cost)
+        return _find_path(self.grid, self._start, goal, self._heuristic)
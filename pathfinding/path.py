@@ -0,0 +1,75 @@
+"""Module containing `Path` class."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, overload
+
+from .grid_ref import GridRef
+
+if TYPE_CHECKING:
+    from .search_stats import SearchStats
+
+
+class Path(Sequence[GridRef]):
+    """Locations on a path, in order from start to goal inclusive.
+
+    Stored compactly as flat array indices of locations on a grid `size_x` wide, with
+    the total cost of the path. Membership checks don't depend on path length.
+    """
+
+    def __init__(
+        self,
+        size_x: int,
+        indices: Iterable[int] = (),
+        cost: float = 0,
+    ) -> None:
+        self.size_x = size_x
+        self.indices = array("q", indices)
+        """Flat array index of each location."""
+        self.cost = cost
+        """Total cost of moving along the path."""
+        self.stats: SearchStats | None = None
+        """Work done by the search which found the path, if requested."""
+        self._index_set: frozenset[int] | None = None
+
+    @overload
+    def __getitem__(self, position: int) -> GridRef: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> Sequence[GridRef]: ...
+
+    def __getitem__(self, position: int | slice) -> GridRef | Sequence[GridRef]:
+        if isinstance(position, slice):
+            return [self._location(index) for index in self.indices[position]]
+        return self._location(self.indices[position])
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[GridRef]:
+        return map(self._location, self.indices)
+
+    def __contains__(self, location: object) -> bool:
+        if not isinstance(location, GridRef) or not 0 <= location.x < self.size_x:
+            return False
+        if self._index_set is None:
+            self._index_set = frozenset(self.indices)
+        return location.y * self.size_x + location.x in self._index_set
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Path):
+            return self.size_x == other.size_x and self.indices == other.indices
+        if isinstance(other, list | tuple):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]  # compared by value, like lists
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)}, cost={self.cost})"
+
+    def _location(self, index: int) -> GridRef:
+        """Return the location at a flat array index."""
+        return GridRef(index % self.size_x, index // self.size_x)
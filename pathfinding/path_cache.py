@@ -0,0 +1,121 @@
+"""Module containing `PathCache` class."""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from .grid import Grid
+    from .path import Path
+
+_DEFAULT_MAX_SIZE = 1024
+"""Default maximum number of paths cached by each grid."""
+_DEFAULT_MAX_BYTES = 16 * 2**20
+"""Default maximum memory used by paths cached by each grid."""
+
+type _Key = tuple[int, int, int, float, Hashable]
+"""Start index, goal index, grid version, prefer traversed factor, search key."""
+
+
+class PathCache:
+    """Least recently used cache of paths found on a `.grid.Grid`.
+
+    Paths are keyed by start, goal, `.grid.Grid.version` and the search which found
+    them, so any change to untraversable or shared path locations makes every cached
+    path a miss. Entries for older versions are dropped as soon as the version
+    changes, rather than waiting to be evicted.
+
+    Each grid has one, as `.grid.Grid.path_cache`, used by searches from
+    `.agent.Agent` and `.grid.Grid.plan_paths()`. Cached paths are shared between
+    callers, so shouldn't be modified.
+    """
+
+    def __init__(
+        self,
+        grid: Grid,
+        max_size: int = _DEFAULT_MAX_SIZE,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+    ) -> None:
+        """Create a new `PathCache` instance for `grid`.
+
+        Parameters
+        ----------
+        max_size
+            Maximum number of paths cached. If 0, nothing is cached.
+        max_bytes
+            Maximum memory used by cached paths' location arrays, in bytes.
+        """
+        self.grid = grid
+        """Reference to a `.grid.Grid` instance."""
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.hits = 0
+        """Number of lookups which found a cached path."""
+        self.misses = 0
+        """Number of lookups which found no cached path."""
+        self.memory_bytes = 0
+        """Memory used by cached paths' location arrays, in bytes."""
+        self._paths: dict[_Key, Path] = {}
+        self._version = grid.version
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups which found a cached path; 0 if none yet."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    def get(self, start: int, goal: int, search: Hashable) -> Path | None:
+        """Return the cached path between flat array indices, or None if not cached.
+
+        Parameters
+        ----------
+        search
+            Identifies how the path was found, e.g. search function, heuristic and
+            frontier, as given to `PathCache.put()`.
+        """
+        self._drop_outdated()
+        key = (start, goal, self._version, self.grid.prefer_traversed_factor, search)
+        path = self._paths.pop(key, None)
+        if path is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # re-insert as most recently used
+        self._paths[key] = path
+        return path
+
+    def put(self, start: int, goal: int, search: Hashable, path: Path) -> None:
+        """Cache a path between flat array indices, evicting the least recently used
+        paths to stay within limits.
+        """
+        self._drop_outdated()
+        key = (start, goal, self._version, self.grid.prefer_traversed_factor, search)
+        size = sys.getsizeof(path.indices)
+        if self.max_size <= 0 or size > self.max_bytes:
+            return
+        previous = self._paths.pop(key, None)
+        if previous is not None:
+            self.memory_bytes -= sys.getsizeof(previous.indices)
+        self._paths[key] = path
+        self.memory_bytes += size
+        while len(self._paths) > self.max_size or self.memory_bytes > self.max_bytes:
+            evicted = self._paths.pop(next(iter(self._paths)))
+            self.memory_bytes -= sys.getsizeof(evicted.indices)
+
+    def clear(self) -> None:
+        """Remove all cached paths. Hit and miss counts are kept."""
+        self._paths.clear()
+        self.memory_bytes = 0
+
+    def _drop_outdated(self) -> None:
+        """Remove all cached paths if the grid has changed since they were found."""
+        version = self.grid.version
+        if version != self._version:
+            self.clear()
+            self._version = version
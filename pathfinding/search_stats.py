@@ -0,0 +1,25 @@
+"""Module containing `SearchStats` class."""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class SearchStats:
+    """Measurements of the work done by a search.
+
+    Only recorded when requested, e.g. by `.agent.Agent.a_star_search()` with
+    `collect_stats=True`; searches without them do no extra work.
+    """
+
+    nodes_expanded: int = 0
+    """Locations removed from the frontier."""
+    nodes_pushed: int = 0
+    """Locations added to the frontier, including those already queued."""
+    stale_pops: int = 0
+    """Outdated frontier entries discarded, for frontiers with lazy deletion."""
+    peak_frontier_size: int = 0
+    """Largest number of entries in any frontier, including outdated entries."""
+    search_ns: int = 0
+    """Nanoseconds taken by the whole search, including reconstruction."""
+    reconstruction_ns: int = 0
+    """Nanoseconds taken to reconstruct the path once found."""
@@ -0,0 +1,23 @@
+"""Helpers for checking paths planned for several agents."""
+
+from pathfinding.path import Path
+
+
+def conflict_count(paths: list[Path]) -> int:
+    """Count agents sharing a location, or swapping locations, at any timestep.
+
+    Agents stay at the end of their path once there.
+    """
+    conflict_count = 0
+    for timestep in range(max(len(path) for path in paths)):
+        locations = [path[min(timestep, len(path) - 1)] for path in paths]
+        conflict_count += len(locations) - len(set(locations))
+        if timestep:
+            moves = {
+                (path[min(timestep - 1, len(path) - 1)], location)
+                for path, location in zip(paths, locations, strict=True)
+            }
+            conflict_count += sum(
+                1 for move in moves if move[0] != move[1] and move[::-1] in moves
+            )
+    return conflict_count
@@ -1,10 +1,15 @@
 """Tests for Agent class."""
 
+import itertools
+import math
+import random
+
 import pytest
 
 from pathfinding.agent import Agent
 from pathfinding.grid import Grid
 from pathfinding.grid_ref import GridRef
+from pathfinding.heuristics import Heuristic, zero
 
 
 def test_create_happy_path() -> None:
@@ -51,15 +56,17 @@ def test_uniform_cost_search__happy_path() -> None:
     search = agent0.uniform_cost_search()
 
     # assert
-    assert search == {
+    assert search == [
         GridRef(0, 0),
         GridRef(1, 1),
         GridRef(2, 2),
-    }
+    ]
+    assert search.cost == pytest.approx(2 * math.sqrt(2))
+    assert agent0.path_to_goal == search
 
 
 def test_uniform_cost_search__start_is_untraversable() -> None:
-    """Test that empty `set` is returned when start is untraversable."""
+    """Test that empty path is returned when start is untraversable."""
     # arrange
     grid0 = Grid(3, 3)
     grid0.untraversable_locations.add(GridRef(1, 2))
@@ -73,11 +80,11 @@ def test_uniform_cost_search__start_is_untraversable() -> None:
     search = agent0.uniform_cost_search()
 
     # assert
-    assert search == set()
+    assert search == []
 
 
 def test_uniform_cost_search__goal_is_untraversable() -> None:
-    """Test that empty `set` is returned when goal is untraversable."""
+    """Test that empty path is returned when goal is untraversable."""
     # arrange
     grid0 = Grid(3, 3)
     grid0.untraversable_locations.add(GridRef(3, 3))
@@ -91,11 +98,11 @@ def test_uniform_cost_search__goal_is_untraversable() -> None:
     search = agent0.uniform_cost_search()
 
     # assert
-    assert search == set()
+    assert search == []
 
 
 def test_uniform_cost_search__no_path() -> None:
-    """Test that empty `set` is returned when no path to goal."""
+    """Test that empty path is returned when no path to goal."""
     # arrange
     grid0 = Grid(3, 3)
     grid0.set_untraversable_area(
@@ -112,4 +119,296 @@ def test_uniform_cost_search__no_path() -> None:
     search = agent0.uniform_cost_search()
 
     # assert
-    assert search == set()
+    assert search == []
+
+
+def test_a_star_search__happy_path() -> None:
+    """Test that a trivial search is calculated correctly."""
+    # arrange
+    grid0 = Grid(3, 3)
+    agent0 = Agent(
+        grid0,
+        GridRef(0, 0),
+    )
+    agent0.goal = GridRef(2, 2)
+
+    # act
+    search = agent0.a_star_search()
+
+    # assert
+    assert search == [
+        GridRef(0, 0),
+        GridRef(1, 1),
+        GridRef(2, 2),
+    ]
+
+
+def test_a_star_search__no_diagonal_moves() -> None:
+    """Test that a search without diagonal moves has the expected length."""
+    # arrange
+    grid0 = Grid(3, 3, allow_diagonal_moves=False)
+    agent0 = Agent(
+        grid0,
+        GridRef(0, 0),
+    )
+    agent0.goal = GridRef(2, 2)
+
+    # act
+    search = agent0.a_star_search()
+
+    # assert
+    assert len(search) == 5
+    assert GridRef(1, 1) not in search or GridRef(0, 1) not in search
+
+
+def test_a_star_search__same_length_as_uniform_cost_search() -> None:
+    """Test that A* finds a path as short as uniform cost search around a wall."""
+    # arrange
+    grid0 = Grid(10, 10, prefer_traversed_factor=0.5)
+    grid0.set_untraversable_area(
+        GridRef(4, 0),
+        GridRef(5, 8),
+    )
+    grid0.shared_path_locations.update({GridRef(x, 9) for x in range(10)})
+    agent0 = Agent(
+        grid0,
+        GridRef(0, 0),
+    )
+    agent0.goal = GridRef(9, 0)
+
+    # act
+    ucs_search = agent0.uniform_cost_search()
+    a_star_search = agent0.a_star_search()
+
+    # assert
+    assert len(a_star_search) == len(ucs_search)
+
+
+def test_a_star_search__no_path() -> None:
+    """Test that empty path is returned when no path to goal."""
+    # arrange
+    grid0 = Grid(4, 4)
+    grid0.set_untraversable_area(
+        GridRef(2, 0),
+        GridRef(3, 4),
+    )
+    agent0 = Agent(
+        grid0,
+        GridRef(0, 0),
+    )
+    agent0.goal = GridRef(3, 3)
+
+    # act
+    search = agent0.a_star_search()
+
+    # assert
+    assert search == []
+
+
+def test_uniform_cost_search__prefer_traversed() -> None:
+    """Test that search prefers a longer path over shared path locations."""
+    # arrange
+    grid0 = Grid(5, 3, allow_diagonal_moves=False, prefer_traversed_factor=0.9)
+    grid0.shared_path_locations.update(
+        {GridRef(0, 1), GridRef(0, 2), GridRef(1, 2), GridRef(2, 2), GridRef(2, 1)}
+    )
+    agent0 = Agent(
+        grid0,
+        GridRef(0, 0),
+    )
+    agent0.goal = GridRef(2, 0)
+
+    # act
+    search = agent0.uniform_cost_search()
+
+    # assert
+    assert GridRef(1, 0) not in search
+    assert len(search) == 7
+
+
+def test_uniform_cost_search__indexed_frontier() -> None:
+    """Test that search with an indexed priority queue finds the same path."""
+    # arrange
+    grid0 = Grid(10, 10)
+    grid0.set_untraversable_area(
+        GridRef(4, 0),
+        GridRef(5, 8),
+    )
+    agent0 = Agent(
+        grid0,
+        GridRef(0, 0),
+    )
+    agent0.goal = GridRef(9, 0)
+
+    # act
+    heap_search = agent0.uniform_cost_search()
+    indexed_search = agent0.uniform_cost_search(frontier="indexed")
+
+    # assert
+    assert indexed_search == heap_search
+
+
+def test_cost_field_path() -> None:
+    """Test that a path read from a cost field is calculated correctly."""
+    # arrange
+    grid0 = Grid(3, 3)
+    agent0 = Agent(
+        grid0,
+        GridRef(0, 0),
+    )
+    agent0.goal = GridRef(2, 2)
+
+    # act
+    path = agent0.cost_field_path()
+
+    # assert
+    assert path == [
+        GridRef(0, 0),
+        GridRef(1, 1),
+        GridRef(2, 2),
+    ]
+    assert agent0.path_to_goal == path
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("heuristic", [None, zero])
+def test_bidirectional_search__same_cost_as_uniform_cost_search(
+    seed: int, heuristic: Heuristic | None
+) -> None:
+    """Test that bidirectional search finds paths as cheap as uniform cost search on
+    random grids.
+    """
+    # arrange
+    rng = random.Random(seed)
+    grid0 = Grid(
+        rng.randint(2, 16),
+        rng.randint(2, 16),
+        allow_diagonal_moves=rng.random() < 0.5,
+        prefer_traversed_factor=rng.choice([-1.0, 0, 0.5, 0.9]),
+    )
+    cell_count = grid0.size_x * grid0.size_y
+    grid0.untraversable_locations = {
+        GridRef(rng.randrange(grid0.size_x), rng.randrange(grid0.size_y))
+        for _ in range(cell_count // 4)
+    }
+    grid0.shared_path_locations = {
+        GridRef(rng.randrange(grid0.size_x), rng.randrange(grid0.size_y))
+        for _ in range(cell_count // 4)
+    }
+    agent0 = Agent(
+        grid0,
+        GridRef(rng.randrange(grid0.size_x), rng.randrange(grid0.size_y)),
+    )
+    agent0.goal = GridRef(rng.randrange(grid0.size_x), rng.randrange(grid0.size_y))
+
+    # act
+    ucs_search = agent0.uniform_cost_search()
+    bidirectional_search = agent0.bidirectional_search(heuristic)
+
+    # assert
+    assert bool(bidirectional_search) == bool(ucs_search)
+    assert bidirectional_search.cost == pytest.approx(ucs_search.cost)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_searches__penalised_shared_path(seed: int) -> None:
+    """Test that A* and incremental searches find paths as cheap as uniform cost
+    search where a negative prefer traversed factor penalises shared path locations.
+    """
+    # arrange
+    rng = random.Random(seed)
+    grid0 = Grid(12, 12, prefer_traversed_factor=-1.0)
+    grid0.untraversable_locations = {
+        GridRef(rng.randrange(12), rng.randrange(12)) for _ in range(30)
+    }
+    grid0.shared_path_locations = {
+        GridRef(rng.randrange(12), rng.randrange(12)) for _ in range(50)
+    }
+    agent0 = Agent(grid0, GridRef(rng.randrange(12), rng.randrange(12)))
+    agent0.goal = GridRef(rng.randrange(12), rng.randrange(12))
+
+    # act
+    ucs_search = agent0.uniform_cost_search()
+    a_star_search = agent0.a_star_search()
+    incremental_search = agent0.incremental_search()
+
+    # assert
+    assert bool(a_star_search) == bool(incremental_search) == bool(ucs_search)
+    assert a_star_search.cost == pytest.approx(ucs_search.cost)
+    assert incremental_search.cost == pytest.approx(ucs_search.cost)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_jump_point_search__same_cost_as_uniform_cost_search(seed: int) -> None:
+    """Test that jump point search finds paths as cheap as uniform cost search on
+    random grids.
+    """
+    # arrange
+    rng = random.Random(seed)
+    grid0 = Grid(rng.randint(2, 24), rng.randint(2, 24))
+    cell_count = grid0.size_x * grid0.size_y
+    grid0.untraversable_locations = {
+        GridRef(rng.randrange(grid0.size_x), rng.randrange(grid0.size_y))
+        for _ in range(int(cell_count * rng.random() / 2))
+    }
+    agent0 = Agent(
+        grid0,
+        GridRef(rng.randrange(grid0.size_x), rng.randrange(grid0.size_y)),
+    )
+    agent0.goal = GridRef(rng.randrange(grid0.size_x), rng.randrange(grid0.size_y))
+
+    # act
+    ucs_search = agent0.uniform_cost_search()
+    jps_search = agent0.jump_point_search()
+
+    # assert
+    assert bool(jps_search) == bool(ucs_search)
+    assert jps_search.cost == pytest.approx(ucs_search.cost)
+    assert all(
+        max(abs(a.x - b.x), abs(a.y - b.y)) == 1
+        for a, b in itertools.pairwise(jps_search)
+    )
+
+
+def test_jump_point_search__falls_back_when_costs_not_uniform() -> None:
+    """Test that jump point search falls back to A* when traversed locations are
+    preferred.
+    """
+    # arrange
+    grid0 = Grid(5, 3, allow_diagonal_moves=True, prefer_traversed_factor=0.9)
+    grid0.shared_path_locations.update(
+        {GridRef(0, 1), GridRef(0, 2), GridRef(1, 2), GridRef(2, 2), GridRef(2, 1)}
+    )
+    agent0 = Agent(
+        grid0,
+        GridRef(0, 0),
+    )
+    agent0.goal = GridRef(2, 0)
+
+    # act
+    search = agent0.jump_point_search()
+
+    # assert
+    assert search == agent0.a_star_search()
+    assert GridRef(1, 0) not in search
+
+
+@pytest.mark.parametrize("search_name", ["uniform_cost_search", "bidirectional_search"])
+def test_collect_stats(search_name: str) -> None:
+    """Test that search stats are recorded only when requested."""
+    # arrange
+    grid0 = Grid(10, 10)
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(9, 9)
+    search = getattr(agent0, search_name)
+
+    # act
+    path_without_stats = search()
+    path = search(collect_stats=True)
+
+    # assert
+    assert path_without_stats.stats is None
+    assert path.stats is not None
+    assert 0 < path.stats.nodes_expanded <= path.stats.nodes_pushed
+    assert path.stats.peak_frontier_size > 0
+    assert 0 < path.stats.reconstruction_ns <= path.stats.search_ns
@@ -0,0 +1,64 @@
+"""Tests for AnimationRecorder class."""
+
+import io
+from pathlib import Path
+
+from PIL import Image, ImageSequence
+
+from pathfinding.agent import Agent
+from pathfinding.animation import AnimationRecorder
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+from pathfinding.image_renderer import GridRenderer
+
+
+def test_gif_frames_match_renders(tmp_path: Path) -> None:
+    """Test that each GIF frame matches a render of the grid when recorded."""
+    # arrange
+    grid0 = Grid(8, 6)
+    agent = Agent(grid0, GridRef(0, 0))
+    agent.goal = GridRef(7, 5)
+    path = agent.a_star_search()
+    filename = tmp_path / "run.gif"
+    expected_frames = []
+
+    # act
+    with AnimationRecorder(grid0, str(filename), scale=2) as recorder:
+        for location in path:
+            agent.location = location
+            grid0.shared_path_locations.add(location)
+            recorder.record_frame()
+            expected_frames.append(GridRenderer(grid0, scale=2).image.tobytes())
+        recorder.record_frame()  # unchanged
+        expected_frames.append(expected_frames[-1])
+
+    # assert
+    with Image.open(filename) as animation:
+        frames = [
+            frame.convert("RGB").tobytes()
+            for frame in ImageSequence.Iterator(animation)
+        ]
+    assert frames == expected_frames
+
+
+def test_raw_frames() -> None:
+    """Test that raw frames are written one after another, as RGB bytes."""
+    # arrange
+    grid0 = Grid(5, 4)
+    agent = Agent(grid0, GridRef(0, 0))
+    stream = io.BytesIO()
+
+    # act
+    recorder = AnimationRecorder(grid0, stream, animation_format="raw", scale=3)
+    recorder.record_frame()
+    agent.location = GridRef(4, 3)
+    recorder.record_frame()
+    recorder.close()
+
+    # assert
+    frame_size = 15 * 12 * 3
+    assert recorder.frame_count == 2
+    assert len(stream.getvalue()) == 2 * frame_size
+    assert (
+        stream.getvalue()[frame_size:] == GridRenderer(grid0, scale=3).image.tobytes()
+    )
@@ -0,0 +1,127 @@
+"""Tests for ConnectedComponents class."""
+
+import random
+
+import pytest
+
+from pathfinding.agent import Agent
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+
+
+def _reachable(grid0: Grid, start: GridRef) -> set[GridRef]:
+    """Return every location reachable from `start`, by flood fill."""
+    reached = {start}
+    to_visit = [start]
+    while to_visit:
+        for neighbour in grid0.neighbours(to_visit.pop()):
+            if neighbour not in reached:
+                reached.add(neighbour)
+                to_visit.append(neighbour)
+    return reached
+
+
+@pytest.mark.parametrize("allow_diagonal_moves", [True, False])
+def test_components_match_flood_fill(*, allow_diagonal_moves: bool) -> None:
+    """Test that locations share a component exactly when reachable from each other,
+    as single locations are blocked and unblocked.
+    """
+    # arrange
+    random.seed(0)
+    grid0 = Grid(15, 10, allow_diagonal_moves=allow_diagonal_moves)
+    grid0.untraversable_locations = {
+        grid0.random_location(allow_untraversable=True) for _ in range(50)
+    }
+    components = grid0.components
+
+    for _ in range(40):
+        # act
+        location = grid0.random_location(allow_untraversable=True)
+        if location in grid0.untraversable_locations:
+            grid0.untraversable_locations.discard(location)
+        else:
+            grid0.untraversable_locations.add(location)
+        start = grid0.random_location()
+
+        # assert
+        reachable = _reachable(grid0, start)
+        for y in range(grid0.size_y):
+            for x in range(grid0.size_x):
+                assert components.connected(start, GridRef(x, y)) == (
+                    GridRef(x, y) in reachable
+                )
+
+
+def test_unblocking_merges_without_relabelling() -> None:
+    """Test that opening a gap in a wall joins components incrementally."""
+    # arrange
+    grid0 = Grid(9, 5)
+    grid0.set_untraversable_area(GridRef(4, 0), GridRef(5, 5))
+    components = grid0.components
+    separated = components.connected(GridRef(0, 0), GridRef(8, 0))
+
+    # act
+    grid0.untraversable_locations.discard(GridRef(4, 2))
+
+    # assert
+    assert not separated
+    assert components.connected(GridRef(0, 0), GridRef(8, 0))
+    assert components.relabel_count == 1
+
+
+def test_blocking_relabels_only_when_splitting() -> None:
+    """Test that blocking a location relabels only if its neighbours may be split."""
+    # arrange
+    grid0 = Grid(9, 5)
+    components = grid0.components
+    components.connected(GridRef(0, 0), GridRef(8, 0))
+
+    # act
+    grid0.untraversable_locations.add(GridRef(2, 2))
+    open_area_relabel_count = components.relabel_count
+    grid0.set_untraversable_area(GridRef(4, 0), GridRef(5, 4))
+    grid0.untraversable_locations.add(GridRef(4, 4))
+    connected = components.connected(GridRef(0, 0), GridRef(8, 0))
+
+    # assert
+    assert open_area_relabel_count == 1
+    assert not connected
+    assert components.relabel_count == 2
+
+
+def test_blocking_without_diagonals_relabels_only_when_splitting() -> None:
+    """Test that blocking isolated locations on a grid without diagonal moves keeps
+    labels, as their neighbours stay connected around the corners.
+    """
+    # arrange
+    grid0 = Grid(50, 50, allow_diagonal_moves=False)
+    components = grid0.components
+    components.connected(GridRef(0, 0), GridRef(49, 49))
+
+    # act
+    for i in range(10):
+        grid0.untraversable_locations.add(GridRef(4 * i + 2, 4 * i + 3))
+    connected = components.connected(GridRef(0, 0), GridRef(49, 49))
+
+    # assert
+    assert connected
+    assert components.relabel_count == 1
+
+
+def test_search_rejects_other_component() -> None:
+    """Test that searches for a goal in another component find no path, without
+    expanding any location.
+    """
+    # arrange
+    grid0 = Grid(20, 20)
+    grid0.set_untraversable_area(GridRef(10, 0), GridRef(11, 20))
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(19, 19)
+
+    # act
+    path = agent0.uniform_cost_search(collect_stats=True)
+
+    # assert
+    assert path == []
+    assert path.stats is not None
+    assert path.stats.nodes_expanded == 0
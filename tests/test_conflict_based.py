@@ -0,0 +1,125 @@
+"""Tests for ConflictBasedSolver class."""
+
+import itertools
+import random
+
+from pathfinding.agent import Agent
+from pathfinding.conflict_based import ConflictBasedSolver
+from pathfinding.cooperative import CooperativePlanner
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+from tests._paths import conflict_count
+
+
+def _agents(grid0: Grid, count: int) -> list[Agent]:
+    """Create agents at random locations, with random goals."""
+    locations = random.sample(
+        [
+            GridRef(x, y)
+            for x, y in itertools.product(range(grid0.size_x), range(grid0.size_y))
+            if grid0.is_traversable(GridRef(x, y))
+        ],
+        count * 2,
+    )
+    agents = [Agent(grid0, location) for location in locations[:count]]
+    for agent, goal in zip(agents, locations[count:], strict=True):
+        agent.goal = goal
+    return agents
+
+
+def test_paths_collision_free_and_cheapest() -> None:
+    """Test that agents reach their goals without sharing or swapping locations, at
+    no more total cost than planning one agent at a time.
+    """
+    # arrange
+    random.seed(0)
+    grid0 = Grid(10, 10)
+    grid0.set_untraversable_area(GridRef(4, 0), GridRef(6, 7))
+    agents = _agents(grid0, 8)
+    cooperative_paths = CooperativePlanner(grid0, window=32).plan(agents)
+    solver = ConflictBasedSolver(grid0)
+
+    # act
+    paths = solver.solve(agents)
+
+    # assert
+    assert solver.solved
+    assert solver.conflict_count == 0
+    assert conflict_count(list(paths.values())) == 0
+    for agent, path in paths.items():
+        assert path[0] == agent.location
+        assert path[-1] == agent.goal
+        assert agent.path_to_goal is path
+    assert sum(path.cost for path in paths.values()) <= sum(
+        path.cost for path in cooperative_paths.values()
+    )
+
+
+def test_agents_pass_in_corridor() -> None:
+    """Test that agents swapping ends of a corridor with a passing place take the
+    cheapest plan: one steps aside while the other passes.
+    """
+    # arrange
+    grid0 = Grid(5, 2, allow_diagonal_moves=False)
+    grid0.set_untraversable_area(GridRef(0, 1), GridRef(5, 2))
+    grid0.untraversable_locations.discard(GridRef(2, 1))
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(4, 0)
+    agent1 = Agent(grid0, GridRef(4, 0))
+    agent1.goal = GridRef(0, 0)
+    solver = ConflictBasedSolver(grid0)
+
+    # act
+    paths = solver.solve([agent0, agent1])
+
+    # assert
+    assert solver.solved
+    assert conflict_count(list(paths.values())) == 0
+    # one agent steps aside and back, while the other waits once to let it
+    assert sum(path.cost for path in paths.values()) == (4 + 2) + (4 + 1)
+    assert solver.expanded_count > 0
+    assert solver.generated_count > solver.expanded_count
+
+
+def test_budget_returns_best_so_far() -> None:
+    """Test that running out of nodes returns paths for every agent, reporting the
+    conflicts left.
+    """
+    # arrange
+    random.seed(1)
+    grid0 = Grid(6, 6)
+    agents = _agents(grid0, 12)
+    solver = ConflictBasedSolver(grid0, max_nodes=1)
+
+    # act
+    paths = solver.solve(agents)
+
+    # assert
+    assert solver.expanded_count == 1
+    assert not solver.solved
+    assert solver.conflict_count > 0
+    for agent, path in paths.items():
+        assert path[0] == agent.location
+        assert path[-1] == agent.goal
+
+
+def test_unreachable_goal_stays_aside() -> None:
+    """Test that an agent whose goal can't be reached stays put, moving aside only to
+    let another agent pass.
+    """
+    # arrange
+    grid0 = Grid(3, 3)
+    grid0.set_untraversable_area(GridRef(0, 2), GridRef(3, 3))
+    grid0.untraversable_locations.add(GridRef(2, 1))
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(2, 0)
+    agent1 = Agent(grid0, GridRef(1, 0))
+    agent1.goal = GridRef(2, 2)
+
+    # act
+    paths = ConflictBasedSolver(grid0).solve([agent0, agent1])
+
+    # assert
+    assert conflict_count(list(paths.values())) == 0
+    assert paths[agent0][-1] == agent0.goal
+    assert paths[agent1][0] == paths[agent1][-1] == agent1.location
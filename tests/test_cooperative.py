@@ -0,0 +1,94 @@
+"""Tests for CooperativePlanner class."""
+
+import itertools
+import random
+
+import pytest
+
+from pathfinding.agent import Agent
+from pathfinding.cooperative import CooperativePlanner
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+from tests._paths import conflict_count
+
+
+def test_paths_collision_free() -> None:
+    """Test that agents reach their goals without sharing or swapping locations."""
+    # arrange
+    random.seed(0)
+    grid0 = Grid(16, 16)
+    grid0.set_untraversable_area(GridRef(6, 0), GridRef(10, 12))
+    locations = random.sample(
+        [
+            GridRef(x, y)
+            for x, y in itertools.product(range(16), repeat=2)
+            if grid0.is_traversable(GridRef(x, y))
+        ],
+        40,
+    )
+    agents = [Agent(grid0, location) for location in locations[:20]]
+    for agent, goal in zip(agents, locations[20:], strict=True):
+        agent.goal = goal
+
+    # act
+    paths = CooperativePlanner(grid0, window=8).plan(agents)
+
+    # assert
+    assert conflict_count(list(paths.values())) == 0
+    for agent, path in paths.items():
+        assert path[0] == agent.location
+        assert path[-1] == agent.goal
+        assert agent.path_to_goal is path
+        for location1, location2 in itertools.pairwise(path):
+            assert location2 == location1 or location2 in grid0.neighbours(location1)
+
+
+def test_agents_give_way_in_corridor() -> None:
+    """Test that agents heading opposite ways along a corridor pass each other, using
+    a side pocket.
+    """
+    # arrange
+    grid0 = Grid(7, 2, allow_diagonal_moves=False)
+    grid0.set_untraversable_area(GridRef(0, 1), GridRef(4, 2))
+    grid0.set_untraversable_area(GridRef(5, 1), GridRef(7, 2))
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(6, 0)
+    agent1 = Agent(grid0, GridRef(6, 0))
+    agent1.goal = GridRef(0, 0)
+
+    # act
+    planner = CooperativePlanner(grid0, window=8)
+    paths = planner.plan([agent0, agent1])
+
+    # assert
+    assert conflict_count(list(paths.values())) == 0
+    assert planner.blocked_count == 0
+    assert paths[agent0] == [GridRef(x, 0) for x in range(7)]
+    assert GridRef(4, 1) in paths[agent1]
+    assert paths[agent1][-1] == GridRef(0, 0)
+    assert paths[agent1].cost > 6
+
+
+def test_unreachable_goal() -> None:
+    """Test that an agent whose goal can't be reached stays where it is."""
+    # arrange
+    grid0 = Grid(5, 5)
+    grid0.set_untraversable_area(GridRef(2, 0), GridRef(3, 5))
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(4, 4)
+
+    # act
+    paths = CooperativePlanner(grid0).plan([agent0])
+
+    # assert
+    assert paths[agent0] == [GridRef(0, 0)]
+
+
+def test_invalid_window() -> None:
+    """Test that the window must cover at least two timesteps."""
+    # arrange
+    grid0 = Grid(4, 4)
+
+    # act, assert
+    with pytest.raises(ValueError, match="Window"):
+        CooperativePlanner(grid0, window=1)
@@ -0,0 +1,77 @@
+"""Tests for CostField class."""
+
+import math
+
+import pytest
+
+from pathfinding.agent import Agent
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+
+
+def test_costs_match_searches() -> None:
+    """Test that cost field paths cost the same as uniform cost search paths."""
+    # arrange
+    grid0 = Grid(10, 10, prefer_traversed_factor=0.5)
+    grid0.set_untraversable_area(GridRef(4, 0), GridRef(5, 8))
+    grid0.shared_path_locations.update({GridRef(x, 9) for x in range(10)})
+    goal = GridRef(9, 0)
+    agents = [Agent(grid0, GridRef(x, y)) for x, y in [(0, 0), (3, 5), (6, 9)]]
+
+    # act
+    cost_field = grid0.cost_field(goal)
+
+    # assert
+    for agent in agents:
+        agent.goal = goal
+        search = agent.uniform_cost_search()
+        path = cost_field.path(agent.location)
+        assert path.cost == pytest.approx(search.cost)
+        assert path[0] == agent.location
+        assert path[-1] == goal
+        assert cost_field.cost(agent.location) == pytest.approx(search.cost)
+
+
+def test_next_step() -> None:
+    """Test that next step is towards the goal."""
+    # arrange
+    grid0 = Grid(5, 5)
+
+    # act
+    cost_field = grid0.cost_field(GridRef(4, 4))
+
+    # assert
+    assert cost_field.next_step(GridRef(0, 0)) == GridRef(1, 1)
+    assert cost_field.next_step(GridRef(4, 4)) is None
+
+
+def test_no_path() -> None:
+    """Test that locations which can't reach the goal have infinite cost."""
+    # arrange
+    grid0 = Grid(5, 5)
+    grid0.set_untraversable_area(GridRef(2, 0), GridRef(3, 5))
+
+    # act
+    cost_field = grid0.cost_field(GridRef(4, 4))
+
+    # assert
+    assert cost_field.cost(GridRef(0, 0)) == math.inf
+    assert cost_field.path(GridRef(0, 0)) == []
+
+
+def test_cached_until_grid_changes() -> None:
+    """Test that cost fields are cached per goal, and recalculated after changes."""
+    # arrange
+    grid0 = Grid(5, 5)
+    cost_field0 = grid0.cost_field(GridRef(4, 4))
+
+    # act
+    cost_field1 = grid0.cost_field(GridRef(4, 4))
+    grid0.untraversable_locations.add(GridRef(3, 3))
+    cost_field2 = grid0.cost_field(GridRef(4, 4))
+
+    # assert
+    assert cost_field1 is cost_field0
+    assert not cost_field0.is_current
+    assert cost_field2 is not cost_field0
+    assert cost_field2.next_step(GridRef(2, 2)) != GridRef(3, 3)
@@ -1,6 +1,13 @@
 """Tests for Grid class."""
 
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from pathfinding.agent import Agent
 from pathfinding.grid import Grid
+from pathfinding.grid_change import GridChange
 from pathfinding.grid_ref import GridRef
 
 
@@ -86,3 +93,390 @@ def test_untraversable_from_map() -> None:
         GridRef(1, 1),
         GridRef(2, 2),
     }
+
+
+def test_create_without_diagonal_moves() -> None:
+    """Test that Grid without diagonal moves only has cardinal directions."""
+    # arrange
+    grid0 = Grid(8, 7)
+
+    # act
+    grid1 = Grid(8, 7, allow_diagonal_moves=False)
+
+    # assert
+    assert len(grid0._directions) == 8
+    assert grid1._directions == {(-1, 0), (0, -1), (0, 1), (1, 0)}
+
+
+def test_untraversable_locations_view() -> None:
+    """Test that untraversable locations behave as a set backed by the grid array."""
+    # arrange
+    grid0 = Grid(4, 3)
+
+    # act
+    grid0.untraversable_locations.add(GridRef(3, 2))
+    grid0.untraversable_locations.add(GridRef(4, 2))  # out of bounds, ignored
+    grid0.untraversable_locations.update({GridRef(0, 0), GridRef(1, 0)})
+    grid0.untraversable_locations.discard(GridRef(1, 0))
+
+    # assert
+    assert grid0.untraversable_locations == {GridRef(0, 0), GridRef(3, 2)}
+    assert GridRef(3, 2) in grid0.untraversable_locations
+    assert GridRef(4, 2) not in grid0.untraversable_locations
+    assert grid0._untraversable.cells == bytearray([1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+
+
+def test_untraversable_locations_reassigned() -> None:
+    """Test that reassigning untraversable locations replaces them."""
+    # arrange
+    grid0 = Grid(4, 3)
+    grid0.untraversable_locations.add(GridRef(3, 2))
+
+    # act
+    grid0.untraversable_locations = {GridRef(1, 1)}
+
+    # assert
+    assert grid0.untraversable_locations == {GridRef(1, 1)}
+    assert not grid0.is_traversable(GridRef(1, 1))
+
+
+def test_set_untraversable_area_clipped_to_bounds() -> None:
+    """Test that an untraversable area is clipped to the grid."""
+    # arrange
+    grid0 = Grid(4, 3)
+
+    # act
+    grid0.set_untraversable_area(GridRef(2, -1), GridRef(6, 2))
+
+    # assert
+    assert grid0.untraversable_locations == {
+        GridRef(2, 0),
+        GridRef(3, 0),
+        GridRef(2, 1),
+        GridRef(3, 1),
+    }
+
+
+def test_index_and_location() -> None:
+    """Test conversion between locations and flat array indices."""
+    # arrange
+    grid0 = Grid(4, 3)
+
+    # act
+    index = grid0.index(GridRef(1, 2))
+
+    # assert
+    assert index == 9
+    assert grid0.location(index) == GridRef(1, 2)
+
+
+def test_plan_paths() -> None:
+    """Test that paths planned across worker processes match individual searches."""
+    # arrange
+    grid0 = Grid(10, 10)
+    grid0.set_untraversable_area(GridRef(4, 0), GridRef(5, 8))
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(9, 0)
+    agent1 = Agent(grid0, GridRef(9, 9))
+    agent1.goal = GridRef(0, 9)
+    agent2 = Agent(grid0, GridRef(2, 2))
+    agent2.goal = GridRef(4, 4)  # untraversable
+    expected = {agent: agent.a_star_search() for agent in (agent0, agent1, agent2)}
+
+    # act
+    paths = grid0.plan_paths([agent0, agent1, agent2], workers=2)
+
+    # assert
+    assert paths == expected
+    assert agent0.path_to_goal == expected[agent0]
+
+
+def test_plan_paths_workers_kept_and_refreshed() -> None:
+    """Test that worker processes are kept between calls, and plan on the grid as
+    changed since.
+    """
+    # arrange
+    grid0 = Grid(10, 10)
+    grid0.path_cache.max_size = 0
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(9, 0)
+    agent1 = Agent(grid0, GridRef(9, 9))
+    agent1.goal = GridRef(0, 9)
+    first_paths = grid0.plan_paths([agent0, agent1], workers=2)
+    worker_pool = grid0._worker_pool
+
+    # act
+    grid0.set_untraversable_area(GridRef(4, 0), GridRef(5, 8))
+    grid0.prefer_traversed_factor = 0.5
+    grid0.shared_path_locations.add(GridRef(5, 9))
+    paths = grid0.plan_paths([agent0, agent1], workers=2)
+
+    # assert
+    assert first_paths[agent0].cost == pytest.approx(9)
+    assert grid0._worker_pool is worker_pool
+    assert paths == {agent: agent.a_star_search() for agent in (agent0, agent1)}
+    assert paths[agent0].cost > first_paths[agent0].cost
+
+
+def test_version() -> None:
+    """Test that version is incremented by changes to locations only."""
+    # arrange
+    grid0 = Grid(4, 3)
+    version0 = grid0.version
+
+    # act
+    grid0.untraversable_locations.add(GridRef(1, 1))
+    version1 = grid0.version
+    grid0.untraversable_locations.add(GridRef(1, 1))  # no change
+    version2 = grid0.version
+    grid0.shared_path_locations.add(GridRef(2, 2))
+    version3 = grid0.version
+
+    # assert
+    assert version0 < version1 == version2 < version3
+
+
+def test_version__blocking_blocked_area() -> None:
+    """Test that making an already untraversable area untraversable changes nothing."""
+    # arrange
+    grid0 = Grid(10, 10)
+    grid0.set_untraversable_area(GridRef(2, 2), GridRef(5, 5))
+    version0 = grid0.version
+
+    # act
+    grid0.set_untraversable_area(GridRef(2, 2), GridRef(5, 5))
+    version1 = grid0.version
+    grid0.set_untraversable_area(GridRef(2, 4), GridRef(6, 5))
+    version2 = grid0.version
+
+    # assert
+    assert version1 == version0
+    assert version2 == version0 + 1
+
+
+def test_subscribe() -> None:
+    """Test that subscribers are notified of each change, with its version and
+    rectangle, until unsubscribed.
+    """
+    # arrange
+    grid0 = Grid(10, 5)
+    changes: list[GridChange] = []
+    grid0.subscribe(changes.append)
+
+    # act
+    grid0.untraversable_locations.add(GridRef(3, 1))
+    grid0.set_untraversable_area(GridRef(2, 2), GridRef(6, 4))
+    grid0.shared_path_locations = {GridRef(0, 0), GridRef(9, 4)}
+    grid0.unsubscribe(changes.append)
+    grid0.untraversable_locations.add(GridRef(0, 0))
+
+    # assert
+    assert changes[0] == GridChange("untraversable", 13, 14, 1, 10)
+    assert [(change.layer, change.box) for change in changes] == [
+        ("untraversable", (3, 1, 4, 2)),
+        ("untraversable", (2, 2, 6, 3)),
+        ("untraversable", (2, 3, 6, 4)),
+        ("shared_path", (0, 0, 10, 5)),
+    ]
+    assert [change.version for change in changes] == [1, 2, 3, 4]
+
+
+def test_subscriber_replans() -> None:
+    """Test that a subscriber searching the grid sees the change, as do later
+    searches.
+    """
+    # arrange
+    grid0 = Grid(5, 1)
+    grid0.untraversable_locations.add(GridRef(2, 0))
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(4, 0)
+    blocked_path = agent0.a_star_search()
+    replanned_lengths: list[int] = []
+    grid0.subscribe(lambda _: replanned_lengths.append(len(agent0.a_star_search())))
+
+    # act
+    grid0.untraversable_locations.discard(GridRef(2, 0))
+
+    # assert
+    assert blocked_path == []
+    assert replanned_lengths == [5]
+    assert len(agent0.a_star_search()) == 5
+
+
+def test_untraversable_from_map_changes() -> None:
+    """Test that setting locations from a map is one change per run of changed
+    locations in a row, and repeating it changes nothing.
+    """
+    # arrange
+    grid0 = Grid(10, 5)
+    grid0.untraversable_locations.add(GridRef(1, 1))
+    changes: list[GridChange] = []
+    grid0.subscribe(changes.append)
+    grid_map = [".X......XX", "XXX", "", "..X"]
+
+    # act
+    grid0.set_untraversable_from_map(grid_map)
+    grid0.set_untraversable_from_map(grid_map)
+
+    # assert
+    assert [(change.start, change.stop) for change in changes] == [
+        (1, 2),
+        (8, 10),
+        (10, 11),
+        (12, 13),
+        (32, 33),
+    ]
+    assert len(grid0.untraversable_locations) == 7
+
+
+def test_changes_since() -> None:
+    """Test that recent changes are listed, and None once forgotten."""
+    # arrange
+    grid0 = Grid(300, 1)
+    version0 = grid0.version
+    grid0.untraversable_locations.add(GridRef(0, 0))
+    version1 = grid0.version
+    grid0.untraversable_locations.add(GridRef(1, 0))
+
+    # act
+    recent_changes = grid0.changes_since(version1)
+    no_changes = grid0.changes_since(grid0.version)
+    for x in range(2, 300):
+        grid0.untraversable_locations.add(GridRef(x, 0))
+    forgotten_changes = grid0.changes_since(version0)
+
+    # assert
+    assert recent_changes is not None
+    assert [change.start for change in recent_changes] == [1]
+    assert no_changes == []
+    assert forgotten_changes is None
+
+
+def test_in_place_operator_keeps_locations() -> None:
+    """Test that in-place operators on location attributes update, rather than
+    replace, the locations.
+    """
+    # arrange
+    grid0 = Grid(4, 3)
+    grid0.shared_path_locations.add(GridRef(0, 0))
+
+    # act
+    grid0.shared_path_locations |= {GridRef(1, 1)}
+    grid0.untraversable_locations ^= {GridRef(2, 2)}
+
+    # assert
+    assert grid0.shared_path_locations == {GridRef(0, 0), GridRef(1, 1)}
+    assert grid0.untraversable_locations == {GridRef(2, 2)}
+
+
+def test_text_render() -> None:
+    """Test that text render shows untraversable locations, then each agent's path,
+    location and goal on top.
+    """
+    # arrange
+    grid0 = Grid(4, 3)
+    grid0.untraversable_locations.add(GridRef(1, 1))
+    agent = Agent(grid0, GridRef(0, 0))
+    agent.goal = GridRef(3, 0)
+    agent.a_star_search()
+
+    # act
+    text = grid0.text_render()
+
+    # assert
+    assert text == "\nA + + G \n· █ · · \n· · · · \n"
+
+
+@pytest.mark.parametrize("include_shared_path", [False, True])
+def test_save_load_round_trip(tmp_path: Path, *, include_shared_path: bool) -> None:
+    """Test that a loaded grid matches the saved grid."""
+    # arrange
+    grid0 = Grid(13, 5, allow_diagonal_moves=False, prefer_traversed_factor=0.25)
+    grid0.set_untraversable_area(GridRef(2, 1), GridRef(11, 3))
+    grid0.untraversable_locations.add(GridRef(12, 4))
+    if include_shared_path:
+        grid0.shared_path_locations.update({GridRef(0, 0), GridRef(1, 4)})
+    filename = str(tmp_path / "grid.bin")
+
+    # act
+    grid0.save(filename)
+    grid1 = Grid.load(filename)
+
+    # assert
+    assert (grid1.size_x, grid1.size_y) == (13, 5)
+    assert not grid1.allow_diagonal_moves
+    assert grid1.prefer_traversed_factor == 0.25
+    assert grid1.untraversable_locations == grid0.untraversable_locations
+    assert grid1.shared_path_locations == grid0.shared_path_locations
+
+
+def test_load_invalid_file(tmp_path: Path) -> None:
+    """Test that loading a file that isn't a grid file, or is truncated, fails."""
+    # arrange
+    not_grid_filename = tmp_path / "not_grid.bin"
+    not_grid_filename.write_bytes(b"not a grid file at all, but long enough")
+    truncated_filename = tmp_path / "truncated.bin"
+    Grid(100, 100).save(str(truncated_filename))
+    truncated_filename.write_bytes(truncated_filename.read_bytes()[:-1])
+
+    # act, assert
+    with pytest.raises(ValueError, match="not a grid file"):
+        Grid.load(str(not_grid_filename))
+    with pytest.raises(ValueError, match="truncated"):
+        Grid.load(str(truncated_filename))
+
+
+def test_set_untraversable_from_image() -> None:
+    """Test that dark pixels on the grid become untraversable locations."""
+    # arrange
+    grid0 = Grid(4, 3)
+    grid0.untraversable_locations.add(GridRef(3, 2))
+    image = Image.new("RGB", (5, 2), (255, 255, 255))
+    image.putpixel((0, 0), (0, 0, 0))
+    image.putpixel((2, 1), (100, 100, 100))
+    image.putpixel((1, 1), (200, 200, 200))  # light
+    image.putpixel((4, 0), (0, 0, 0))  # off grid
+
+    # act
+    grid0.set_untraversable_from_image(image)
+
+    # assert
+    assert grid0.untraversable_locations == {
+        GridRef(0, 0),
+        GridRef(2, 1),
+        GridRef(3, 2),
+    }
+
+
+def test_load_movingai_map(tmp_path: Path) -> None:
+    """Test that MovingAI map characters set untraversable locations."""
+    # arrange
+    filename = tmp_path / "test.map"
+    filename.write_text("type octile\nheight 2\nwidth 4\nmap\n.@T.\nGSWO\n")
+
+    # act
+    grid0 = Grid.load_movingai_map(str(filename))
+
+    # assert
+    assert (grid0.size_x, grid0.size_y) == (4, 2)
+    assert grid0.untraversable_locations == {
+        GridRef(1, 0),
+        GridRef(2, 0),
+        GridRef(2, 1),
+        GridRef(3, 1),
+    }
+
+
+def test_load_movingai_map_malformed(tmp_path: Path) -> None:
+    """Test that MovingAI maps with missing dimensions or wrong rows fail."""
+    # arrange
+    no_header_filename = tmp_path / "no_header.map"
+    no_header_filename.write_text("type octile\nmap\n..\n")
+    short_row_filename = tmp_path / "short_row.map"
+    short_row_filename.write_text("type octile\nheight 2\nwidth 2\nmap\n..\n.\n")
+
+    # act, assert
+    with pytest.raises(ValueError, match="width and height"):
+        Grid.load_movingai_map(str(no_header_filename))
+    with pytest.raises(ValueError, match="row 1"):
+        Grid.load_movingai_map(str(short_row_filename))
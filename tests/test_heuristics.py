@@ -0,0 +1,47 @@
+"""Tests for heuristic functions."""
+
+import math
+
+import pytest
+
+from pathfinding.heuristics import euclidean, manhattan, octile, zero
+
+
+@pytest.mark.parametrize(
+    ("x_dist", "y_dist", "expected"),
+    [
+        (0, 0, 0),
+        (3, 0, 3),
+        (0, 3, 3),
+        (2, 2, 2 * math.sqrt(2)),
+        (5, 2, 3 + 2 * math.sqrt(2)),
+    ],
+)
+def test_octile(x_dist: int, y_dist: int, expected: float) -> None:
+    """Test that octile distance is calculated correctly."""
+    # act, assert
+    assert octile(x_dist, y_dist) == pytest.approx(expected)
+
+
+def test_manhattan() -> None:
+    """Test that Manhattan distance is calculated correctly."""
+    # act, assert
+    assert manhattan(5, 2) == 7
+
+
+def test_euclidean() -> None:
+    """Test that Euclidean distance is calculated correctly."""
+    # act, assert
+    assert euclidean(3, 4) == 5
+
+
+def test_zero() -> None:
+    """Test that zero heuristic is always zero."""
+    # act, assert
+    assert zero(3, 4) == 0
+
+
+def test_admissible_ordering() -> None:
+    """Test that heuristics are ordered by how informed they are."""
+    # act, assert
+    assert zero(5, 2) <= euclidean(5, 2) <= octile(5, 2) <= manhattan(5, 2)
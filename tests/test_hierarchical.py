@@ -0,0 +1,196 @@
+"""Tests for HierarchicalPathfinder class."""
+
+import itertools
+import random
+
+import pytest
+
+from pathfinding.agent import Agent
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+from pathfinding.hierarchical import HierarchicalPathfinder
+
+
+@pytest.mark.parametrize(
+    ("allow_diagonal_moves", "prefer_traversed_factor"),
+    [(True, 0), (True, 0.5), (True, -1.0), (False, 0)],
+)
+def test_paths_valid_on_random_grid(
+    *, allow_diagonal_moves: bool, prefer_traversed_factor: float
+) -> None:
+    """Test that paths are found exactly when they exist, are made of valid moves,
+    and cost at least as much as the cheapest path.
+    """
+    # arrange
+    random.seed(0)
+    grid0 = Grid(
+        30,
+        20,
+        allow_diagonal_moves=allow_diagonal_moves,
+        prefer_traversed_factor=prefer_traversed_factor,
+    )
+    grid0.untraversable_locations = {
+        grid0.random_location(allow_untraversable=True) for _ in range(150)
+    }
+    grid0.shared_path_locations = {
+        grid0.random_location(allow_untraversable=True) for _ in range(100)
+    }
+    pathfinder = HierarchicalPathfinder(grid0, cluster_size=6)
+
+    for _ in range(50):
+        agent = Agent(grid0, grid0.random_location())
+        agent.goal = grid0.random_location()
+
+        # act
+        path = pathfinder.find_path(agent.location, agent.goal)
+
+        # assert
+        cheapest = agent.uniform_cost_search()
+        assert bool(path) == bool(cheapest)
+        if path:
+            assert path[0] == agent.location
+            assert path[-1] == agent.goal
+            assert path.cost == pytest.approx(
+                sum(grid0.cost(*move) for move in itertools.pairwise(path))
+            )
+            assert path.cost >= cheapest.cost - 1e-9
+
+
+def test_trivial_paths() -> None:
+    """Test paths to the start, untraversable locations and locations off the grid."""
+    # arrange
+    grid0 = Grid(10, 10)
+    grid0.untraversable_locations.add(GridRef(5, 5))
+    pathfinder = HierarchicalPathfinder(grid0, cluster_size=4)
+
+    # act
+    path_to_start = pathfinder.find_path(GridRef(1, 1), GridRef(1, 1))
+    path_to_untraversable = pathfinder.find_path(GridRef(1, 1), GridRef(5, 5))
+    path_off_grid = pathfinder.find_path(GridRef(1, 1), GridRef(10, 1))
+
+    # assert
+    assert path_to_start == [GridRef(1, 1)]
+    assert path_to_untraversable == []
+    assert path_off_grid == []
+
+
+def test_abstract_path() -> None:
+    """Test that the abstract path runs from start to goal via cluster transitions."""
+    # arrange
+    grid0 = Grid(12, 4)
+    pathfinder = HierarchicalPathfinder(grid0, cluster_size=4)
+
+    # act
+    abstract_path = pathfinder.abstract_path(GridRef(0, 0), GridRef(11, 0))
+
+    # assert
+    assert abstract_path[0] == GridRef(0, 0)
+    assert abstract_path[-1] == GridRef(11, 0)
+    assert GridRef(3, 2) in abstract_path
+    assert GridRef(8, 2) in abstract_path
+
+
+def test_only_changed_clusters_recalculated() -> None:
+    """Test that changing a cluster's interior recalculates only that cluster."""
+    # arrange
+    grid0 = Grid(32, 32)
+    pathfinder = HierarchicalPathfinder(grid0, cluster_size=8)
+    pathfinder.find_path(GridRef(0, 0), GridRef(31, 31))
+    initial_rebuild_count = pathfinder.rebuild_count
+
+    # act
+    grid0.set_untraversable_area(GridRef(10, 10), GridRef(13, 13))
+    pathfinder.find_path(GridRef(0, 0), GridRef(31, 31))
+
+    # assert
+    assert initial_rebuild_count == 16
+    assert pathfinder.rebuild_count == initial_rebuild_count + 1
+
+
+def test_only_clusters_with_changed_locations_recalculated() -> None:
+    """Test that loading a map with far apart untraversable locations recalculates
+    only the clusters containing them.
+    """
+    # arrange
+    grid0 = Grid(32, 32)
+    pathfinder = HierarchicalPathfinder(grid0, cluster_size=8)
+    pathfinder.find_path(GridRef(1, 1), GridRef(30, 30))
+    initial_rebuild_count = pathfinder.rebuild_count
+    grid_map = ["." * 32 for _ in range(32)]
+    grid_map[0] = "X" + "." * 31
+    grid_map[31] = "." * 31 + "X"
+
+    # act
+    grid0.set_untraversable_from_map(grid_map)
+    pathfinder.find_path(GridRef(1, 1), GridRef(30, 30))
+
+    # assert
+    assert pathfinder.rebuild_count == initial_rebuild_count + 2
+
+
+def test_path_avoids_new_wall() -> None:
+    """Test that paths found after a change avoid newly untraversable locations."""
+    # arrange
+    grid0 = Grid(16, 16)
+    pathfinder = HierarchicalPathfinder(grid0, cluster_size=4)
+    pathfinder.find_path(GridRef(0, 8), GridRef(15, 8))
+
+    # act
+    grid0.set_untraversable_area(GridRef(7, 0), GridRef(8, 14))
+    path = pathfinder.find_path(GridRef(0, 8), GridRef(15, 8))
+
+    # assert
+    assert path
+    assert not any(location in grid0.untraversable_locations for location in path)
+    assert GridRef(7, 15) in path
+
+
+@pytest.mark.parametrize(
+    ("grid_map", "goal"),
+    [
+        (["....X...", "...X...."], GridRef(7, 0)),
+        (
+            [
+                "...X....",
+                "...X....",
+                "...X....",
+                "....XXXX",
+                "XXXX....",
+                "...X....",
+                "...X....",
+                "...X....",
+            ],
+            GridRef(7, 7),
+        ),
+    ],
+)
+def test_diagonal_border_crossing(grid_map: list[str], goal: GridRef) -> None:
+    """Test that paths cross borders diagonally between untraversable corners,
+    including where four clusters meet.
+    """
+    # arrange
+    grid0 = Grid(len(grid_map[0]), len(grid_map))
+    grid0.set_untraversable_from_map(grid_map)
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = goal
+    pathfinder = HierarchicalPathfinder(grid0, cluster_size=4)
+
+    # act
+    path = pathfinder.find_path(GridRef(0, 0), goal)
+
+    # assert
+    assert path.cost == pytest.approx(agent0.a_star_search().cost)
+    assert all(
+        location2 in grid0.neighbours(location1)
+        for location1, location2 in itertools.pairwise(path)
+    )
+
+
+def test_invalid_cluster_size() -> None:
+    """Test that clusters must have a positive size."""
+    # arrange
+    grid0 = Grid(4, 4)
+
+    # act, assert
+    with pytest.raises(ValueError, match="Cluster size"):
+        HierarchicalPathfinder(grid0, cluster_size=0)
@@ -0,0 +1,69 @@
+"""Tests for GridRenderer class."""
+
+from pathlib import Path
+
+from PIL import Image
+
+from pathfinding._pygame_colordict import THECOLORS
+from pathfinding.agent import Agent
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+from pathfinding.image_renderer import GridRenderer
+
+
+def test_layer_colors(tmp_path: Path) -> None:
+    """Test that each location is coloured by its topmost layer, at scale."""
+    # arrange
+    grid0 = Grid(4, 3)
+    grid0.untraversable_locations = {GridRef(1, 0), GridRef(2, 0)}
+    grid0.shared_path_locations = {GridRef(2, 0), GridRef(0, 2), GridRef(1, 2)}
+    agent = Agent(grid0, GridRef(0, 2))
+    agent.goal = GridRef(3, 2)
+    filename = tmp_path / "grid.png"
+
+    # act
+    GridRenderer(grid0, scale=2).save(str(filename))
+
+    # assert
+    with Image.open(filename) as image:
+        assert image.size == (8, 6)
+        expected_colors = {
+            GridRef(0, 0): "grey50",
+            GridRef(1, 0): "grey40",
+            GridRef(2, 0): "goldenrod1",
+            GridRef(1, 2): "goldenrod1",
+            GridRef(0, 2): "green4",
+            GridRef(3, 2): "red2",
+        }
+        for location, color_name in expected_colors.items():
+            for dx in range(2):
+                for dy in range(2):
+                    assert (
+                        image.getpixel((2 * location.x + dx, 2 * location.y + dy))
+                        == THECOLORS[color_name][:3]
+                    )
+
+
+def test_update_matches_new_render(tmp_path: Path) -> None:
+    """Test that an update repaints only changed locations, matching a new render."""
+    # arrange
+    grid0 = Grid(6, 5)
+    agent = Agent(grid0, GridRef(0, 0))
+    agent.goal = GridRef(5, 4)
+    renderer = GridRenderer(grid0, scale=3)
+    agent.location = GridRef(1, 1)
+    grid0.untraversable_locations.add(GridRef(3, 3))
+    grid0.shared_path_locations.add(GridRef(2, 2))
+    updated_filename = tmp_path / "updated.png"
+    new_filename = tmp_path / "new.png"
+
+    # act
+    repainted_count = renderer.update()
+
+    # assert
+    assert repainted_count == 4
+    assert renderer.update() == 0
+    renderer.save(str(updated_filename))
+    GridRenderer(grid0, scale=3).save(str(new_filename))
+    with Image.open(updated_filename) as updated, Image.open(new_filename) as new:
+        assert updated.tobytes() == new.tobytes()
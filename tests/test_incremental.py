@@ -0,0 +1,125 @@
+"""Tests for IncrementalPlanner class, through Agent.incremental_search()."""
+
+import random
+
+import pytest
+
+from pathfinding.agent import Agent
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+
+
+@pytest.mark.parametrize(
+    ("allow_diagonal_moves", "prefer_traversed_factor"),
+    [(True, 0), (True, 0.5), (False, 0), (True, 1.5)],
+)
+def test_repaired_paths_cheapest(
+    *, allow_diagonal_moves: bool, prefer_traversed_factor: float
+) -> None:
+    """Test that paths cost the same as uniform cost search paths, as locations
+    change and the agent moves.
+    """
+    # arrange
+    random.seed(0)
+    grid0 = Grid(
+        20,
+        15,
+        allow_diagonal_moves=allow_diagonal_moves,
+        prefer_traversed_factor=prefer_traversed_factor,
+    )
+    grid0.untraversable_locations = {
+        grid0.random_location(allow_untraversable=True) for _ in range(60)
+    }
+    grid0.shared_path_locations = {
+        grid0.random_location(allow_untraversable=True) for _ in range(60)
+    }
+    agent = Agent(grid0, grid0.random_location())
+    agent.goal = grid0.random_location()
+
+    for _ in range(100):
+        location = grid0.random_location(allow_untraversable=True)
+        change = random.random()
+        if change < 0.4:
+            grid0.untraversable_locations.add(location)
+        elif change < 0.7:
+            grid0.untraversable_locations.discard(location)
+        elif change < 0.9:
+            grid0.shared_path_locations ^= {location}
+        else:
+            agent.location = grid0.random_location()
+
+        # act
+        path = agent.incremental_search()
+
+        # assert
+        cheapest = agent.uniform_cost_search()
+        assert bool(path) == bool(cheapest)
+        assert path.cost == pytest.approx(cheapest.cost)
+        if path:
+            assert path[0] == agent.location
+            assert path[-1] == agent.goal
+            assert not any(loc in grid0.untraversable_locations for loc in path)
+
+
+def test_repair_expands_fewer_locations() -> None:
+    """Test that repairing after a small change expands far fewer locations than the
+    first search.
+    """
+    # arrange
+    grid0 = Grid(64, 64)
+    agent = Agent(grid0, GridRef(0, 0))
+    agent.goal = GridRef(63, 40)
+    first_path = agent.incremental_search(collect_stats=True)
+    middle = first_path[len(first_path) // 2]
+
+    # act
+    grid0.set_untraversable_area(
+        GridRef(middle.x - 2, middle.y - 2), GridRef(middle.x + 2, middle.y + 2)
+    )
+    repaired_path = agent.incremental_search(collect_stats=True)
+
+    # assert
+    assert middle not in repaired_path
+    assert repaired_path.cost == pytest.approx(agent.uniform_cost_search().cost)
+    assert first_path.stats is not None
+    assert repaired_path.stats is not None
+    assert repaired_path.stats.nodes_expanded < first_path.stats.nodes_expanded / 2
+
+
+def test_moving_along_path_needs_no_search() -> None:
+    """Test that moving along the path reuses the previous search."""
+    # arrange
+    grid0 = Grid(20, 20)
+    agent = Agent(grid0, GridRef(0, 0))
+    agent.goal = GridRef(19, 10)
+    first_path = agent.incremental_search()
+
+    # act
+    agent.location = first_path[5]
+    path = agent.incremental_search(collect_stats=True)
+
+    # assert
+    assert path == first_path[5:]
+    assert path.stats is not None
+    assert path.stats.nodes_expanded == 0
+
+
+def test_no_path() -> None:
+    """Test that no path is found once the goal is walled off, nor to a goal off the
+    grid.
+    """
+    # arrange
+    grid0 = Grid(10, 10)
+    agent = Agent(grid0, GridRef(0, 0))
+    agent.goal = GridRef(9, 9)
+    agent.incremental_search()
+
+    # act
+    grid0.set_untraversable_area(GridRef(5, 0), GridRef(6, 10))
+    walled_off_path = agent.incremental_search()
+    agent.goal = GridRef(10, 10)
+    off_grid_path = agent.incremental_search()
+
+    # assert
+    assert walled_off_path == []
+    assert off_grid_path == []
@@ -0,0 +1,106 @@
+"""Tests for LandmarkTable class."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from pathfinding.agent import Agent
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+
+
+def _comb_grid() -> Grid:
+    """Create a grid with walls forcing a path back and forth across it."""
+    grid0 = Grid(30, 20)
+    for x in range(3, 30, 6):
+        grid0.set_untraversable_area(GridRef(x, 0), GridRef(x + 1, 17))
+        grid0.set_untraversable_area(GridRef(x + 3, 3), GridRef(x + 4, 20))
+    return grid0
+
+
+@pytest.mark.parametrize("allow_diagonal_moves", [True, False])
+def test_estimates_admissible(*, allow_diagonal_moves: bool) -> None:
+    """Test that estimates never exceed the cheapest path's cost."""
+    # arrange
+    random.seed(0)
+    grid0 = Grid(20, 15, allow_diagonal_moves=allow_diagonal_moves)
+    grid0.untraversable_locations = {
+        grid0.random_location(allow_untraversable=True) for _ in range(80)
+    }
+    goal = grid0.random_location()
+    cost_field = grid0.cost_field(goal)
+
+    # act
+    landmarks = grid0.precompute_landmarks(4)
+
+    # assert
+    assert len(set(landmarks.locations)) == 4
+    for _ in range(100):
+        location = grid0.random_location()
+        assert landmarks.estimate(location, goal) <= cost_field.cost(location)
+
+
+def test_landmark_search_expands_fewer() -> None:
+    """Test that landmark search finds paths as cheap as A* search, expanding fewer
+    locations where walls force detours.
+    """
+    # arrange
+    grid0 = _comb_grid()
+    grid0.precompute_landmarks()
+    agent0 = Agent(grid0, GridRef(14, 10))
+    agent0.goal = GridRef(29, 0)
+
+    # act
+    a_star_path = agent0.a_star_search(collect_stats=True)
+    landmark_path = agent0.landmark_search(collect_stats=True)
+
+    # assert
+    assert landmark_path.cost == pytest.approx(a_star_path.cost)
+    assert landmark_path.stats is not None
+    assert a_star_path.stats is not None
+    assert landmark_path.stats.nodes_expanded < a_star_path.stats.nodes_expanded / 2
+
+
+def test_out_of_date_table_ignored() -> None:
+    """Test that landmark search stays optimal after a wall opens, ignoring the
+    landmark table calculated before.
+    """
+    # arrange
+    grid0 = _comb_grid()
+    landmarks = grid0.precompute_landmarks()
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(6, 0)
+
+    # act
+    grid0.untraversable_locations.discard(GridRef(3, 0))
+    path = agent0.landmark_search()
+
+    # assert
+    assert not landmarks.is_current
+    assert path.cost == pytest.approx(6)
+
+
+def test_save_load_round_trip(tmp_path: Path) -> None:
+    """Test that loaded landmarks give the same estimates, only for the same map."""
+    # arrange
+    grid0 = _comb_grid()
+    landmarks = grid0.precompute_landmarks()
+    filename = str(tmp_path / "grid.landmarks")
+    grid1 = _comb_grid()
+    grid2 = _comb_grid()
+    grid2.untraversable_locations.discard(GridRef(3, 0))
+
+    # act
+    landmarks.save(filename)
+    loaded = grid1.load_landmarks(filename)
+
+    # assert
+    assert grid1.landmarks is loaded
+    assert loaded.locations == landmarks.locations
+    assert loaded.distances == landmarks.distances
+    assert loaded.estimate(GridRef(0, 0), GridRef(29, 19)) == landmarks.estimate(
+        GridRef(0, 0), GridRef(29, 19)
+    )
+    with pytest.raises(ValueError, match="different grid"):
+        grid2.load_landmarks(filename)
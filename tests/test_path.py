@@ -0,0 +1,42 @@
+"""Tests for Path class."""
+
+from pathfinding.grid_ref import GridRef
+from pathfinding.path import Path
+
+
+def test_create_happy_path() -> None:
+    """Test that Path is created as expected."""
+    # arrange
+    # act
+    path0 = Path(4, [0, 5, 9], cost=2.5)
+
+    # assert
+    assert list(path0) == [GridRef(0, 0), GridRef(1, 1), GridRef(1, 2)]
+    assert len(path0) == 3
+    assert path0[-1] == GridRef(1, 2)
+    assert path0[1:] == [GridRef(1, 1), GridRef(1, 2)]
+    assert path0.cost == 2.5
+
+
+def test_contains() -> None:
+    """Test membership checks, including locations beyond the grid width."""
+    # arrange
+    path0 = Path(4, [0, 5, 9])
+
+    # act, assert
+    assert GridRef(1, 1) in path0
+    assert GridRef(2, 1) not in path0
+    assert GridRef(5, 0) not in path0  # would have same index as (1, 1)
+
+
+def test_equality() -> None:
+    """Test that paths compare equal to paths and sequences of the same locations."""
+    # arrange
+    path0 = Path(4, [0, 5])
+
+    # act, assert
+    assert path0 == Path(4, [0, 5])
+    assert path0 != Path(4, [5, 0])
+    assert path0 == [GridRef(0, 0), GridRef(1, 1)]
+    assert Path(4) == []
+    assert not Path(4)
@@ -0,0 +1,121 @@
+"""Tests for PathCache class."""
+
+import sys
+
+from pathfinding.agent import Agent
+from pathfinding.grid import Grid
+from pathfinding.grid_ref import GridRef
+from pathfinding.path import Path
+from pathfinding.path_cache import PathCache
+
+
+def test_repeated_search_hits_cache() -> None:
+    """Test that repeating a search returns the cached path, counting a hit."""
+    # arrange
+    grid0 = Grid(10, 10)
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(9, 9)
+    first_path = agent0.a_star_search()
+
+    # act
+    second_path = agent0.a_star_search()
+
+    # assert
+    assert second_path is first_path
+    assert grid0.path_cache.hits == 1
+    assert grid0.path_cache.misses == 1
+    assert grid0.path_cache.hit_rate == 0.5
+
+
+def test_grid_change_misses_cache() -> None:
+    """Test that changing untraversable or shared path locations invalidates paths."""
+    # arrange
+    grid0 = Grid(10, 10)
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(9, 0)
+    agent0.a_star_search()
+
+    # act
+    grid0.untraversable_locations.add(GridRef(5, 0))
+    blocked_path = agent0.a_star_search()
+    grid0.shared_path_locations.add(GridRef(1, 1))
+    agent0.a_star_search()
+
+    # assert
+    assert GridRef(5, 0) not in blocked_path
+    assert grid0.path_cache.hits == 0
+    assert grid0.path_cache.misses == 3
+    assert len(grid0.path_cache) == 1
+
+
+def test_searches_cached_separately() -> None:
+    """Test that different searches between the same locations don't share paths."""
+    # arrange
+    grid0 = Grid(10, 10)
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(9, 9)
+    agent0.a_star_search()
+
+    # act
+    agent0.uniform_cost_search()
+    agent0.a_star_search(frontier="indexed")
+    agent0.a_star_search(collect_stats=True)
+
+    # assert
+    assert grid0.path_cache.hits == 0
+    assert len(grid0.path_cache) == 3
+
+
+def test_least_recently_used_evicted() -> None:
+    """Test that the least recently used path is evicted to stay within limits."""
+    # arrange
+    grid0 = Grid(10, 10)
+    path_cache = PathCache(grid0, max_size=2)
+    path_cache.put(0, 1, None, Path(10, [0, 1]))
+    path_cache.put(0, 2, None, Path(10, [0, 1, 2]))
+    path_cache.get(0, 1, None)
+
+    # act
+    path_cache.put(0, 3, None, Path(10, [0, 1, 2, 3]))
+
+    # assert
+    assert path_cache.get(0, 1, None) is not None
+    assert path_cache.get(0, 2, None) is None
+    assert path_cache.get(0, 3, None) is not None
+
+
+def test_memory_limit() -> None:
+    """Test that paths are evicted to keep memory within the limit."""
+    # arrange
+    grid0 = Grid(100, 1)
+    paths = [Path(100, range(length)) for length in (10, 20, 30)]
+    max_bytes = sum(sys.getsizeof(path.indices) for path in paths[1:])
+    path_cache = PathCache(grid0, max_bytes=max_bytes)
+
+    # act
+    for goal, path in enumerate(paths):
+        path_cache.put(0, goal, None, path)
+
+    # assert
+    assert len(path_cache) == 2
+    assert path_cache.get(0, 0, None) is None
+    assert path_cache.memory_bytes == max_bytes
+
+
+def test_plan_paths_uses_cache() -> None:
+    """Test that planned paths are shared with default A* searches."""
+    # arrange
+    grid0 = Grid(10, 10)
+    agent0 = Agent(grid0, GridRef(0, 0))
+    agent0.goal = GridRef(9, 9)
+    agent1 = Agent(grid0, GridRef(0, 9))
+    agent1.goal = GridRef(9, 0)
+    searched_path = agent0.a_star_search()
+
+    # act
+    paths = grid0.plan_paths([agent0, agent1])
+
+    # assert
+    assert paths[agent0] is searched_path
+    assert paths[agent1] == agent1.a_star_search()
+    assert grid0.path_cache.hits == 2
@@ -0,0 +1,117 @@
+"""Tests for priority queue classes."""
+
+import pytest
+
+from pathfinding._priority_queue import (
+    _COMPACT_MIN_STALE,
+    _IndexedPriorityQueue,
+    _new_frontier,
+    _PriorityQueue,
+)
+from pathfinding.search_stats import SearchStats
+
+
+@pytest.mark.parametrize("queue_class", [_PriorityQueue, _IndexedPriorityQueue])
+def test_get_in_priority_order(
+    queue_class: type[_PriorityQueue | _IndexedPriorityQueue],
+) -> None:
+    """Test that locations are returned lowest priority value first."""
+    # arrange
+    queue = queue_class()
+    queue.put(3, 30)
+    queue.put(1, 10)
+    queue.put(2, 20)
+    queue.put(1, 11, tiebreak=-1)
+
+    # act
+    locations = [queue.get() for _ in range(4)]
+
+    # assert
+    assert locations == [11, 10, 20, 30]
+    assert queue.is_empty
+
+
+@pytest.mark.parametrize("queue_class", [_PriorityQueue, _IndexedPriorityQueue])
+def test_put_changes_priority(
+    queue_class: type[_PriorityQueue | _IndexedPriorityQueue],
+) -> None:
+    """Test that putting a queued location changes its priority, without duplicating
+    it.
+    """
+    # arrange
+    queue = queue_class()
+    queue.put(3, 30)
+    queue.put(2, 20)
+    queue.put(5, 50)
+
+    # act
+    queue.put(1, 30)
+    queue.put(4, 20)
+
+    # assert
+    assert len(queue) == 3
+    assert [queue.get() for _ in range(3)] == [30, 20, 50]
+    assert queue.is_empty
+
+
+def test_stale_entries_removed() -> None:
+    """Test that the heap is compacted when stale entries outnumber current ones."""
+    # arrange
+    queue = _PriorityQueue()
+
+    # act
+    for priority in range(2 * _COMPACT_MIN_STALE, 0, -1):
+        queue.put(priority, 0)
+
+    # assert
+    assert len(queue) == 1
+    assert len(queue.items) <= _COMPACT_MIN_STALE + 1
+    assert queue.get() == 0
+    assert queue.is_empty
+
+
+def test_indexed_remove() -> None:
+    """Test that removing locations keeps the rest in priority order."""
+    # arrange
+    queue = _IndexedPriorityQueue()
+    for priority in [5, 1, 4, 2, 3, 6]:
+        queue.put(priority, priority * 10)
+
+    # act
+    queue.remove(10)
+    queue.remove(40)
+    queue.remove(70)  # not queued
+
+    # assert
+    assert 10 not in queue
+    assert 20 in queue
+    assert [queue.get() for _ in range(len(queue))] == [20, 30, 50, 60]
+
+
+def test_instrumented_frontier_stats() -> None:
+    """Test that an instrumented frontier counts pushes, expansions and stale pops."""
+    # arrange
+    stats = SearchStats()
+    queue = _new_frontier("heap", stats)
+    queue.put(1, 10)
+    queue.put(3, 30)
+    queue.put(2, 30)  # leaves a stale entry, popped before 20
+    queue.put(4, 20)
+
+    # act
+    while not queue.is_empty:
+        queue.get()
+
+    # assert
+    assert stats == SearchStats(
+        nodes_expanded=3, nodes_pushed=4, stale_pops=1, peak_frontier_size=4
+    )
+
+
+def test_uninstrumented_frontier() -> None:
+    """Test that frontiers are uninstrumented without stats."""
+    # act
+    queue = _new_frontier("indexed")
+
+    # assert
+    assert type(queue) is _IndexedPriorityQueue